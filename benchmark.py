@@ -0,0 +1,221 @@
+"""
+Benchmark delle soluzioni: misura separatamente parse, part1 e part2 di ogni giorno
+sull'input ufficiale (inputs/NN/input.txt) e su input sintetici scalati (10x, 100x, 1000x),
+salva i tempi in una baseline JSON e segnala le regressioni oltre una tolleranza.
+
+Esempi:
+    python -m benchmark 1-8 --save                      # misura e salva la baseline
+    python -m benchmark 1-8                             # confronta con la baseline
+    python -m benchmark 6 --scales 10,100 --timeout 30 --tolerance 0.5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import log_utils
+from file_utils import _write_file_atomically, read_file_to_string
+from runner import REPO_DIR, available_days, input_path, load_solver, parse_days
+from search_utils import TimeLimitExceeded, time_limit
+from synthetic_inputs import GENERATORS, UNSUPPORTED_PARTS, generate_input
+
+BASELINE_PATH = os.path.join(REPO_DIR, 'benchmarks', 'baseline.json')
+DEFAULT_SCALES = (10,)
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_TIMEOUT = 60.0
+
+# La scala "real" indica l'input ufficiale del puzzle
+REAL_SCALE = 'real'
+PHASES = ('parse', 'part1', 'part2')
+
+
+def load_input(day, scale):
+    """
+    Restituisce il testo dell'input per il giorno e la scala indicati.
+
+    Args:
+        day (int): Il giorno.
+        scale (str or int): REAL_SCALE per l'input ufficiale, altrimenti il fattore di scala.
+
+    Returns:
+        str or None: Il testo dell'input, None se non disponibile.
+    """
+    if scale == REAL_SCALE:
+        path = input_path(day)
+        return read_file_to_string(path) if os.path.exists(path) else None
+    if day not in GENERATORS:
+        return None
+    return generate_input(day, scale)
+
+
+def benchmark_day(day, scale, repeat=1, timeout=DEFAULT_TIMEOUT, parts=(1, 2)):
+    """
+    Misura i tempi di parse e delle parti di un giorno, tenendo il migliore su repeat esecuzioni.
+
+    Args:
+        day (int): Il giorno.
+        scale (str or int): REAL_SCALE o il fattore di scala dell'input sintetico.
+        repeat (int): Numero di ripetizioni.
+        timeout (float): Tempo massimo per ogni fase, in secondi.
+        parts (tuple): Le parti da misurare.
+
+    Returns:
+        dict or None: {fase: secondi o None se interrotta/non supportata}, None se l'input non è disponibile.
+    """
+    data = load_input(day, scale)
+    if data is None:
+        return None
+
+    solver = load_solver(day)
+    skipped = UNSUPPORTED_PARTS.get(day, ()) if scale != REAL_SCALE else ()
+    timings = {}
+
+    for _ in range(repeat):
+        try:
+            with time_limit(timeout):
+                start = time.perf_counter()
+                parsed = solver.parse(data)
+                elapsed = time.perf_counter() - start
+        except TimeLimitExceeded:
+            return {'parse': None}
+        timings['parse'] = min(elapsed, timings.get('parse', elapsed))
+
+        for part in parts:
+            phase = f"part{part}"
+            if part in skipped or (phase in timings and timings[phase] is None):
+                timings[phase] = None
+                continue
+            try:
+                with time_limit(timeout):
+                    start = time.perf_counter()
+                    getattr(solver, phase)(parsed)
+                    elapsed = time.perf_counter() - start
+            except TimeLimitExceeded:
+                timings[phase] = None
+                continue
+            timings[phase] = min(elapsed, timings.get(phase, elapsed))
+
+    return timings
+
+
+def result_key(day, scale):
+    """Chiave di un risultato nella baseline, es. '06/real' o '06/x10'."""
+    return f"{day:02d}/{scale if scale == REAL_SCALE else f'x{scale}'}"
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Carica la baseline JSON; restituisce un dizionario vuoto se non esiste."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Salva i risultati come nuova baseline JSON."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    content = json.dumps(results, indent=2, sort_keys=True) + '\n'
+    _write_file_atomically(path, content.encode('utf-8'))
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE, min_seconds=0.005):
+    """
+    Confronta i risultati con la baseline.
+
+    Una fase è una regressione se è più lenta della baseline oltre la tolleranza relativa
+    (le fasi sotto min_seconds vengono ignorate perché troppo rumorose), oppure se nella
+    baseline terminava e ora supera il tempo massimo.
+
+    Args:
+        results (dict): {chiave: {fase: secondi}} della misura corrente.
+        baseline (dict): Lo stesso formato, dalla baseline salvata.
+        tolerance (float): Rallentamento relativo ammesso (0.25 = +25%).
+        min_seconds (float): Durata minima considerata nel confronto.
+
+    Returns:
+        list: Tuple (chiave, fase, secondi baseline, secondi correnti).
+    """
+    regressions = []
+    for key, timings in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        for phase, seconds in timings.items():
+            old = previous.get(phase)
+            if old is None:
+                continue
+            if seconds is None:
+                regressions.append((key, phase, old, None))
+            elif seconds > max(old, min_seconds) * (1 + tolerance):
+                regressions.append((key, phase, old, seconds))
+    return regressions
+
+
+def format_seconds(seconds):
+    return 'timeout' if seconds is None else f"{seconds * 1000:.1f}ms"
+
+
+def parse_scales(spec):
+    """Converte '1,10,100' (e 'real') nella lista delle scale."""
+    scales = []
+    for item in spec.split(','):
+        item = item.strip()
+        if item:
+            scales.append(REAL_SCALE if item == REAL_SCALE else int(item))
+    return scales
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark',
+                                     description="Misura i tempi delle soluzioni e segnala le regressioni.")
+    parser.add_argument('days', nargs='?', default='all', help="giorni da misurare: 6, 1-10, 1,3,5-7 o all")
+    parser.add_argument('--scales', default=','.join([REAL_SCALE] + [str(s) for s in DEFAULT_SCALES]),
+                        help="scale da misurare, es. real,10,100,1000 (default real,10)")
+    parser.add_argument('--repeat', type=int, default=1, help="ripetizioni per misura (si tiene la migliore)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="secondi massimi per fase")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="rallentamento relativo ammesso prima di segnalare una regressione")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="file JSON della baseline")
+    parser.add_argument('--save', action='store_true', help="salva i risultati come nuova baseline")
+    args = parser.parse_args(argv)
+
+    log_utils.set_verbosity(log_utils.QUIET)
+
+    try:
+        days = parse_days(args.days, available_days())
+        scales = parse_scales(args.scales)
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = {}
+    for day in days:
+        for scale in scales:
+            timings = benchmark_day(day, scale, args.repeat, args.timeout)
+            if timings is None:
+                continue
+            key = result_key(day, scale)
+            results[key] = timings
+            print(f"{key:<10} " + '  '.join(f"{phase} {format_seconds(timings.get(phase))}"
+                                             for phase in PHASES if phase in timings))
+            sys.stdout.flush()
+
+    if args.save:
+        # Le nuove misure si aggiungono a quelle già salvate per gli altri giorni/scale
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_baseline(baseline, args.baseline)
+        print(f"\nBaseline salvata in {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, load_baseline(args.baseline), args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONI (tolleranza {args.tolerance:.0%}):")
+        for key, phase, old, new in regressions:
+            print(f"  {key} {phase}: {format_seconds(old)} -> {format_seconds(new)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
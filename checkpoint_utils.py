@@ -0,0 +1,109 @@
+"""
+Checkpoint delle ricerche lunghe (forza bruta): lo stato della ricerca (cursore e risultati
+parziali) viene salvato periodicamente su disco in modo atomico, così una ricerca interrotta
+può ripartire da dove si era fermata invece che da zero.
+
+La ripresa è disattivata di default: si attiva con set_resume(True), con la variabile
+d'ambiente AOC_RESUME=1 (o `python -m runner --resume`) o con il parametro resume delle
+singole ricerche. Il salvataggio periodico è sempre attivo.
+
+Esempio:
+    checkpoint = Checkpoint('day06-part2', checkpoint_key(grid))
+    state = checkpoint.load() or {'cursor': 0, 'found': []}
+    for cursor in range(state['cursor'], total):
+        ...
+        if checkpoint.due():
+            checkpoint.save({'cursor': cursor + 1, 'found': found})
+    checkpoint.clear()
+"""
+import hashlib
+import json
+import os
+import time
+
+from file_utils import _write_file_atomically
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'checkpoints')
+DEFAULT_INTERVAL = 30.0
+
+# Variabile d'ambiente che attiva la ripresa dai checkpoint
+RESUME_ENV = 'AOC_RESUME'
+
+_resume = os.environ.get(RESUME_ENV, '').strip().lower() in ('1', 'true', 'yes')
+
+
+def set_resume(enabled):
+    """Attiva o disattiva globalmente la ripresa delle ricerche dai checkpoint."""
+    global _resume
+    _resume = bool(enabled)
+
+
+def get_resume():
+    """Restituisce True se le ricerche riprendono dai checkpoint salvati."""
+    return _resume
+
+
+def checkpoint_key(*values):
+    """
+    Calcola una chiave breve che identifica l'input di una ricerca, così i checkpoint di
+    input diversi non si confondono.
+
+    Args:
+        *values: Valori che descrivono l'input (griglia, programma, ...), confrontati tramite repr.
+
+    Returns:
+        str: 16 caratteri esadecimali.
+    """
+    return hashlib.sha256(repr(values).encode('utf-8')).hexdigest()[:16]
+
+
+class Checkpoint:
+    """
+    Stato salvato di una ricerca, in un file JSON per coppia (nome della ricerca, chiave dell'input).
+    Lo stato deve essere serializzabile in JSON (le tuple tornano come liste).
+    """
+
+    def __init__(self, name, key='', resume=None, interval=DEFAULT_INTERVAL, directory=CHECKPOINT_DIR):
+        """
+        Args:
+            name (str): Il nome della ricerca (es. 'day06-part2').
+            key (str): La chiave dell'input (vedi checkpoint_key).
+            resume (bool, optional): Se True load() restituisce lo stato salvato. Default: get_resume().
+            interval (float): Secondi minimi tra due salvataggi periodici.
+            directory (str): La directory dei checkpoint.
+        """
+        filename = f"{name}-{key}.json" if key else f"{name}.json"
+        self.path = os.path.join(directory, filename)
+        self.resume = get_resume() if resume is None else resume
+        self.interval = interval
+        self._last_save = time.monotonic()
+
+    def load(self):
+        """
+        Restituisce lo stato salvato, se la ripresa è attiva e il checkpoint esiste.
+
+        Returns:
+            dict or None: Lo stato, None se la ricerca deve partire da zero.
+        """
+        if not self.resume or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (IOError, ValueError):
+            # Un checkpoint illeggibile equivale a nessun checkpoint
+            return None
+
+    def due(self):
+        """Restituisce True se è passato abbastanza tempo dall'ultimo salvataggio."""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, state):
+        """Salva lo stato in modo atomico (file temporaneo + rename)."""
+        _write_file_atomically(self.path, json.dumps(state).encode('utf-8'))
+        self._last_save = time.monotonic()
+
+    def clear(self):
+        """Cancella il checkpoint: da chiamare quando la ricerca è terminata."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
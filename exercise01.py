@@ -1,68 +1,99 @@
+from file_utils import iter_file_lines
+from log_utils import debug, info
+from string_utils import parse_int_columns
 
 
-def split_file_into_lists(file_path):
-    # Liste per memorizzare le colonne
-    column1 = []
-    column2 = []
+def parse(data):
+    """
+    Converte l'input nelle due colonne di interi.
 
-    # Legge il file riga per riga
-    with open(file_path, 'r') as file:
-        for line in file:
-            # Splitta ogni riga in due valori
-            parts = line.strip().split()
-            if len(parts) == 2:  # Verifica che ci siano due colonne
-                column1.append(int(parts[0]))  # Aggiunge alla prima lista
-                column2.append(int(parts[1]))  # Aggiunge alla seconda lista
+    Args:
+        data (str or iterable): Il contenuto del file di input, o le sue righe (es. da iter_file_lines).
+
+    Returns:
+        tuple: Le due colonne (list1, list2), come array('q') di interi.
+    """
+    # Una sola passata sul testo: i valori vanno direttamente in due array compatti
+    column1, column2 = parse_int_columns(data, arity=2)
+
+    debug("%s", column1)
+    debug("%s", column2)
+
+    info("list1: %s", len(column1))
+    info("list2: %s", len(column2))
 
     return column1, column2
 
-# Esempio di utilizzo
-file_path = f".\\inputs\\01\\input.txt"
 
-list1, list2 = split_file_into_lists(file_path)
+def part1(parsed):
+    """
+    Somma delle distanze tra gli elementi delle due liste ordinate.
+
+    Args:
+        parsed (tuple): Il risultato di parse().
+
+    Returns:
+        int: La somma delle distanze.
+    """
+    list1 = sorted(parsed[0])
+    list2 = sorted(parsed[1])
+
+    debug("%s", list1)
+    debug("%s", list2)
+
+    info("list1 after sort: %s", len(list1))
+    info("list2 after sort: %s", len(list2))
+
+    summary = []
+    for idx in range(0, len(list1)):
+        summary.append(abs(list1[idx]-list2[idx]))
 
-print(list1)
-print(list2)
+    debug("summary: %s", summary)
+    info("summary length: %s", len(summary))
 
-print(f"list1: {len(list1)}")
-print(f"list2: {len(list2)}")
+    sum = 0
+    for idx in range(0, len(summary)):
+        sum += summary[idx]
 
-list1.sort()
-list2.sort()
+    return sum
 
-print(list1)
-print(list2)
 
-print(f"list1 after sort: {len(list1)}")
-print(f"list2 after sort: {len(list2)}")
+def part2(parsed):
+    """
+    Punteggio di somiglianza: ogni elemento della prima lista moltiplicato per
+    il numero di volte in cui compare nella seconda.
 
-summary = []
-occurrences = {}
+    Args:
+        parsed (tuple): Il risultato di parse().
 
-for idx in range(0, len(list1)):
-    summary.append(abs(list1[idx]-list2[idx]))
+    Returns:
+        int: Il punteggio di somiglianza.
+    """
+    list1, list2 = parsed
 
-    item = list2[idx]
-    if occurrences.__contains__(item):
-        occurrences[item] += 1
-    else:
-        occurrences[item] = 1
+    occurrences = {}
+    for item in list2:
+        if occurrences.__contains__(item):
+            occurrences[item] += 1
+        else:
+            occurrences[item] = 1
 
-print(f"summary: {summary}")
-print(f"summary length: {len(summary)}")
-print(f"occurrences: {occurrences}")
+    debug("occurrences: %s", occurrences)
 
-sum = 0
-for idx in range(0, len(summary)):
-    sum += summary[idx]
+    sum = 0
+    for idx in range(0, len(list1)):
+        item = list1[idx]
+        if occurrences.__contains__(item):
+            sum += item * occurrences[item]
 
-print(f"sum: {sum}")
+    return sum
 
-sum = 0
-for idx in range(0, len(list1)):
-    item = list1[idx]
-    if occurrences.__contains__(item):
-        sum += item * occurrences[item]
 
-print(f"similarity: {sum}")
+if __name__ == '__main__':
+    # Esempio di utilizzo
+    file_path = f"./inputs/01/input.txt"
+    # Il file viene letto in streaming, una riga alla volta
+    parsed = parse(iter_file_lines(file_path))
 
+    print(f"sum: {part1(parsed)}")
+    print(f"similarity: {part2(parsed)}")
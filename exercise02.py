@@ -1,23 +1,9 @@
-def read_file_into_nested_lists(file_path):
-    nested_lists = []
+from file_utils import iter_file_lines
+from log_utils import debug, info
+from string_utils import parse_int_records
 
-    # Apre il file e legge il contenuto
-    with open(file_path, 'r') as file:
-        for line in file:
-            # Rimuove spazi superflui e splitta la riga in una lista
-            nested_lists.append(line.strip().split())
 
-    return nested_lists
-
-
-# Esempio di utilizzo
-file_path = f".\\inputs\\02\\input.txt"
-levels = read_file_into_nested_lists(file_path)
-
-print(f"input: {levels}")
-print(f"tot levels: {len(levels)}")
-
-def check(curr, prev):
+def check(curr, prev, increasing):
     if abs(prev - curr) > 3:
         reason = f"{curr} {prev} is a difference of {abs(prev - curr)}"
         return False, reason
@@ -33,78 +19,131 @@ def check(curr, prev):
 
     return True, ""
 
-unsafe_levels = []
 
-count = 0
-for level in levels:
-    good = True
+def check_level(level):
+    """
+    Verifica se un livello è sicuro: valori tutti crescenti o tutti decrescenti,
+    con differenze tra 1 e 3.
+
+    Args:
+        level (list): I valori del livello.
+
+    Returns:
+        tuple: (True, "") se il livello è sicuro, altrimenti (False, motivo).
+    """
     increasing = int(level[1]) - int(level[0]) > 0
-    reason = ""
+    good, reason = True, ""
 
     for idx in range(1, len(level)):
         prev = int(level[idx - 1])
         curr = int(level[idx])
-        good, reason = check(curr, prev)
+        good, reason = check(curr, prev, increasing)
 
         if not good:
             break
 
-    increase_str = "increasing" if increasing else "decreasing"
-    # if not good:
-    #     print(f"level: {level}\t UNSAFE because {reason}")
-    # else:
-    #     print(f"level: {level}\t SAFE because all levels are {increase_str} by 1, 2, or 3")
+    return good, reason
 
-    if good:
-        count += 1
-    else:
-        unsafe_levels.append(level)
 
-print(f"safe count: {count}")
+def parse(data):
+    """
+    Converte l'input nella lista dei livelli.
 
+    Args:
+        data (str or iterable): Il contenuto del file di input, o le sue righe (es. da iter_file_lines).
 
-# --------------------
+    Returns:
+        list: Una lista di livelli, ognuno lista di interi.
+    """
+    # Valori di tutti i livelli in un unico array, i livelli sono individuati dagli offset
+    values, offsets = parse_int_records(data)
+    levels = [values[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
 
+    debug("input: %s", levels)
+    info("tot levels: %s", len(levels))
 
-old_count = count
-count = 0
+    return levels
 
-for level in unsafe_levels:
-    good = False
 
-    print(f"Trying level: {level}")
+def part1(levels):
+    """
+    Conta i livelli sicuri.
 
-    for rem_idx in range(0, len(level)):
-        level_copy = level.copy()
-        level_copy.pop(rem_idx)
-        idx_good = False
+    Args:
+        levels (list): Il risultato di parse().
 
-        #print(f"sub-level {rem_idx} {level_copy}")
+    Returns:
+        int: Il numero di livelli sicuri.
+    """
+    count = 0
+    for level in levels:
+        good, reason = check_level(level)
 
-        increasing = int(level_copy[1]) - int(level_copy[0]) > 0
+        # if not good:
+        #     print(f"level: {level}\t UNSAFE because {reason}")
+
+        if good:
+            count += 1
+
+    return count
 
-        reason = ""
 
-        for idx in range(1, len(level_copy)):
-            prev = int(level_copy[idx - 1])
-            curr = int(level_copy[idx])
-            idx_good, reason = check(curr, prev)
+def part2(levels):
+    """
+    Conta i livelli sicuri tollerando la rimozione di un singolo valore.
+
+    Args:
+        levels (list): Il risultato di parse().
+
+    Returns:
+        int: Il numero totale di livelli sicuri (con tolleranza).
+    """
+    old_count = 0
+    unsafe_levels = []
+    for level in levels:
+        good, _ = check_level(level)
+        if good:
+            old_count += 1
+        else:
+            unsafe_levels.append(level)
+
+    count = 0
+
+    for level in unsafe_levels:
+        good = False
+
+        debug("Trying level: %s", level)
+
+        for rem_idx in range(0, len(level)):
+            level_copy = level.copy()
+            level_copy.pop(rem_idx)
+
+            idx_good, reason = check_level(level_copy)
 
             if not idx_good:
-                print(f"sub-level {rem_idx} {level_copy}: UNSAFE because {reason}")
-                break
+                debug("sub-level %s %s: UNSAFE because %s", rem_idx, level_copy, reason)
+            else:
+                debug("sub-level %s %s: SAFE", rem_idx, level_copy)
 
-        if idx_good:
-            print(f"sub-level {rem_idx} {level_copy}: SAFE")
+            good = good or idx_good
 
-        good = good or idx_good
+            if good:
+                break
 
         if good:
-            break
+            count += 1
+
+    info("safe count: %s", old_count)
+    info("safe count with tolerance: %s", count)
+
+    return old_count + count
+
 
-    if good:
-        count += 1
+if __name__ == '__main__':
+    # Esempio di utilizzo
+    file_path = f"./inputs/02/input.txt"
+    # Il file viene letto in streaming, una riga alla volta
+    levels = parse(iter_file_lines(file_path))
 
-print(f"safe count: {old_count}")
-print(f"safe count with tolerance: {count}")
-print(f"total safe: {old_count+count}")
+    print(f"safe count: {part1(levels)}")
+    print(f"total safe: {part2(levels)}")
@@ -1,5 +1,7 @@
 import re
 
+from log_utils import TRACE, debug, is_enabled, trace
+
 
 def export_regex_matches_with_groups(pattern, text):
     """
@@ -77,44 +79,8 @@ def read_file_to_string(file_path):
         print(f"Errore durante la lettura del file: {e}")
         return ""
 
-print("-----------------------------\nPART 1")
-
-file_path = f".\\inputs\\03\\input.txt"
-regex = r"mul\(([0-9]+),([0-9]+)\)"
-
-file_content = read_file_to_string(file_path)
-max_value = len(file_content)
-
-risultati = export_regex_matches_with_positions(regex, file_content)
-print(f"risultati: {risultati}")
-
-sum = 0
-for ris in risultati:
-    elem1 = int(ris["groups"][0])
-    elem2 = int(ris["groups"][1])
-
-    mul = elem1*elem2
-    sum += mul
-
-
-print("-----------------------------\nRESULT 1:")
-print(f"sum: {sum}")
-
-# ---------------------------------
-
-print("-----------------------------\nPART 2")
-
-do_regex = r"do\(\)"
-do_list = export_regex_matches_with_positions(do_regex, file_content)
-
-dont_regex = r"don't\(\)"
-dont_list = export_regex_matches_with_positions(dont_regex, file_content)
-
-print(f"do_list: {do_list}")
-print(f"dont_list: {dont_list}")
-
-infinito_positivo = float('inf')
-infinito_negativo = float('-inf')
+# Regex delle istruzioni mul(X,Y)
+MUL_REGEX = r"mul\(([0-9]+),([0-9]+)\)"
 
 
 def get_first_match_after(matches, value):
@@ -142,63 +108,141 @@ def exists_in_list(matches, value):
     return False
 
 
-dos = []
-donts = []
-risultati_without_donts = risultati.copy()
+def sum_of_products(risultati):
+    """
+    Somma i prodotti delle istruzioni mul(X,Y) trovate.
 
+    Args:
+        risultati (list): I match della regex MUL_REGEX con posizioni.
 
-for item in do_list:
-    match = get_first_match_after(dont_list, int(item["start"]))
+    Returns:
+        int: La somma dei prodotti.
+    """
+    sum = 0
+    for ris in risultati:
+        elem1 = int(ris["groups"][0])
+        elem2 = int(ris["groups"][1])
 
-    end_value = max_value
-    if match is not None:
-        end_value = match["end"]
+        mul = elem1*elem2
+        sum += mul
+    return sum
+
+
+def parse(data):
+    """
+    Cerca nel testo tutte le istruzioni mul(X,Y) con la loro posizione.
+
+    Args:
+        data (str): Il contenuto del file di input.
+
+    Returns:
+        tuple: Il testo originale e la lista dei match (risultati).
+    """
+    risultati = export_regex_matches_with_positions(MUL_REGEX, data)
+    debug("risultati: %s", risultati)
+    return data, risultati
 
-    dos.append({
-        "start": int(item["start"]),
-        "end": end_value
-        })
 
-for item in dont_list:
-    match = get_first_match_after(do_list, int(item["start"]))
+def part1(parsed):
+    """
+    Somma di tutti i prodotti mul(X,Y).
+
+    Args:
+        parsed (tuple): Il risultato di parse().
+
+    Returns:
+        int: La somma dei prodotti.
+    """
+    _, risultati = parsed
+    return sum_of_products(risultati)
+
+
+def part2(parsed):
+    """
+    Somma dei prodotti mul(X,Y) escludendo quelli disabilitati da un don't() precedente.
+
+    Args:
+        parsed (tuple): Il risultato di parse().
+
+    Returns:
+        int: La somma dei prodotti abilitati.
+    """
+    file_content, risultati = parsed
+    max_value = len(file_content)
+
+    do_regex = r"do\(\)"
+    do_list = export_regex_matches_with_positions(do_regex, file_content)
+
+    dont_regex = r"don't\(\)"
+    dont_list = export_regex_matches_with_positions(dont_regex, file_content)
+
+    debug("do_list: %s", do_list)
+    debug("dont_list: %s", dont_list)
+
+    dos = []
+    donts = []
+    risultati_without_donts = risultati.copy()
+
+    for item in do_list:
+        match = get_first_match_after(dont_list, int(item["start"]))
+
+        end_value = max_value
+        if match is not None:
+            end_value = match["end"]
+
+        dos.append({
+            "start": int(item["start"]),
+            "end": end_value
+            })
+
+    for item in dont_list:
+        match = get_first_match_after(do_list, int(item["start"]))
+
+        end_value = max_value
+        if match is not None:
+            end_value = match["start"]
+
+        donts.append({
+            "start": int(item["start"]),
+            "end": end_value
+        })
 
-    end_value = max_value
-    if match is not None:
-        end_value = match["start"]
+    debug("dos: %s", dos)
+    debug("donts: %s", donts)
 
-    donts.append({
-        "start": int(item["start"]),
-        "end": end_value
-    })
+    debug("risultati_without_donts %s: %s", len(risultati_without_donts), risultati_without_donts)
 
+    debug("-----------------------------\nCHECK:")
+    # Stampare l'intera lista dopo ogni rimozione costa O(n) per elemento: solo a livello TRACE
+    tracing = is_enabled(TRACE)
+    for idx in range(0, len(risultati)):
+        item = risultati[idx]
+        result = exists_in_list(donts, risultati[idx])
+        debug("checking: %s => %s", item, result)
+        if result:
+            debug(" > removing: %s %s", item, idx)
+            risultati_without_donts.remove(item)
+            if tracing:
+                trace(" > risultati_without_donts %s: %s", len(risultati_without_donts), risultati_without_donts)
 
-print(f"dos: {dos}")
-print(f"donts: {donts}")
+    debug("-----------------------------\nRESULTS:")
+    debug("risultati_without_donts %s: %s", len(risultati_without_donts), risultati_without_donts)
 
-print(f"risultati_without_donts {len(risultati_without_donts)}: {risultati_without_donts}")
+    return sum_of_products(risultati_without_donts)
 
-print("-----------------------------\nCHECK:")
-for idx in range(0, len(risultati)):
-    item = risultati[idx]
-    result = exists_in_list(donts, risultati[idx])
-    print(f"checking: {item} => {result}")
-    if result:
-        print(f" > removing: {item} {idx}")
-        risultati_without_donts.remove(item)
-        print(f" > risultati_without_donts {len(risultati_without_donts)}: {risultati_without_donts}")
 
-print("-----------------------------\nRESULTS:")
-print(f"risultati_without_donts {len(risultati_without_donts)}: {risultati_without_donts}")
+if __name__ == '__main__':
+    print("-----------------------------\nPART 1")
 
+    file_path = f"./inputs/03/input.txt"
+    parsed = parse(read_file_to_string(file_path))
 
-sum = 0
-for ris in risultati_without_donts:
-    elem1 = int(ris["groups"][0])
-    elem2 = int(ris["groups"][1])
+    print("-----------------------------\nRESULT 1:")
+    print(f"sum: {part1(parsed)}")
 
-    mul = elem1*elem2
-    sum += mul
+    # ---------------------------------
 
+    print("-----------------------------\nPART 2")
 
-print("-----------------------------\nRESULT 2:")
-print(f"sum: {sum}")
\ No newline at end of file
+    print("-----------------------------\nRESULT 2:")
+    print(f"sum: {part2(parsed)}")
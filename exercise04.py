@@ -1,9 +1,12 @@
 import re
-from colorama import Fore, Style, init
 
+try:
+    from colorama import Fore, Style, init
+except ImportError:
+    # colorama è opzionale: senza di esso la matrice evidenziata viene stampata senza colori
+    Fore = Style = init = None
 
-# Inizializza Colorama per colori cross-platform
-init(autoreset=True)
+from log_utils import INFO, TRACE, debug, info, is_enabled, trace
 
 
 def export_regex_matches_with_groups(pattern, text):
@@ -97,12 +100,12 @@ def extract_xmas_count(input_text):
     regex_xmas = r"XMAS"
     xmas_matches = export_regex_matches_with_groups(regex_xmas, input_text)
     xmas_count = len(xmas_matches)
-    print(f"xmas_matches: {xmas_matches}  =>  {xmas_count}")
+    debug("xmas_matches: %s  =>  %s", xmas_matches, xmas_count)
 
     regex_samx = r"SAMX"
     samx_matches = export_regex_matches_with_groups(regex_samx, input_text)
     samx_count = len(samx_matches)
-    print(f"samx_matches: {samx_matches}  =>  {samx_count}")
+    debug("samx_matches: %s  =>  %s", samx_matches, samx_count)
 
     return xmas_count, samx_count, xmas_count + samx_count
 
@@ -374,7 +377,14 @@ def highlight_words_in_matrix(matrix, results, words):
     colored_matrix = [[char for char in row] for row in matrix]
 
     # Colori disponibili per le parole trovate
-    colors = [Fore.RED, Fore.GREEN, Fore.BLUE, Fore.YELLOW, Fore.CYAN, Fore.MAGENTA]
+    if Fore is not None:
+        # Inizializza Colorama per colori cross-platform
+        init(autoreset=True)
+        colors = [Fore.RED, Fore.GREEN, Fore.BLUE, Fore.YELLOW, Fore.CYAN, Fore.MAGENTA]
+        reset = Style.RESET_ALL
+    else:
+        colors = ['']
+        reset = ''
 
     # Direzioni come (row_delta, col_delta)
     directions_map = {
@@ -390,7 +400,7 @@ def highlight_words_in_matrix(matrix, results, words):
 
     # Funzione per applicare un colore a un carattere
     def apply_color(char, color):
-        return f"{color}{char}{Style.RESET_ALL}"
+        return f"{color}{char}{reset}"
 
     # Colora le parole trovate
     for word_index, word in enumerate(words):
@@ -408,25 +418,7 @@ def highlight_words_in_matrix(matrix, results, words):
         print("".join(row))
 
 
-file_path = f"./inputs/04/input.txt"
-
-# region PART 1
-print("-----------------------------\nPART 1")
-
-sanitized_file_path = f"./inputs/04/sanitized_input.txt"
-
-file_content = read_file_to_string(file_path)
-char_matrix = string_to_matrix(file_content)
-
-sanitized_content = add_custom_border_to_text(file_content, 8)
-sanitized_char_matrix = string_to_matrix(sanitized_content)
-
-save_string_to_file(sanitized_content, sanitized_file_path)
-
-total_count = 0
-
-
-def star_search():
+def star_search(char_matrix):
     total_count = 0
     rows, cols = get_matrix_dimensions(char_matrix)
     all_results = []
@@ -440,83 +432,71 @@ def star_search():
                 if results["XMAS"]:
                     total_count += len(results["XMAS"])
                     all_results.append(results)
-    combined_results = merge_results(all_results)
-    highlight_words_in_matrix(char_matrix, combined_results, ["XMAS"])
+    # La matrice evidenziata viene stampata solo se i messaggi INFO sono abilitati
+    if is_enabled(INFO):
+        combined_results = merge_results(all_results)
+        highlight_words_in_matrix(char_matrix, combined_results, ["XMAS"])
     return total_count
 
-def matrix_search():
+
+def matrix_search(char_matrix):
     total_count = 0
     # region PART 1
-    print("-----------------------------\nPART 1")
+    info("-----------------------------\nPART 1")
     xmas_count, samx_count, orig_count = shift_and_count(char_matrix, 0)
     total_count += orig_count
-    print(f"count: {xmas_count}+{samx_count} = {orig_count}")
-    print(f"total count: {total_count}")
+    info("count: %s+%s = %s", xmas_count, samx_count, orig_count)
+    info("total count: %s", total_count)
     # endregion
     # region PART 2
-    print("\n-----=> TRASPOSIZIONE <=-----")
+    info("\n-----=> TRASPOSIZIONE <=-----")
     transposed_char_matrix = transpose_matrix(char_matrix)
     transposed_string = matrix_to_string(transposed_char_matrix)
     save_string_to_file(transposed_string, f"./inputs/04/transposed.txt")
     xmas_count, samx_count, transposed_count = shift_and_count(transposed_char_matrix, 0)
     total_count += transposed_count
-    print(f"count: {xmas_count}+{samx_count} = {transposed_count}")
-    print(f"total count: {total_count}")
+    info("count: %s+%s = %s", xmas_count, samx_count, transposed_count)
+    info("total count: %s", total_count)
     # endregion
     # region TRANSP MATRIX +1
-    print("\n---=> TRANSP. MATRIX +1 <=---")
+    info("\n---=> TRANSP. MATRIX +1 <=---")
     shifted_matrix_plus1 = shift_matrix_with_diagonal(char_matrix, "right")
     shifted_plus1_str = matrix_to_string(shifted_matrix_plus1)
     save_string_to_file(shifted_plus1_str, f"./inputs/04/shifted_plus1.txt")
     # xmas_count, samx_count, shifted_plus1_count = shift_and_count(shifted_matrix_plus1, 0)
     # total_count += shifted_plus1_count
     #
-    # print(f"count: {xmas_count}+{samx_count} = {shifted_plus1_count}")
-    # print(f"total count: {total_count}")
+    # info("count: %s+%s = %s", xmas_count, samx_count, shifted_plus1_count)
+    # info("total count: %s", total_count)
     transposed_shifted_plus1 = transpose_matrix(shifted_matrix_plus1)
     transposed_shifted_plus1_str = matrix_to_string(transposed_shifted_plus1)
     save_string_to_file(transposed_shifted_plus1_str, f"./inputs/04/transposed_shifted_plus1.txt")
     xmas_count, samx_count, transposed_shifted_plus1_count = shift_and_count(transposed_shifted_plus1, 0)
     total_count += transposed_shifted_plus1_count
-    print(f"count: {xmas_count}+{samx_count} = {transposed_shifted_plus1_count}")
-    print(f"total count: {total_count}")
+    info("count: %s+%s = %s", xmas_count, samx_count, transposed_shifted_plus1_count)
+    info("total count: %s", total_count)
     # endregion
     # region TRANSP MATRIX -1
-    print("\n---=> TRANSP. MATRIX -1 <=---")
+    info("\n---=> TRANSP. MATRIX -1 <=---")
     shifted_matrix_minus1 = shift_matrix_with_diagonal(char_matrix, "left")
     shifted_minus1_str = matrix_to_string(shifted_matrix_minus1)
     save_string_to_file(shifted_minus1_str, f"./inputs/04/shifted_minus1.txt")
     # xmas_count, samx_count, shifted_minus1_count = shift_and_count(shifted_matrix_minus1, 0)
     # total_count += shifted_minus1_count
     #
-    # print(f"count: {xmas_count}+{samx_count} = {shifted_minus1_count}")
-    # print(f"total count: {total_count}")
+    # info("count: %s+%s = %s", xmas_count, samx_count, shifted_minus1_count)
+    # info("total count: %s", total_count)
     transposed_shifted_minus1 = transpose_matrix(shifted_matrix_minus1)
     transposed_shifted_minus1_str = matrix_to_string(transposed_shifted_minus1)
     save_string_to_file(transposed_shifted_minus1_str, f"./inputs/04/transposed_shifted_minus1.txt")
     xmas_count, samx_count, transposed_shifted_minus1_count = shift_and_count(transposed_shifted_minus1, 0)
     total_count += transposed_shifted_minus1_count
-    print(f"count: {xmas_count}+{samx_count} = {transposed_shifted_minus1_count}")
-    print(f"total count: {total_count}")
+    info("count: %s+%s = %s", xmas_count, samx_count, transposed_shifted_minus1_count)
+    info("total count: %s", total_count)
     # endregion
     return total_count
 
 
-# STAR SEARCH
-total_count = star_search()
-
-# MATRIX SEARCH
-#total_count = matrix_search()
-
-print(f"\nSOLUTION --------------------\n")
-print(f"total_count: {total_count}")
-
-# endregion
-
-
-word = "MAS"
-
-
 def generate_patterns(word):
     """
     Genera i 4 pattern per una parola di lunghezza 3, come specificato:
@@ -583,22 +563,27 @@ def generate_patterns(word):
     return [pattern1, pattern2, pattern3, pattern4]
 
 
-def star_search2(patterns):
+def star_search2(char_matrix, patterns):
     total_count = 0
     rows, cols = get_matrix_dimensions(char_matrix)
     all_results = []
-    for row in range(0, rows - len(word) + 1):
-        for col in range(0, cols - len(word) + 1):
-            print(f"searching from [{row},{col}]")
+    # Controllo fatto una sola volta: il ciclo più interno non paga nemmeno la chiamata a trace()
+    tracing = is_enabled(TRACE)
+    for row in range(0, rows - len(patterns[0]) + 1):
+        for col in range(0, cols - len(patterns[0]) + 1):
+            debug("searching from [%s,%s]", row, col)
 
             for pattern in patterns:
-                print(f" > searching pattern:\n{matrix_to_string(pattern)}\n")
+                # matrix_to_string viene chiamata solo se il messaggio verrà stampato
+                debug(lambda: f" > searching pattern:\n{matrix_to_string(pattern)}\n")
                 matches = 0
-                for int_row in range(0, len(word)):
-                    for int_col in range(0, len(word)):
+                for int_row in range(0, len(patterns[0])):
+                    for int_col in range(0, len(patterns[0])):
                         grid_char = char_matrix[row + int_row][col + int_col]
                         pattern_char = pattern[int_row][int_col]
-                        print(f"  > grid[{row + int_row},{col + int_col}]<->pattern[{int_row},{int_col}]: {grid_char}<->{pattern_char}")
+                        if tracing:
+                            trace("  > grid[%s,%s]<->pattern[%s,%s]: %s<->%s",
+                                  row + int_row, col + int_col, int_row, int_col, grid_char, pattern_char)
                         if pattern_char == '.':
                             matches += 1
                             continue
@@ -607,18 +592,76 @@ def star_search2(patterns):
                             continue
                 if matches == 9:
                     total_count += 1
-                    print(f" >>> pattern FOUND!")
+                    debug(" >>> pattern FOUND!")
                 else:
-                    print(f" >>> NOT FOUND [best: {matches}]")
+                    debug(" >>> NOT FOUND [best: %s]", matches)
 
     return total_count
 
-print("-----------------------------\nPART 2")
-total_count = 0
+def parse(data):
+    """
+    Converte l'input nella matrice di caratteri.
+
+    Args:
+        data (str): Il contenuto del file di input.
+
+    Returns:
+        list of list: La matrice di caratteri.
+    """
+    return string_to_matrix(data)
+
+
+def part1(char_matrix):
+    """
+    Conta le occorrenze di XMAS in tutte le direzioni.
+
+    Args:
+        char_matrix (list of list): Il risultato di parse().
+
+    Returns:
+        int: Il numero di occorrenze.
+    """
+    # STAR SEARCH (in alternativa: MATRIX SEARCH con matrix_search(char_matrix))
+    return star_search(char_matrix)
+
+
+def part2(char_matrix):
+    """
+    Conta le X formate da due MAS incrociati.
+
+    Args:
+        char_matrix (list of list): Il risultato di parse().
+
+    Returns:
+        int: Il numero di X trovate.
+    """
+    patterns = generate_patterns("MAS")
+    return star_search2(char_matrix, patterns)
+
+
+if __name__ == '__main__':
+    file_path = f"./inputs/04/input.txt"
+
+    # region PART 1
+    print("-----------------------------\nPART 1")
+
+    sanitized_file_path = f"./inputs/04/sanitized_input.txt"
+
+    file_content = read_file_to_string(file_path)
+    char_matrix = parse(file_content)
+
+    sanitized_content = add_custom_border_to_text(file_content, 8)
+    save_string_to_file(sanitized_content, sanitized_file_path)
+
+    total_count = part1(char_matrix)
+
+    print(f"\nSOLUTION --------------------\n")
+    print(f"total_count: {total_count}")
+    # endregion
 
-patterns = generate_patterns(word)
+    print("-----------------------------\nPART 2")
 
-total_count = star_search2(patterns)
+    total_count = part2(char_matrix)
 
-print(f"\nSOLUTION --------------------\n")
-print(f"total_count: {total_count}")
\ No newline at end of file
+    print(f"\nSOLUTION --------------------\n")
+    print(f"total_count: {total_count}")
@@ -1,3 +1,6 @@
+from file_utils import iter_file_blocks
+from log_utils import debug
+
 
 def read_file_to_string(file_path):
     """
@@ -30,7 +33,8 @@ def parse_custom_string(input_string):
     La stringa è separata da una riga vuota che distingue le due sezioni.
 
     Args:
-        input_string (str): La stringa da elaborare.
+        input_string (str or iterable): La stringa da elaborare, oppure le sue due sezioni
+                                        già separate (es. da iter_file_blocks).
 
     Returns:
         tuple: Un tuple contenente due elementi:
@@ -38,7 +42,10 @@ def parse_custom_string(input_string):
             - Lista di liste di N elementi (separati da ",").
     """
     # Divide le due sezioni usando la riga vuota come separatore
-    parts = input_string.strip().split("\n\n")
+    if isinstance(input_string, str):
+        parts = input_string.strip().split("\n\n")
+    else:
+        parts = list(input_string)
 
     # Verifica che ci siano esattamente due parti
     if len(parts) != 2:
@@ -159,23 +166,23 @@ def check_list(rules, list, swap_level):
     idx = 0
     for idx in range(0, len(list)):
         result, good_numbers = check_solution(rules, list)
-        print(f" > {list} result: {result} with {good_numbers} good numbers")
+        debug(" > %s result: %s with %s good numbers", list, result, good_numbers)
 
         if not result and good_numbers > 0:
             sublist = list[good_numbers:]
-            print(f" > new sublist: {sublist}")
+            debug(" > new sublist: %s", sublist)
             swap_with_offset(sublist, idx, 1)
-            print(f" > swap {idx} with +{1}: {sublist[idx]}<->{sublist[idx+1]}")
-            print(f" > checking sublist: {sublist}")
+            debug(lambda: f" > swap {idx} with +{1}: {sublist[idx]}<->{sublist[idx+1]}")
+            debug(" > checking sublist: %s", sublist)
             if check_list(rules, sublist, 1):
                 append_list(list, sublist, good_numbers)
-                print(f" >> new list: {list}")
+                debug(" >> new list: %s", list)
                 return True
             return False
         elif not result and good_numbers == 0:
             swap_with_offset(list, idx, swap_level)
-            print(f" > swap {idx} with +{swap_level}: {list[idx]}<->{list[idx+swap_level]}")
-            print(f" > checking sublist: {list}")
+            debug(lambda: f" > swap {idx} with +{swap_level}: {list[idx]}<->{list[idx+swap_level]}")
+            debug(" > checking sublist: %s", list)
             return check_list(rules, list, swap_level+1)
         else:
             result = True
@@ -184,77 +191,142 @@ def check_list(rules, list, swap_level):
     return result
 
 
-# region PART 1
-print("-----------------------------\nPART 1")
+def sum_of_middle_pages(updates):
+    """
+    Somma gli elementi centrali degli update.
 
-file_path = f"./inputs/05/input.txt"
-file_content = read_file_to_string(file_path)
+    Args:
+        updates (list): Lista di update (liste di stringhe numeriche).
 
-section1, section2 = parse_custom_string(file_content)
+    Returns:
+        int: La somma degli elementi centrali.
+    """
+    sum = 0
+    for update in updates:
+        middle_elem = int(len(update) / 2)
+        sum += int(update[middle_elem])
+        debug("%s", update[middle_elem])
+    return sum
 
-# print(f"ordering rules: {section1}")
-print(f"updates: {section2}")
 
-# lista delle regole => dizionario regole
-rules = list_to_grouped_dict(section1)
-correct_updates = []
-incorrect_updates = []
+def parse(data):
+    """
+    Converte l'input nelle regole di ordinamento e nella lista degli update.
 
-print(f"ordering rules: {rules}")
+    Args:
+        data (str or iterable): Il contenuto del file di input, o le sue sezioni (es. da iter_file_blocks).
 
-# per ogni update
-for update in section2:
-    # print(f"checking: {update}")
-    result, _ = check_solution(rules, update)
+    Returns:
+        tuple: Il dizionario delle regole e la lista degli update.
+    """
+    section1, section2 = parse_custom_string(data)
 
-    if not result:
-        print(f"@ {update} NOT OK")
-        incorrect_updates.append(update)
-    else:
-        print(f"@ {update} OK !!!")
-        correct_updates.append(update)
+    # print(f"ordering rules: {section1}")
+    debug("updates: %s", section2)
 
-print(f"\nSOLUTION --------------------\n")
-print(f"correct_updates: {correct_updates}")
+    # lista delle regole => dizionario regole
+    rules = list_to_grouped_dict(section1)
+    debug("ordering rules: %s", rules)
 
-sum = 0
-for update in correct_updates:
-    middle_elem = int(len(update) / 2)
-    sum += int(update[middle_elem])
-    print(update[middle_elem])
+    return rules, section2
 
-print(f"result: {sum}")
 
-# endregion
+def split_updates(rules, updates):
+    """
+    Separa gli update corretti da quelli che violano le regole.
 
-# region PART 2
-print("-----------------------------\nPART 2")
-print(f"incorrect_updates: {incorrect_updates}")
+    Args:
+        rules (dict): Il dizionario delle regole.
+        updates (list): La lista degli update.
 
-correct_updates = []
+    Returns:
+        tuple: Le liste (correct_updates, incorrect_updates).
+    """
+    correct_updates = []
+    incorrect_updates = []
 
-for update in incorrect_updates:
-    print(f"\n\nchecking {update}")
+    # per ogni update
+    for update in updates:
+        # print(f"checking: {update}")
+        result, _ = check_solution(rules, update)
 
-    update_copy = update.copy()
+        if not result:
+            debug("@ %s NOT OK", update)
+            incorrect_updates.append(update)
+        else:
+            debug("@ %s OK !!!", update)
+            correct_updates.append(update)
 
-    result = check_list(rules, update_copy, 1)
+    return correct_updates, incorrect_updates
 
-    if not result:
-        print(f"@ {update_copy} NOT OK")
-    else:
-        print(f"@ {update_copy} OK !!!")
-        correct_updates.append(update_copy)
 
-print(f"\nSOLUTION --------------------\n")
-print(f"correct_updates: {correct_updates}")
+def part1(parsed):
+    """
+    Somma degli elementi centrali degli update già ordinati correttamente.
+
+    Args:
+        parsed (tuple): Il risultato di parse().
+
+    Returns:
+        int: La somma degli elementi centrali.
+    """
+    rules, updates = parsed
+    correct_updates, _ = split_updates(rules, updates)
+
+    debug("correct_updates: %s", correct_updates)
+
+    return sum_of_middle_pages(correct_updates)
+
+
+def part2(parsed):
+    """
+    Riordina gli update scorretti e somma i loro elementi centrali.
+
+    Args:
+        parsed (tuple): Il risultato di parse().
+
+    Returns:
+        int: La somma degli elementi centrali degli update riordinati.
+    """
+    rules, updates = parsed
+    _, incorrect_updates = split_updates(rules, updates)
+    debug("incorrect_updates: %s", incorrect_updates)
+
+    correct_updates = []
+
+    for update in incorrect_updates:
+        debug("\n\nchecking %s", update)
+
+        update_copy = update.copy()
+
+        result = check_list(rules, update_copy, 1)
+
+        if not result:
+            debug("@ %s NOT OK", update_copy)
+        else:
+            debug("@ %s OK !!!", update_copy)
+            correct_updates.append(update_copy)
+
+    debug("correct_updates: %s", correct_updates)
+
+    return sum_of_middle_pages(correct_updates)
+
+
+if __name__ == '__main__':
+    file_path = f"./inputs/05/input.txt"
+    # Il file viene letto in streaming, una sezione alla volta
+    parsed = parse(iter_file_blocks(file_path))
+
+    # region PART 1
+    print("-----------------------------\nPART 1")
 
-sum = 0
-for update in correct_updates:
-    middle_elem = int(len(update) / 2)
-    sum += int(update[middle_elem])
-    print(update[middle_elem])
+    print(f"\nSOLUTION --------------------\n")
+    print(f"result: {part1(parsed)}")
+    # endregion
 
-print(f"result: {sum}")
+    # region PART 2
+    print("-----------------------------\nPART 2")
 
-# endregion
\ No newline at end of file
+    print(f"\nSOLUTION --------------------\n")
+    print(f"result: {part2(parsed)}")
+    # endregion
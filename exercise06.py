@@ -1,8 +1,32 @@
 import os
 import time
-from PIL import Image, ImageDraw, ImageFont
+from itertools import islice
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    # PIL è opzionale: serve solo per esportare i frame come immagini
+    Image = ImageDraw = ImageFont = None
+
+from checkpoint_utils import Checkpoint, checkpoint_key
+from file_utils import cached_parse
+from log_utils import debug, info
+from matrix_utils import (Bitboard, ObstacleIndex, CHAR_TO_DIRECTION, DIRECTION_CHARS, DIRECTION_DELTAS,
+                          DIRECTION_DR, DIRECTION_DC, ROTATE_RIGHT)
+import profile_utils
+
+FONT_PATH = "inputs/06/DejaVuSansMono.ttf"
+
+# Il font viene caricato solo al primo frame esportato
+global_font = None
+
+
+def get_font():
+    global global_font
+    if global_font is None:
+        global_font = ImageFont.truetype(FONT_PATH, 16)
+    return global_font
 
-global_font = ImageFont.truetype("inputs/06/DejaVuSansMono.ttf", 16)
 
 def read_file_to_string(file_path):
     """
@@ -72,25 +96,6 @@ def is_position_inside(matrix, guard_position):
     row, col = guard_position
     return 0 <= row < rows and 0 <= col < cols
 
-def get_direction_from_char(char):
-    """
-    Restituisce la direzione corrispondente a un carattere tra '^', '>', '<', 'v'.
-
-    Args:
-        char (str): Il carattere da analizzare.
-
-    Returns:
-        str or None: La direzione corrispondente ('up', 'down', 'left', 'right')
-                     oppure None se il carattere non è riconosciuto.
-    """
-    mapping = {
-        '^': 'up',
-        'v': 'down',
-        '<': 'left',
-        '>': 'right'
-    }
-    return mapping.get(char, None)
-
 def move_element_in_matrix(matrix, pos1, pos2):
     """
     Inserisce una 'X' nella posizione pos1 della matrice e sposta il carattere
@@ -123,25 +128,6 @@ def move_element_in_matrix(matrix, pos1, pos2):
         matrix[r2][c2] = original_char
     # Se pos2 è fuori dalla matrice, non facciamo nulla: il carattere originale va perso.
 
-def rotate_direction_90(char):
-    """
-    Ruota di 90 gradi a destra la direzione indicata dal carattere.
-
-    Args:
-        char (str): Un carattere tra '^', '>', '<', 'v'.
-
-    Returns:
-        str: Il carattere corrispondente alla direzione ruotata di 90 gradi a destra.
-             Restituisce None se il carattere non è valido.
-    """
-    mapping = {
-        '^': '>',
-        '>': 'v',
-        'v': '<',
-        '<': '^'
-    }
-    return mapping.get(char, None)
-
 def matrix_to_string(matrix):
     """
     Converte una matrice XY di caratteri in una stringa.
@@ -155,7 +141,9 @@ def matrix_to_string(matrix):
     """
     return '\n'.join(''.join(row) for row in matrix)
 
-def text_to_image(text, font=global_font, padding=10, bg_color="white", text_color="black"):
+def text_to_image(text, font=None, padding=10, bg_color="white", text_color="black"):
+    font = font if font is not None else get_font()
+
     # Mappa di colori in base al carattere
     color_map = {
         ".": "gray",
@@ -199,16 +187,13 @@ def text_to_image(text, font=global_font, padding=10, bg_color="white", text_col
 
     return img
 
-def export_frame():
+def export_frame(grid, idx):
     img_path = f"inputs/06/frames/frame_{idx:04d}.png"
     if not os.path.exists(img_path):
         img = text_to_image(matrix_to_string(grid))
         img.save(img_path)
 
 
-file_path = f"./inputs/06/input.txt"
-file_content = read_file_to_string(file_path)
-
 def find_char_in_grid(grid, chars):
     rows, cols = get_matrix_dimensions(grid)
     position = ()
@@ -221,64 +206,82 @@ def find_char_in_grid(grid, chars):
     return position
 
 
-def initialize():
-    grid = string_to_matrix(file_content)
+def initialize(file_path):
+    # La griglia analizzata viene presa dalla cache (chiave: hash del file), ogni chiamata ne riceve una copia
+    grid = cached_parse(file_path, string_to_matrix)
     guard_position = find_char_in_grid(grid, ['^', '<', '>', 'v'])
 
     return grid, guard_position
 
 
+def parse(data):
+    """
+    Converte l'input nella griglia e trova la posizione iniziale della guardia.
+
+    Args:
+        data (str): Il contenuto del file di input.
+
+    Returns:
+        tuple: La griglia (lista di liste) e la posizione (r, c) della guardia.
+    """
+    grid = string_to_matrix(data)
+    guard_position = find_char_in_grid(grid, ['^', '<', '>', 'v'])
+
+    return grid, guard_position
 
 
 # region PART 1
 
-print("-----------------------------\nPART 1")
+def part1(parsed):
+    """
+    Simula il percorso della guardia e conta le celle visitate.
+
+    Args:
+        parsed (tuple): Il risultato di parse(); la griglia non viene modificata.
 
-grid, guard_position = initialize()
+    Returns:
+        int: Il numero di celle visitate.
+    """
+    grid = [row.copy() for row in parsed[0]]
+    guard_position = parsed[1]
 
-idx = 0
-while True:
-    #export_frame()
+    idx = 0
+    while True:
+        #export_frame(grid, idx)
 
-    current_char = grid[guard_position[0]][guard_position[1]]
-    direction = get_direction_from_char(current_char)
+        current_char = grid[guard_position[0]][guard_position[1]]
+        direction = CHAR_TO_DIRECTION[current_char]
 
-    next_position = ()
-    if direction == "up":
-        next_position = (guard_position[0]-1, guard_position[1])
-    elif direction == "left":
-        next_position = (guard_position[0], guard_position[1]-1)
-    elif direction == "right":
-        next_position = (guard_position[0], guard_position[1]+1)
-    elif direction == "down":
-        next_position = (guard_position[0]+1, guard_position[1])
+        next_position = (guard_position[0] + DIRECTION_DR[direction], guard_position[1] + DIRECTION_DC[direction])
 
-    if not is_position_inside(grid, next_position):
-        move_element_in_matrix(grid, guard_position, next_position)
-        break
+        if not is_position_inside(grid, next_position):
+            move_element_in_matrix(grid, guard_position, next_position)
+            break
+
+        other_elem = grid[next_position[0]][next_position[1]]
 
-    other_elem = grid[next_position[0]][next_position[1]]
+        if other_elem == "#":
+            grid[guard_position[0]][guard_position[1]] = DIRECTION_CHARS[ROTATE_RIGHT[direction]]
+            continue
+        elif other_elem == "." or other_elem == "X":
+            move_element_in_matrix(grid, guard_position, next_position)
+            guard_position = next_position
 
-    if other_elem == "#":
-        grid[guard_position[0]][guard_position[1]] = rotate_direction_90(current_char)
-        continue
-    elif other_elem == "." or other_elem == "X":
-        move_element_in_matrix(grid, guard_position, next_position)
-        guard_position = next_position
+        idx += 1
 
-    idx += 1
+    #export_frame(grid, idx)
 
-#export_frame()
+    profile_utils.count('steps', idx)
+    info(lambda: f"\n{matrix_to_string(grid)}")
 
-print(f"\n{matrix_to_string(grid)}")
+    # Le celle visitate sono marcate con 'X' durante il cammino: lo strato di bit viene
+    # costruito una volta sola alla fine (il Bitboard è un intero immutabile, ogni set() lo ricopia)
+    visited = Bitboard.from_grid(grid, 'X')
+    return visited.popcount()
 
-print(f"\nSOLUTION --------------------\n")
-positions_covered = matrix_to_string(grid).count('X')
-print(f"result: {positions_covered}")
 
 # endregion
 
-print("-----------------------------\nPART 2")
 
 def find_fourth_corner(pos1, pos2, pos3):
     """
@@ -307,284 +310,6 @@ def find_fourth_corner(pos1, pos2, pos3):
 
     return (r4, c4)
 
-def is_obstacle_in_line_to_position(grid, start_pos, direction, target_pos):
-    """
-    Verifica se, nella linea retta a partire da start_pos nella direzione indicata,
-    c'è un ostacolo '#' prima di raggiungere target_pos.
-
-    Args:
-        grid (list of list of str): Griglia di caratteri.
-        start_pos (tuple): (r, c) posizione di partenza.
-        direction (str): Direzione tra '^', 'v', '<', '>'.
-        target_pos (tuple): (r, c) posizione obiettivo.
-
-    Returns:
-        bool: True se c'è un ostacolo '#' prima di raggiungere target_pos, False altrimenti.
-    """
-    rows = len(grid)
-    if rows == 0:
-        return False
-    cols = len(grid[0])
-
-    r_start, c_start = start_pos
-    r_target, c_target = target_pos
-
-    if r_target > rows-1 or c_target > cols-1 or r_target < 0 or c_target < 0:
-        return True
-    if grid[r_target][c_target] == '#':
-        return True
-
-    # Determina delta r, c e controlla l'allineamento del target nella direzione scelta
-    if direction == 'up':
-        if c_target != c_start or r_target >= r_start:
-            return False
-        dr, dc = -1, 0
-    elif direction == 'down':
-        if c_target != c_start or r_target <= r_start:
-            return False
-        dr, dc = 1, 0
-    elif direction == 'left':
-        if r_target != r_start or c_target >= c_start:
-            return False
-        dr, dc = 0, -1
-    elif direction == 'right':
-        if r_target != r_start or c_target <= c_start:
-            return False
-        dr, dc = 0, 1
-    else:
-        # Direzione non valida
-        return False
-
-    # Spostati lungo la linea dalla cella successiva a start_pos fino alla target_pos
-    current_r = r_start + dr
-    current_c = c_start + dc
-
-    while 0 <= current_r < rows and 0 <= current_c < cols:
-        if (current_r, current_c) == (r_target, c_target):
-            # Raggiunto il target senza ostacoli
-            return False
-        if grid[current_r][current_c] == '#':
-            # Ostacolo incontrato prima del target
-            return True
-
-        current_r += dr
-        current_c += dc
-
-    # Se esco dalla griglia prima di raggiungere il target, significa che non era sulla stessa linea direzionale.
-    # Avendo già controllato l'allineamento, qui significa semplicemente che non c'è ostacolo lungo il percorso.
-    return False
-
-def find_horizontal_line_from_position(grid, start_pos):
-    """
-    Restituisce la linea orizzontale completa a partire da start_pos,
-    estendendosi verso sinistra e verso destra finché non incontra un ostacolo o il bordo.
-
-    Restituisce una tupla (r, c_min, c_max) dove:
-      r = riga fissa
-      c_min = colonna minima raggiunta
-      c_max = colonna massima raggiunta
-    """
-    r_s, c_s = start_pos
-
-    # Trova estremo a sinistra
-    left_line = find_line_extreme(grid, start_pos, 'left')
-    # Trova estremo a destra
-    right_line = find_line_extreme(grid, start_pos, 'right')
-
-    # left_line = (r_s, c_min_left, c_s) se si è mosso a sinistra
-    # right_line = (r_s, c_s, c_max_right) se si è mosso a destra
-
-    # Ora combiniamo i risultati
-    # Se left_line o right_line è None significa che da quel lato non si è potuto andare (solo start_pos valida)
-    if left_line is None and right_line is None:
-        # Non ci si può muovere né a sinistra né a destra
-        return (r_s, c_s, c_s)
-    if left_line is None:
-        # Solo destra disponibile
-        r_line, c_min, c_max = right_line
-        # c_min potrebbe essere c_s, quindi la linea parte esattamente dal punto di start_pos e va a destra
-        return (r_line, c_min, c_max)
-    if right_line is None:
-        # Solo sinistra disponibile
-        r_line, c_min, c_max = left_line
-        # c_max potrebbe essere c_s, quindi la linea parte dal punto di start_pos e va a sinistra
-        return (r_line, c_min, c_max)
-
-    # Entrambe le linee disponibili
-    # left_line = (r_s, c_min_left, c_s)
-    # right_line = (r_s, c_s, c_max_right)
-    # Combiniamo min e max
-    _, c_min_left, _ = left_line
-    _, _, c_max_right = right_line
-
-    return (r_s, c_min_left, c_max_right)
-
-def find_vertical_line_from_position(grid, start_pos):
-    """
-    Restituisce la linea verticale completa a partire da start_pos,
-    estendendosi verso l'alto e verso il basso finché non incontra un ostacolo o il bordo.
-
-    Restituisce una tupla (c, r_min, r_max) dove:
-      c = colonna fissa
-      r_min = riga minima raggiunta
-      r_max = riga massima raggiunta
-    """
-    r_s, c_s = start_pos
-
-    # Estremo verso l'alto
-    up_line = find_line_extreme(grid, start_pos, 'up')
-    # Estremo verso il basso
-    down_line = find_line_extreme(grid, start_pos, 'down')
-
-    # up_line = (c_s, r_min_up, r_s) se ci si è mossi in su
-    # down_line = (c_s, r_s, r_max_down) se ci si è mossi in giù
-
-    if up_line is None and down_line is None:
-        # Non ci si può muovere né in su né in giù
-        return (c_s, r_s, r_s)
-    if up_line is None:
-        # Solo giù disponibile
-        c_line, r_min, r_max = down_line
-        return (c_line, r_min, r_max)
-    if down_line is None:
-        # Solo su disponibile
-        c_line, r_min, r_max = up_line
-        return (c_line, r_min, r_max)
-
-    # Entrambe disponibili
-    # up_line = (c_s, r_min_up, r_s)
-    # down_line = (c_s, r_s, r_max_down)
-    _, r_min_up, _ = up_line
-    _, _, r_max_down = down_line
-
-    return (c_s, r_min_up, r_max_down)
-
-def find_intersection_from_direction(grid, start_pos, direction):
-    # Supponiamo di avere la funzione find_line_extreme già definita
-    horizontal_line = find_horizontal_line_from_position(grid, (8, 6))
-    vertical_line = find_vertical_line_from_position(grid, (8, 6))
-
-    # Ora horizontal_line = (r_line, c_min, c_max)
-    # e vertical_line = (c_line, r_min, r_max)
-
-    # Se vogliamo l'intersezione:
-    r_line, c_min, c_max = horizontal_line
-    c_line, r_min, r_max = vertical_line
-
-    if r_min <= r_line <= r_max and c_min <= c_line <= c_max:
-        intersection = (r_line, c_line)
-
-        # 5. Sposta l'intersezione di 1 cella nella direzione
-        r_i, c_i = intersection
-        if direction == 'up':
-            intersection = (r_i - 1, c_i)
-        elif direction == 'down':
-            intersection = (r_i + 1, c_i)
-        elif direction == 'left':
-            intersection = (r_i, c_i - 1)
-        elif direction == 'right':
-            intersection = (r_i, c_i + 1)
-
-        return intersection
-    else:
-        return None
-
-def find_line_extreme(grid, start_pos, direction):
-    """
-    Trova l'estremo della linea di esplosione a partire da start_pos nella direzione indicata.
-    La linea termina all'ostacolo '#' o al bordo della griglia.
-
-    Returns:
-      Se direzione è 'left' o 'right':
-         (r_s, c_min, c_max)
-      Se direzione è 'up' o 'down':
-         (c_s, r_min, r_max)
-    """
-    rows = len(grid)
-    if rows == 0:
-        return None
-    cols = len(grid[0])
-
-    r_s, c_s = start_pos
-
-    # Determina i delta
-    if direction == 'up':
-        dr, dc = -1, 0
-    elif direction == 'down':
-        dr, dc = 1, 0
-    elif direction == 'left':
-        dr, dc = 0, -1
-    elif direction == 'right':
-        dr, dc = 0, 1
-    else:
-        return None
-
-    cur_r, cur_c = r_s, c_s
-    # Avanza finché non incontri '#' o esci dalla griglia
-    while True:
-        next_r = cur_r + dr
-        next_c = cur_c + dc
-        if not (0 <= next_r < rows and 0 <= next_c < cols):
-            # bordo raggiunto
-            break
-        if grid[next_r][next_c] == '#':
-            # ostacolo trovato, fermati prima
-            break
-        # avanza
-        cur_r, cur_c = next_r, next_c
-
-    # Ora (cur_r, cur_c) è l'ultimo punto libero prima di un ostacolo/bordo
-    if direction in ('left', 'right'):
-        # linea orizzontale: r_s fisso, c_min = min(c_s, cur_c), c_max = max(c_s, cur_c)
-        c_min = min(c_s, cur_c)
-        c_max = max(c_s, cur_c)
-        return (r_s, c_min, c_max)
-    else:
-        # linea verticale: c_s fisso, r_min = min(r_s, cur_r), r_max = max(r_s, cur_r)
-        r_min = min(r_s, cur_r)
-        r_max = max(r_s, cur_r)
-        return (c_s, r_min, r_max)
-
-def process_grid(grid, guard_position, direction):
-    # Trova la linea orizzontale dalla guardia
-    horizontal_line = find_horizontal_line_from_position(grid, guard_position)
-    if horizontal_line is None:
-        return []
-
-    r_s, c_min, c_max = horizontal_line
-    r_g, c_g = guard_position
-
-    # Definisci il sotto-rettangolo
-    # Supponiamo che la guardia sia sotto e guardi a sinistra, allora:
-    # righe da 0 a r_s
-    # colonne da c_min a c_max
-    # Questa logica può variare a seconda del tuo scenario di gioco
-    r_start = 0
-    r_end = r_s
-    found_intersections = []
-
-    for r in range(r_start, r_end + 1):
-        for c in range(c_min, c_max + 1):
-            if grid[r][c] == '#':
-                # trovato un '#' nella zona
-                # Linea verticale: scende fino a r_s nella stessa colonna c
-                # Intersezione: (r_s, c)
-                intersection = (r_s, c)
-                # Sposta di 1 cella nella direzione
-                r_i, c_i = intersection
-                if direction == 'up':
-                    intersection = (r_i - 1, c_i)
-                elif direction == 'down':
-                    intersection = (r_i + 1, c_i)
-                elif direction == 'left':
-                    intersection = (r_i, c_i - 1)
-                elif direction == 'right':
-                    intersection = (r_i, c_i + 1)
-
-                found_intersections.append(intersection)
-
-    return found_intersections[0]
-
 def iterate_free_positions(grid):
     """
     Generatore che, data una griglia (lista di liste),
@@ -632,10 +357,39 @@ def has_repeated_sublist_of_4(lst):
     # Nessuna sotto-lista di 4 elementi compare almeno due volte
     return False
 
-new_obstacles_put = []
+def is_guard_in_loop(obstacle_index, guard_position, direction):
+    """
+    Simula il percorso della guardia saltando direttamente da un ostacolo al successivo
+    grazie all'indice degli ostacoli, invece di avanzare cella per cella.
+
+    Args:
+        obstacle_index (ObstacleIndex): Indice degli ostacoli (muri ed eventuale ostacolo aggiunto).
+        guard_position (tuple): (r, c) posizione iniziale della guardia.
+        direction (int): Codice della direzione iniziale della guardia (UP, RIGHT, DOWN, LEFT).
+
+    Returns:
+        bool: True se la guardia entra in un loop, False se esce dalla griglia.
+    """
+    visited_turns = set()
+    next_obstacle = obstacle_index.next_obstacle
+    while True:
+        hit = next_obstacle(guard_position, direction)
+        if hit is None:
+            # Nessun ostacolo davanti: la guardia esce dalla griglia
+            profile_utils.count('jumps', len(visited_turns) + 1)
+            return False
+
+        # La guardia si ferma nella cella che precede l'ostacolo
+        dr, dc = DIRECTION_DELTAS[direction]
+        guard_position = (hit[0] - dr, hit[1] - dc)
+
+        state = (guard_position, direction)
+        if state in visited_turns:
+            profile_utils.count('jumps', len(visited_turns) + 1)
+            return True
+        visited_turns.add(state)
+        direction = ROTATE_RIGHT[direction]
 
-solution_idx = 0
-solutions_unchanged = 3
 
 # while True:
 #     grid, guard_position = initialize()
@@ -647,7 +401,7 @@ solutions_unchanged = 3
 #
 #     while True:
 #         current_char = grid[guard_position[0]][guard_position[1]]
-#         direction = get_direction_from_char(current_char)
+#         direction = CHAR_TO_DIRECTION[current_char]
 #
 #         if direction_changes > 2 and len(obstacles) > 2:
 #             last = len(obstacles)
@@ -659,42 +413,24 @@ solutions_unchanged = 3
 #             exists_o = find_char_in_grid(grid, 'O')
 #
 #             if not exists_o:
-#                 has_obstacles = is_obstacle_in_line_to_position(grid, guard_position, direction, pos4)
-#                 can_add_new_obstacle = not new_obstacles_put.__contains__(pos4) and not has_obstacles
+#                 has_obstacles = is_obstacle_in_line_to_position(grid, guard_position, direction, pos4,
+#                                                                 obstacle_index=obstacle_index)
+#                 can_add_new_obstacle = pos4 not in new_obstacles_set and not has_obstacles
 #                 if can_add_new_obstacle:
 #                     new_obstacles_put.append(pos4)
+#                     new_obstacles_set.add(pos4)
 #
 #                     grid[pos4[0]][pos4[1]] = "O"
 #                     print(f"\n{matrix_to_string(grid)}")
 #                     obstacles = []
 #                     direction_changes = 0
-#                 # else:
-#                 #     edge_case_pos = process_grid(grid, guard_position, direction)
-#                 #     if edge_case_pos:
-#                 #         has_obstacles = is_obstacle_in_line_to_position(grid, guard_position, direction, edge_case_pos)
-#                 #         can_add_new_obstacle = not new_obstacles_put.__contains__(edge_case_pos) and not has_obstacles
-#                 #         if can_add_new_obstacle:
-#                 #             new_obstacles_put.append(edge_case_pos)
-#                 #
-#                 #             grid[edge_case_pos[0]][edge_case_pos[1]] = "O"
-#                 #             print(f"\n{matrix_to_string(grid)}")
-#                 #             obstacles = []
-#                 #             direction_changes = 0
 #             elif exists_o:
 #                 print(f"SOLUTION {solution_idx} FOUND !!")
 #                 solution_idx += 1
 #                 solution_found = True
 #                 break
 #
-#         next_position = ()
-#         if direction == "up":
-#             next_position = (guard_position[0]-1, guard_position[1])
-#         elif direction == "left":
-#             next_position = (guard_position[0], guard_position[1]-1)
-#         elif direction == "right":
-#             next_position = (guard_position[0], guard_position[1]+1)
-#         elif direction == "down":
-#             next_position = (guard_position[0]+1, guard_position[1])
+#         next_position = (guard_position[0] + DIRECTION_DR[direction], guard_position[1] + DIRECTION_DC[direction])
 #
 #         if not is_position_inside(grid, next_position):
 #             move_element_in_matrix(grid, guard_position, next_position)
@@ -703,7 +439,7 @@ solutions_unchanged = 3
 #         other_elem = grid[next_position[0]][next_position[1]]
 #
 #         if other_elem == "#" or other_elem == "O":
-#             grid[guard_position[0]][guard_position[1]] = rotate_direction_90(current_char)
+#             grid[guard_position[0]][guard_position[1]] = DIRECTION_CHARS[ROTATE_RIGHT[direction]]
 #             if other_elem == "#":
 #                 obstacles.append(next_position)
 #                 print(f"\n{matrix_to_string(grid)}")
@@ -718,93 +454,89 @@ solutions_unchanged = 3
 #     if solutions_unchanged == 0:
 #         break
 
-posizioni = iterate_free_positions(grid)
-pos = next(posizioni)
-#pos = (5,84)
-#pos = (6,3)
-
-print("\n\nBRUTE FORCE MODE:")
-while(pos):
-    grid, guard_position = initialize()
-    #print(f" > checking position: {pos} {grid[pos[0]][pos[1]]}")
-    if pos in new_obstacles_put or grid[pos[0]][pos[1]] == '^':
-        pos = next(posizioni)
-        print(f" >> position already covered")
-        continue
-    else:
-        solutions_unchanged = 1 # loop per 3 volte
-        while True:
-            grid, guard_position = initialize()
-            grid[pos[0]][pos[1]] = 'O'
-
-            loop_found = False
-            direction_changes = 0
-            obstacles = []
-            prev_obstacles = []
-            current_status = "moving"
-            #print(f"\n{matrix_to_string(grid)}")
-
-            while True:
-                current_char = grid[guard_position[0]][guard_position[1]]
-                direction = get_direction_from_char(current_char)
-
-                if current_status == "rotated" and direction_changes > 3 and len(obstacles) > 3:
-                    #print(f"\n{matrix_to_string(grid)}")
-                    exists_o = find_char_in_grid(grid, 'O')
-
-                    if exists_o and has_repeated_sublist_of_4(obstacles):
-                        loop_found = True
-                        break
-
-                next_position = ()
-                if direction == "up":
-                    next_position = (guard_position[0]-1, guard_position[1])
-                elif direction == "left":
-                    next_position = (guard_position[0], guard_position[1]-1)
-                elif direction == "right":
-                    next_position = (guard_position[0], guard_position[1]+1)
-                elif direction == "down":
-                    next_position = (guard_position[0]+1, guard_position[1])
-
-                if not is_position_inside(grid, next_position):
-                    move_element_in_matrix(grid, guard_position, next_position)
-                    break
+def part2(parsed, resume=None):
+    """
+    Conta le posizioni in cui un nuovo ostacolo fa entrare la guardia in un loop.
+    Il numero di posizioni provate e le soluzioni trovate vengono salvate periodicamente
+    in un checkpoint, da cui la ricerca può riprendere.
 
-                other_elem = grid[next_position[0]][next_position[1]]
-
-                if other_elem == "#" or other_elem == "O":
-                    grid[guard_position[0]][guard_position[1]] = rotate_direction_90(current_char)
-                    obstacles.append(next_position)
-                    #print(f"\n{matrix_to_string(grid)}")
-                    current_status = "rotated"
-                    direction_changes += 1
-                    continue
-                elif other_elem == "." or other_elem == "X":
-                    move_element_in_matrix(grid, guard_position, next_position)
-                    guard_position = next_position
-                    current_status = "moving"
-                    #print(f"\n{matrix_to_string(grid)}")
-
-            if not loop_found:
-                #print(f" > proceeding with next solution")
-                break
-            else:
-                print(f"SOLUTION {solution_idx} FOUND !!")
-                solution_idx += 1
-                new_obstacles_put.append(pos)
-                break
-        try:
-            pos = next(posizioni)
-        except StopIteration:
-            break
+    Args:
+        parsed (tuple): Il risultato di parse(); la griglia non viene modificata.
+        resume (bool, optional): Se True riprende dal checkpoint salvato. Default: get_resume().
+
+    Returns:
+        int: Il numero di posizioni valide per il nuovo ostacolo.
+    """
+    initial_grid, initial_guard_position = parsed
+    checkpoint = Checkpoint('day06-part2', checkpoint_key(initial_grid, initial_guard_position), resume)
+    state = checkpoint.load() or {'tried': 0, 'solutions': []}
+
+    # La lista conserva l'ordine delle soluzioni per il checkpoint, l'insieme serve per i controlli
+    new_obstacles_put = [tuple(pos) for pos in state['solutions']]
+    new_obstacles_set = set(new_obstacles_put)
+    solution_idx = len(new_obstacles_put)
+    tried = state['tried']
+    if tried:
+        info("resuming from position %s (%s solutions)", tried, solution_idx)
+
+    posizioni = islice(iterate_free_positions(initial_grid), tried, None)
+
+    debug("\n\nBRUTE FORCE MODE:")
+
+    # L'indice degli ostacoli viene costruito una sola volta e riutilizzato per tutti i candidati:
+    # ogni nuovo ostacolo viene aggiunto, verificato e poi rimosso (costo proporzionale agli
+    # ostacoli della sua riga e colonna, non alla griglia)
+    initial_direction = CHAR_TO_DIRECTION[initial_grid[initial_guard_position[0]][initial_guard_position[1]]]
+    obstacle_index = ObstacleIndex.from_grid(initial_grid)
+
+    for pos in posizioni:
+        tried += 1
+        if checkpoint.due():
+            # Le posizioni già provate sono tutte quelle prima di pos
+            checkpoint.save({'tried': tried - 1, 'solutions': new_obstacles_put})
+
+        if pos in new_obstacles_set or pos == initial_guard_position:
+            debug(" >> position already covered")
+            continue
+
+        profile_utils.count('candidates')
+        obstacle_index.add(pos)
+        if is_guard_in_loop(obstacle_index, initial_guard_position, initial_direction):
+            debug("SOLUTION %s FOUND !!", solution_idx)
+            solution_idx += 1
+            new_obstacles_put.append(pos)
+            new_obstacles_set.add(pos)
+        obstacle_index.remove(pos)
+
+    checkpoint.clear()
+
+    def solutions_to_string():
+        grid = [row.copy() for row in initial_grid]
+        for solution in new_obstacles_put:
+            row = solution[0]
+            col = solution[1]
+            grid[row][col] = 'O'
+        return matrix_to_string(grid)
+
+    info(solutions_to_string)
+
+    return solution_idx
+
+
+if __name__ == '__main__':
+    file_path = f"./inputs/06/input.txt"
+    parsed = initialize(file_path)
+
+    print("-----------------------------\nPART 1")
+
+    positions_covered = part1(parsed)
+
+    print(f"\nSOLUTION --------------------\n")
+    print(f"result: {positions_covered}")
 
-print(f"\nSOLUTION --------------------\n")
+    print("-----------------------------\nPART 2")
 
-grid, _ = initialize()
-for solution in new_obstacles_put:
-    row = solution[0]
-    col = solution[1]
-    grid[row][col] = 'O'
+    solution_idx = part2(parsed)
 
-print(matrix_to_string(grid))
-print(f"\nsolutions: {solution_idx}")
+    print(f"\nSOLUTION --------------------\n")
+    print(f"\nsolutions: {solution_idx}")
@@ -1,67 +1,32 @@
 from itertools import product
 
-def read_file_to_string(file_path):
-    """
-    Legge un intero file e restituisce il contenuto come stringa.
-
-    Args:
-        file_path (str): Il percorso del file da leggere.
-
-    Returns:
-        str: Il contenuto del file come stringa.
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        return content
-    except FileNotFoundError:
-        print(f"Errore: Il file '{file_path}' non esiste.")
-        return ""
-    except IOError as e:
-        print(f"Errore durante la lettura del file: {e}")
-        return ""
-
-def parse_line(line):
-    """
-    Parsea una singola linea del tipo "123123: 24 12 11 2".
-    Restituisce un dizionario con:
-    {
-      "result": <numero a sinistra dei due punti come int>,
-      "operands": <lista di interi sulla destra dei due punti>
-    }
-    """
-    # Dividi la linea in due parti: prima e dopo i due punti
-    left_part, right_part = line.split(":", 1)
+from file_utils import iter_file_lines
+from log_utils import TRACE, debug, is_enabled, trace
+from string_utils import parse_int_records
 
-    # Rimuovi spazi bianchi
-    left_part = left_part.strip()
-    right_part = right_part.strip()
-
-    # Converti la parte a sinistra in int
-    risultato = int(left_part)
-
-    # Converti la parte a destra in una lista di interi
-    operandi_str = right_part.split()
-    operandi = [int(x) for x in operandi_str]
-
-    return {
-        "result": risultato,
-        "operands": operandi
-    }
+# Tabelle delle combinazioni già generate, per (N, simboli): dipendono solo dal numero di
+# operandi, quindi vengono condivise da tutte le equazioni e da tutti gli input del processo
+combinations_cache = {}
 
 def generate_combinations(N, symbols=None):
     """
     Genera tutte le combinazioni possibili di '+' e '*'
     di lunghezza N.
-    Restituisce una lista di stringhe.
+    Restituisce una lista di stringhe (condivisa: non va modificata).
     """
     if symbols is None:
         symbols = ['+', '*']
+    key = (N, tuple(symbols))
+    if key in combinations_cache:
+        return combinations_cache[key]
+
     all_combinations = product(symbols, repeat=N)
     # all_combinations è un iteratore di tuple come ('+', '+', '*'), ecc.
 
     # Converti ogni tupla in stringa
-    return [''.join(combo) for combo in all_combinations]
+    combinations = [''.join(combo) for combo in all_combinations]
+    combinations_cache[key] = combinations
+    return combinations
 
 def combine_operands_and_operators(operands, operators):
     """
@@ -132,63 +97,87 @@ def evaluate_in_order(operands, operators):
 
     return result
 
-print("-----------------------------\nPART 1")
+def sum_of_solvable_equations(equations, symbols):
+    """
+    Somma i risultati delle equazioni che possono essere ottenute combinando gli operandi
+    con almeno una sequenza di operatori, valutata da sinistra a destra.
 
-file_path = f"./inputs/07/input.txt"
-file_content = read_file_to_string(file_path)
+    Args:
+        equations (tuple): (values, offsets) di parse(): l'equazione i occupa
+                           values[offsets[i]:offsets[i + 1]], risultato seguito dagli operandi.
+        symbols (list): Gli operatori ammessi.
 
-equation_list = [parse_line(l) for l in file_content.split('\n')]
-#print(equation_list)
-correct_equations = []
+    Returns:
+        int: La somma dei risultati delle equazioni risolvibili (le equazioni ripetute contano una volta).
+    """
+    values, offsets = equations
+    correct_equations = set()
+
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        result = values[start]
+        operands = values[start + 1:end]
+        debug("result: %s operands: %s", result, operands)
+
+        operations = generate_combinations(len(operands)-1, symbols)
+        debug("%s", operations)
+
+        # La stringa dell'equazione serve solo per i messaggi: viene costruita solo se stampata
+        tracing = is_enabled(TRACE)
+        for possible_operations in operations:
+            real_result = evaluate_in_order(operands, possible_operations)
+            if tracing:
+                trace("equation: %s = %s", combine_operands_and_operators(operands, possible_operations), real_result)
 
-for equation_data in equation_list:
-    result = equation_data["result"]
-    operands = equation_data["operands"]
-    print(f"result: {result} operands: {operands}")
+            if result == real_result:
+                debug(lambda: f" > {combine_operands_and_operators(operands, possible_operations)} = {real_result} == {result} FOUND IT!!")
+                correct_equations.add((result, tuple(operands)))
+                break
 
-    operations = generate_combinations(len(operands)-1,['+', '*'])
-    print(operations)
+    return sum(result for result, _ in correct_equations)
+
+
+def parse(data):
+    """
+    Converte l'input nelle equazioni, senza costruire un oggetto per equazione.
 
-    for possible_operations in operations:
-        equation = combine_operands_and_operators(operands, possible_operations)
-        real_result = evaluate_in_order(operands, possible_operations)
-        print(f"equation: {equation} = {real_result}")
+    Args:
+        data (str or iterable): Il contenuto del file di input, o le sue righe (es. da iter_file_lines).
 
-        if result == real_result and not correct_equations.__contains__(equation_data):
-            print(f" > {equation} = {real_result} == {result} FOUND IT!!")
-            correct_equations.append(equation_data)
+    Returns:
+        tuple: (values, offsets) di parse_int_records: il primo intero di ogni equazione è il
+               risultato, gli altri sono gli operandi.
+    """
+    # Una sola passata sul testo: tutti gli interi in un array piatto, le righe negli offset
+    return parse_int_records(data)
 
-print(f"\nSOLUTION --------------------")
-sum = 0
-for correct_equation in correct_equations:
-    sum += correct_equation["result"]
 
-print(f"solution: {sum}\n")
+def part1(equation_list):
+    """
+    Somma delle equazioni risolvibili con '+' e '*'.
+    """
+    return sum_of_solvable_equations(equation_list, ['+', '*'])
 
-print("-----------------------------\nPART 2")
 
-correct_equations = []
+def part2(equation_list):
+    """
+    Somma delle equazioni risolvibili con '+', '*' e la concatenazione '|'.
+    """
+    return sum_of_solvable_equations(equation_list, ['+', '*', '|'])
 
-for equation_data in equation_list:
-    result = equation_data["result"]
-    operands = equation_data["operands"]
-    print(f"result: {result} operands: {operands}")
 
-    operations = generate_combinations(len(operands)-1,['+', '*', '|'])
-    print(operations)
+if __name__ == '__main__':
+    print("-----------------------------\nPART 1")
 
-    for possible_operations in operations:
-        equation = combine_operands_and_operators(operands, possible_operations)
-        real_result = evaluate_in_order(operands, possible_operations)
-        print(f"equation: {equation} = {real_result}")
+    file_path = f"./inputs/07/input.txt"
+    # Il file viene letto in streaming, una riga alla volta
+    equation_list = parse(iter_file_lines(file_path))
+    #print(equation_list)
 
-        if result == real_result and not correct_equations.__contains__(equation_data):
-            print(f" > {equation} = {real_result} == {result} FOUND IT!!")
-            correct_equations.append(equation_data)
+    print(f"\nSOLUTION --------------------")
+    print(f"solution: {part1(equation_list)}\n")
 
-print(f"\nSOLUTION --------------------\n")
-sum = 0
-for correct_equation in correct_equations:
-    sum += correct_equation["result"]
+    print("-----------------------------\nPART 2")
 
-print(f"solution: {sum}\n")
\ No newline at end of file
+    print(f"\nSOLUTION --------------------\n")
+    print(f"solution: {part2(equation_list)}\n")
@@ -1,5 +1,9 @@
 from itertools import combinations
 
+from log_utils import INFO, debug, info, is_enabled
+from matrix_utils import GridRenderer
+from profile_utils import phase
+
 
 def read_file_to_string(file_path):
     """
@@ -101,9 +105,6 @@ def find_char_in_grid(grid, chars, known_positions=None):
     return position
 
 
-print("-----------------------------\nPART 1")
-
-
 def find_relative_positions(pos1, pos2):
     """
     Trova due nuove posizioni basate sulla distanza relativa tra due posizioni date.
@@ -135,57 +136,6 @@ def find_relative_positions(pos1, pos2):
     return [new_pos1, new_pos2]
 
 
-file_path = f"./inputs/08/input.txt"
-file_content = read_file_to_string(file_path)
-
-grid = string_to_matrix(file_content)
-
-print(matrix_to_string(grid))
-
-antennas_positions = {}
-antinode_positions = []
-
-rows, cols = get_matrix_dimensions(grid)
-
-# Trova le antenne e le loro frequenze uniche
-for row in range(rows):
-    for col in range(cols):
-        item = grid[row][col]
-        if item != '.':
-            if item not in antennas_positions:
-                # Aggiungi nuova antenna al dizionario
-                antennas_positions[item] = [(row, col)]
-            else:
-                # Se l'antenna esiste già, aggiungi la nuova posizione alla lista
-                antennas_positions[item].append((row, col))
-
-print(f"\nantennas_positions: {antennas_positions}")
-
-for antenna in antennas_positions:
-    print(f"checking antenna {antenna}:")
-    antenna_positions = antennas_positions[antenna]
-
-    for pos1, pos2 in combinations(antenna_positions, 2):
-        results = find_relative_positions(pos1, pos2)
-        for result in results:
-            if is_position_inside(grid, result) and not antinode_positions.__contains__(result):
-                antinode_positions.append(result)
-
-                if grid[result[0]][result[1]] == '.':
-                    grid[result[0]][result[1]] = "#"
-
-                print(matrix_to_string(grid))
-
-print(f"\nSOLUTION --------------------\n")
-
-print(matrix_to_string(grid))
-print(antinode_positions)
-
-print(f"solution: {len(antinode_positions)}\n")
-
-print("-----------------------------\nPART 2")
-
-
 def find_relative_positions_extended(grid, pos1, pos2, callback):
     """
     Trova più posizioni in entrambe le direzioni relative a due posizioni iniziali,
@@ -235,24 +185,128 @@ def find_relative_positions_extended(grid, pos1, pos2, callback):
     return results
 
 
-for antenna in antennas_positions:
-    print(f"checking antenna {antenna}:")
-    antenna_positions = antennas_positions[antenna]
+def find_antennas(grid):
+    """
+    Trova le antenne della griglia raggruppate per frequenza.
+
+    Args:
+        grid (list of list): La griglia.
+
+    Returns:
+        dict: Dizionario frequenza -> lista di posizioni (row, col).
+    """
+    antennas_positions = {}
+
+    rows, cols = get_matrix_dimensions(grid)
+
+    # Trova le antenne e le loro frequenze uniche
+    for row in range(rows):
+        for col in range(cols):
+            item = grid[row][col]
+            if item != '.':
+                if item not in antennas_positions:
+                    # Aggiungi nuova antenna al dizionario
+                    antennas_positions[item] = [(row, col)]
+                else:
+                    # Se l'antenna esiste già, aggiungi la nuova posizione alla lista
+                    antennas_positions[item].append((row, col))
+
+    return antennas_positions
+
+
+def count_antinodes(parsed, find_positions):
+    """
+    Segna sulla griglia gli antinodi generati da ogni coppia di antenne della stessa frequenza
+    e li conta.
+
+    Args:
+        parsed (tuple): Il risultato di parse(); la griglia non viene modificata.
+        find_positions (function): Funzione (grid, pos1, pos2) -> posizioni candidate.
+
+    Returns:
+        int: Il numero di antinodi distinti all'interno della griglia.
+    """
+    grid = [row.copy() for row in parsed[0]]
+    antennas_positions = parsed[1]
+    antinode_positions = []
+
+    # Ridisegna solo le righe modificate a ogni nuovo antinodo (solo se l'output è abilitato)
+    drawing = is_enabled(INFO)
+    renderer = GridRenderer(grid)
+
+    for antenna in antennas_positions:
+        info("checking antenna %s:", antenna)
+        renderer.invalidate()
+        antenna_positions = antennas_positions[antenna]
+
+        for pos1, pos2 in combinations(antenna_positions, 2):
+            results = find_positions(grid, pos1, pos2)
+            for result in results:
+                if is_position_inside(grid, result) and not antinode_positions.__contains__(result):
+                    antinode_positions.append(result)
+
+                    if grid[result[0]][result[1]] == '.':
+                        renderer.set(result, "#")
+
+                    if drawing:
+                        with phase('render'):
+                            renderer.draw()
+
+    info(lambda: f"\n{renderer.render()}")
+    debug("%s", antinode_positions)
+
+    return len(antinode_positions)
+
+
+def parse(data):
+    """
+    Converte l'input nella griglia e trova le antenne.
+
+    Args:
+        data (str): Il contenuto del file di input.
+
+    Returns:
+        tuple: La griglia (lista di liste) e il dizionario delle antenne per frequenza.
+    """
+    grid = string_to_matrix(data)
+    antennas_positions = find_antennas(grid)
+
+    debug("\nantennas_positions: %s", antennas_positions)
+
+    return grid, antennas_positions
+
+
+def part1(parsed):
+    """
+    Conta gli antinodi: due per ogni coppia di antenne, alla stessa distanza oltre ciascuna antenna.
+    """
+    return count_antinodes(parsed, lambda grid, pos1, pos2: find_relative_positions(pos1, pos2))
+
+
+def part2(parsed):
+    """
+    Conta gli antinodi considerando tutte le posizioni allineate con ogni coppia di antenne.
+    """
+    return count_antinodes(parsed, lambda grid, pos1, pos2: find_relative_positions_extended(
+        grid, pos1, pos2, is_position_inside))
+
+
+if __name__ == '__main__':
+    print("-----------------------------\nPART 1")
+
+    file_path = f"./inputs/08/input.txt"
+    parsed = parse(read_file_to_string(file_path))
 
-    for pos1, pos2 in combinations(antenna_positions, 2):
-        results = find_relative_positions_extended(grid, pos1, pos2, is_position_inside)
-        for result in results:
-            if is_position_inside(grid, result) and not antinode_positions.__contains__(result):
-                antinode_positions.append(result)
+    print(matrix_to_string(parsed[0]))
 
-                if grid[result[0]][result[1]] == '.':
-                    grid[result[0]][result[1]] = "#"
+    solution = part1(parsed)
 
-                print(matrix_to_string(grid))
+    print(f"\nSOLUTION --------------------\n")
+    print(f"solution: {solution}\n")
 
-print(f"\nSOLUTION --------------------\n")
+    print("-----------------------------\nPART 2")
 
-print(matrix_to_string(grid))
-print(antinode_positions)
+    solution = part2(parsed)
 
-print(f"solution: {len(antinode_positions)}\n")
+    print(f"\nSOLUTION --------------------\n")
+    print(f"solution: {solution}\n")
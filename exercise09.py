@@ -1,5 +1,7 @@
 import re
 
+from log_utils import debug
+
 
 def read_file_to_string(file_path):
     """
@@ -301,82 +303,121 @@ def split_numbers_and_dots(input_string):
     return output
 
 
-print("-----------------------------\nPART 1")
+def parse(data):
+    """
+    Converte la mappa del disco nella lista di coppie (blocchi del file, blocchi liberi).
 
-file_path = f"./inputs/09/input.txt"
-file_content = read_file_to_string(file_path)
+    Args:
+        data (str): Il contenuto del file di input.
 
-input_data = split_string_into_key_value_pairs(file_content)
-print(f"input_data: {input_data}")
+    Returns:
+        list: Lista di coppie [file, spazio libero].
+    """
+    input_data = split_string_into_key_value_pairs(data)
+    debug("input_data: %s", input_data)
+    return input_data
 
-output_data_string = ""
-last_file_id = len(input_data)-1
-tot_points = 0
 
-file_id = 0
-for file in input_data:
-    output_data_string += str(file_id) * file[0]
-    output_data_string += "." * file[1]
-    tot_points += file[1]
-    file_id += 1
+def part1(input_data):
+    """
+    Compatta il disco spostando i blocchi dei file da destra negli spazi liberi a sinistra
+    e calcola il checksum.
 
-print(f"output_data_string: {output_data_string}")
-print(f"expected points: {tot_points}")
+    Args:
+        input_data (list): Il risultato di parse().
 
-output_data_lst = split_numbers_and_dots(output_data_string)
-output_final_string = ""
+    Returns:
+        int: Il checksum del disco compattato.
+    """
+    output_data_string = ""
+    last_file_id = len(input_data)-1
+    tot_points = 0
+
+    file_id = 0
+    for file in input_data:
+        output_data_string += str(file_id) * file[0]
+        output_data_string += "." * file[1]
+        tot_points += file[1]
+        file_id += 1
 
-output_data_lst_orig = output_data_lst.copy()
+    debug("output_data_string: %s", output_data_string)
+    debug("expected points: %s", tot_points)
 
-dots_to_find = len(str(last_file_id))
-dots_pos = find_element(output_data_lst, elem=['.']*dots_to_find, reverse=False)
+    output_data_lst = split_numbers_and_dots(output_data_string)
+    output_final_string = ""
+
+    output_data_lst_orig = output_data_lst.copy()
 
-print(f"starting with {last_file_id}")
-swapped = 0
-# cerco il primo punto nella lista di caratteri
-while dots_pos:
-    # a questo punto cerco l'ultimo file_id che esiste
-    last_file_pos = find_element(output_data_lst, elem=last_file_id, reverse=True)
     dots_to_find = len(str(last_file_id))
+    dots_pos = find_element(output_data_lst, elem=['.']*dots_to_find, reverse=False)
 
-    # if dots_pos > last_file_pos:
-    #     print(f" > middle_solution: {output_final_string}")
-    #     print(f" > END!")
-    #     break
+    debug("starting with %s", last_file_id)
+    swapped = 0
+    # cerco il primo punto nella lista di caratteri
+    while dots_pos:
+        # a questo punto cerco l'ultimo file_id che esiste
+        last_file_pos = find_element(output_data_lst, elem=last_file_id, reverse=True)
+        dots_to_find = len(str(last_file_id))
 
-    if last_file_pos >= 0:
-        print(f" > swapping {dots_pos}<->{last_file_pos}")
-        swap_positions_with_digits(output_data_lst, dots_pos, last_file_pos)
-        swapped += 1
+        # if dots_pos > last_file_pos:
+        #     print(f" > middle_solution: {output_final_string}")
+        #     print(f" > END!")
+        #     break
 
-    dots_pos = find_element(output_data_lst, elem=['.']*dots_to_find, reverse=False)
-    output_final_string = char_list_to_string(output_data_lst)
+        if last_file_pos >= 0:
+            debug(" > swapping %s<->%s", dots_pos, last_file_pos)
+            swap_positions_with_digits(output_data_lst, dots_pos, last_file_pos)
+            swapped += 1
+
+        dots_pos = find_element(output_data_lst, elem=['.']*dots_to_find, reverse=False)
+        output_final_string = char_list_to_string(output_data_lst)
+
+        if output_final_string.endswith("." * tot_points) or last_file_id == 0 or dots_pos > last_file_pos:
+            debug(" > middle_solution: %s", output_final_string)
+            debug(" > END!")
+            break
+
+        if swapped == output_data_lst_orig.count(str(last_file_id)):
+            debug(" > end for char %s... proceed with next", last_file_id)
+            last_file_id -= 1
+            swapped = 0
+
+    checksum_list = [int(char) for char in string_to_char_list(output_final_string) if char != '.']
+
+    idx = 0
+    sum = 0
+    for item in checksum_list:
+        #print(f"{item} * {idx} = {item * idx}")
+        sum += item * idx
+        idx += 1
+
+    return sum
+
+
+def part2(input_data):
+    """
+    Parte 2 non ancora risolta.
+
+    Returns:
+        None
+    """
+    return None
 
-    if output_final_string.endswith("." * tot_points) or last_file_id == 0 or dots_pos > last_file_pos:
-        print(f" > middle_solution: {output_final_string}")
-        print(f" > END!")
-        break
 
-    if swapped == output_data_lst_orig.count(str(last_file_id)):
-        print(f" > end for char {last_file_id}... proceed with next")
-        last_file_id -= 1
-        swapped = 0
+if __name__ == '__main__':
+    print("-----------------------------\nPART 1")
 
-checksum_list = [int(char) for char in string_to_char_list(output_final_string) if char != '.']
+    file_path = f"./inputs/09/input.txt"
+    input_data = parse(read_file_to_string(file_path))
 
-print(f"\nSOLUTION --------------------\n")
+    solution = part1(input_data)
 
-idx = 0
-sum = 0
-for item in checksum_list:
-    #print(f"{item} * {idx} = {item * idx}")
-    sum += item * idx
-    idx += 1
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"solution: {sum}\n")
+    print(f"solution: {solution}\n")
 
-print("-----------------------------\nPART 2")
+    print("-----------------------------\nPART 2")
 
-print(f"\nSOLUTION --------------------\n")
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"solution:\n")
+    print(f"solution:\n")
@@ -1,3 +1,5 @@
+from log_utils import debug
+
 
 def read_file_to_string(file_path):
     """
@@ -98,9 +100,6 @@ def find_char_in_grid(grid, chars, known_positions=None):
     return positions
 
 
-print("-----------------------------\nPART 1")
-
-
 def follow_path(grid, current_pos, initial_pos, solutions):
     element = int(grid[current_pos[0]][current_pos[1]])
 
@@ -168,52 +167,95 @@ def follow_path_with_trails(grid, current_pos, initial_pos, solutions):
     return solutions
 
 
-file_path = f"./inputs/10/input.txt"
-file_content = read_file_to_string(file_path)
+def parse(data):
+    """
+    Converte l'input nella griglia delle altezze e trova i punti di partenza (altezza 0).
+
+    Args:
+        data (str): Il contenuto del file di input.
+
+    Returns:
+        tuple: La griglia (lista di liste) e la lista delle posizioni di partenza.
+    """
+    grid = string_to_matrix(data)
+
+    debug(lambda: f"\ngrid:\n{matrix_to_string(grid)}")
 
-grid = string_to_matrix(file_content)
+    starting_positions = find_char_in_grid(grid, ['0'])
 
-print(f"\ngrid:\n{matrix_to_string(grid)}")
+    debug("\nstarting_positions: %s", starting_positions)
 
-starting_positions = find_char_in_grid(grid, ['0'])
+    return grid, starting_positions
 
-print(f"\nstarting_positions: {starting_positions}")
 
-solutions = []
-for starting_pos in starting_positions:
-    follow_path(grid, starting_pos, starting_pos, solutions)
+def part1(parsed):
+    """
+    Somma, per ogni punto di partenza, il numero di cime (altezza 9) raggiungibili.
 
+    Args:
+        parsed (tuple): Il risultato di parse().
 
-print(solutions)
+    Returns:
+        int: Il punteggio totale dei sentieri.
+    """
+    grid, starting_positions = parsed
+
+    solutions = []
+    for starting_pos in starting_positions:
+        follow_path(grid, starting_pos, starting_pos, solutions)
+
+    debug("%s", solutions)
+
+    count = 0
+    checks = {}
+    for solution in solutions:
+        if checks.keys().__contains__(solution["start"]):
+            checks[solution["start"]].append(solution["end"])
+        else:
+            checks[solution["start"]] = [solution["end"]]
+        count += 1
+
+    for solution in checks:
+        debug("solution: %s => %s", solution, len(checks[solution]))
+
+    return count
+
+
+def part2(parsed):
+    """
+    Conta i sentieri distinti da ogni punto di partenza a una cima.
+
+    Args:
+        parsed (tuple): Il risultato di parse().
+
+    Returns:
+        int: Il numero di sentieri distinti.
+    """
+    grid, starting_positions = parsed
 
-print(f"\nSOLUTION --------------------\n")
+    solutions = []
+    for starting_pos in starting_positions:
+        follow_path_with_trails(grid, starting_pos, [starting_pos], solutions)
 
-count = 0
-checks = {}
-for solution in solutions:
-    if checks.keys().__contains__(solution["start"]):
-        checks[solution["start"]].append(solution["end"])
-    else:
-        checks[solution["start"]] = [solution["end"]]
-    count += 1
+    return len(solutions)
 
 
-for solution in checks:
-    print(f"solution: {solution} => {len(checks[solution])}")
+if __name__ == '__main__':
+    print("-----------------------------\nPART 1")
 
-print(f"final solution: {count}\n")
+    file_path = f"./inputs/10/input.txt"
+    parsed = parse(read_file_to_string(file_path))
 
-print("-----------------------------\nPART 2")
+    count = part1(parsed)
 
-starting_positions = find_char_in_grid(grid, ['0'])
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"\nstarting_positions: {starting_positions}")
+    print(f"final solution: {count}\n")
 
-solutions = []
-for starting_pos in starting_positions:
-    follow_path_with_trails(grid, starting_pos, [starting_pos], solutions)
+    print("-----------------------------\nPART 2")
 
+    solution = part2(parsed)
 
-print(f"\nSOLUTION --------------------\n")
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"solution: {len(solutions)}\n")
\ No newline at end of file
+    print(f"solution: {solution}\n")
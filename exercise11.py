@@ -1,4 +1,8 @@
 import concurrent.futures
+from collections import Counter
+
+from log_utils import debug
+import profile_utils
 
 
 def read_file_to_string(file_path):
@@ -40,14 +44,6 @@ def split_string_by_separator(input_string, separator):
     return input_string.split(separator)
 
 
-print("-----------------------------\nPART 1")
-
-file_path = f"./inputs/11/input.txt"
-file_content = read_file_to_string(file_path)
-
-element_list = split_string_by_separator(file_content, ' ')
-output_list = []
-
 #2097446912 14168 4048 2 0 2 4 40 48 2024 40 48 80 96 2 8 6 7 6 0 3 2
 #2097446912 14168 4048 0 40 48 0 40 48 80 96 2 8 6 7 6 0 3 2
 
@@ -123,8 +119,6 @@ def parallel_process(element_list, num_sublists):
 
     return combined_results
 
-from collections import Counter
-
 def process_with_frequencies(element_list, iterations):
     """
     Processa una lista di elementi per un certo numero di iterazioni,
@@ -162,16 +156,65 @@ def process_with_frequencies(element_list, iterations):
                 result = element_int * 2024
                 new_frequency[str(result)] += count
 
+        # Ogni gruppo di pietre uguali viene calcolato una sola volta: le altre sono "hit"
+        if profile_utils.is_enabled():
+            profile_utils.count('stone_groups', len(frequency))
+            profile_utils.count('stones_reused', sum(frequency.values()) - len(frequency))
+
         # Aggiorna la frequenza con i nuovi valori
         frequency = new_frequency
 
     return frequency
 
-# Numero di iterazioni
-iterations = 25
+def count_stones(element_list, iterations):
+    """
+    Conta le pietre dopo il numero di iterazioni indicato.
+
+    Args:
+        element_list (list): Lista iniziale delle pietre (stringhe).
+        iterations (int): Numero di iterazioni (blink).
+
+    Returns:
+        int: Il numero totale di pietre.
+    """
+    # Calcola le frequenze finali
+    final_frequencies = process_with_frequencies(element_list, iterations)
+
+    # Mostra i risultati
+    debug("Frequenze finali:")
+    for element, count in final_frequencies.items():
+        debug("%s: %s", element, count)
+
+    # Numero totale di elementi
+    return sum(final_frequencies.values())
+
+
+def parse(data):
+    """
+    Converte l'input nella lista delle pietre.
+
+    Args:
+        data (str): Il contenuto del file di input.
+
+    Returns:
+        list: Lista delle pietre (stringhe).
+    """
+    return split_string_by_separator(data.strip(), ' ')
+
+
+def part1(element_list):
+    """
+    Numero di pietre dopo 25 iterazioni.
+    """
+    return count_stones(element_list, 25)
+
+
+def part2(element_list):
+    """
+    Numero di pietre dopo 75 iterazioni.
+    """
+    return count_stones(element_list, 75)
 
-# Calcola le frequenze finali
-final_frequencies = process_with_frequencies(element_list, iterations)
 
 # BRUTE FORCE MODE
 # for i in range(0, 25):
@@ -191,35 +234,19 @@ final_frequencies = process_with_frequencies(element_list, iterations)
 #     output_list = []
     #print(' '.join([str(num) for num in element_list]))
 
-print(f"\nSOLUTION --------------------\n")
-
-# Mostra i risultati
-print("Frequenze finali:")
-for element, count in final_frequencies.items():
-    print(f"{element}: {count}")
-
-# Numero totale di elementi
-total_elements = sum(final_frequencies.values())
-
-print("-----------------------------\nPART 2")
-
-element_list = split_string_by_separator(file_content, ' ')
-output_list = []
 
-iterations = 75
+if __name__ == '__main__':
+    print("-----------------------------\nPART 1")
 
-# Calcola le frequenze finali
-final_frequencies = process_with_frequencies(element_list, iterations)
+    file_path = f"./inputs/11/input.txt"
+    element_list = parse(read_file_to_string(file_path))
 
-print(f"\nSOLUTION --------------------\n")
+    print(f"\nSOLUTION --------------------\n")
 
-# Mostra i risultati
-print("Frequenze finali:")
-for element, count in final_frequencies.items():
-    print(f"{element}: {count}")
+    print(f"solution: {part1(element_list)}\n")
 
-# Numero totale di elementi
-total_elements = sum(final_frequencies.values())
+    print("-----------------------------\nPART 2")
 
-print(f"solution: {total_elements}\n")
+    print(f"\nSOLUTION --------------------\n")
 
+    print(f"solution: {part2(element_list)}\n")
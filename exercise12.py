@@ -1,3 +1,4 @@
+from log_utils import debug
 
 
 def read_file_to_string(file_path):
@@ -233,14 +234,6 @@ def follow_path_with_trails(grid, current_pos, initial_pos, solutions):
 #     return perimeter
 
 
-print("-----------------------------\nPART 1")
-
-file_path = f"./inputs/12/input.txt"
-file_content = read_file_to_string(file_path)
-
-grid = string_to_matrix(file_content)
-rows, cols = get_matrix_dimensions(grid)
-
 # elements = {}
 #
 # for row in range(rows):
@@ -335,26 +328,67 @@ def find_adjacent_groups(grid):
     return groups
 
 
-# Trova i gruppi adiacenti
-groups = find_adjacent_groups(grid)
-total_price = 0
+def parse(data):
+    """
+    Converte l'input nella griglia delle piante.
+
+    Args:
+        data (str): Il contenuto del file di input.
+
+    Returns:
+        list of list: La griglia.
+    """
+    return string_to_matrix(data)
+
+
+def part1(grid):
+    """
+    Costo totale delle recinzioni: somma di perimetro * area per ogni regione.
+
+    Args:
+        grid (list of list): Il risultato di parse().
+
+    Returns:
+        int: Il costo totale.
+    """
+    # Trova i gruppi adiacenti
+    groups = find_adjacent_groups(grid)
+    total_price = 0
+
+    # Calcola il perimetro per ogni gruppo
+    debug("Perimeters:")
+    for element, group_list in groups.items():
+        for i, group in enumerate(group_list, start=1):
+            area = len(group_list[i-1])
+            perimeter = calculate_perimeter(group, grid)
+            debug("%s_%s: Perimeter = %s Area = %s => Cost = %s", element, i, perimeter, area, perimeter*area)
+            total_price += perimeter*area
+
+    return total_price
+
+
+def part2(grid):
+    """
+    Parte 2 non ancora risolta.
+
+    Returns:
+        None
+    """
+    return None
+
 
-# Calcola il perimetro per ogni gruppo
-print("Perimeters:")
-for element, group_list in groups.items():
-    for i, group in enumerate(group_list, start=1):
-        area = len(group_list[i-1])
-        perimeter = calculate_perimeter(group, grid)
-        print(f"{element}_{i}: Perimeter = {perimeter} Area = {area} => Cost = {perimeter*area}")
-        total_price += perimeter*area
+if __name__ == '__main__':
+    print("-----------------------------\nPART 1")
 
+    file_path = f"./inputs/12/input.txt"
+    grid = parse(read_file_to_string(file_path))
 
-print(f"\nSOLUTION --------------------\n")
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"solution: {total_price}\n")
+    print(f"solution: {part1(grid)}\n")
 
-print("-----------------------------\nPART 2")
+    print("-----------------------------\nPART 2")
 
-print(f"\nSOLUTION --------------------\n")
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"solution:\n")
\ No newline at end of file
+    print(f"solution:\n")
@@ -1,5 +1,10 @@
 import re
 
+from file_utils import iter_file_blocks
+from log_utils import debug
+from string_utils import parse_int_columns
+
+
 def read_file_to_string(file_path):
     """
     Legge un intero file e restituisce il contenuto come stringa.
@@ -58,9 +63,6 @@ def parse_input(input_string):
     return results
 
 
-print("-----------------------------\nPART 1")
-
-
 def find_combination(goal, step_a, step_b):
     max_a = goal // step_a
     results = []
@@ -106,53 +108,6 @@ def find_steps_to_goal(prize, a_val, b_val):
 A_TOKEN = 3
 B_TOKEN = 1
 
-# file_path = f"./inputs/13/input.txt"
-# file_content = read_file_to_string(file_path)
-#
-# machines = parse_input(file_content)
-#
-# print(f"machines: {machines}")
-#
-# total_cost = 0
-#
-# for machine in machines:
-#     print(f"\n **** NEW MACHINE **** \n")
-#     solutions = find_steps_to_goal(machine["Prize"], machine["A"], machine["B"])
-#
-#     if not solutions:
-#         print("No valid solutions found!")
-#         continue
-#
-#     print("Valid solutions:")
-#     min_cost = float('inf')
-#     best_solution = None
-#
-#     for solution in solutions:
-#         x_steps_a = solution["steps"]["A"]
-#         x_steps_b = solution["steps"]["B"]
-#         cost = solution["cost"]
-#
-#         print(f"  -> Solution: {x_steps_a} steps A, {x_steps_b} steps B")
-#         print(f"  -> Total Cost: {cost}")
-#
-#         if cost < min_cost:
-#             min_cost = cost
-#             best_solution = solution
-#
-#     if best_solution:
-#         total_cost += best_solution['cost']
-#
-#         # Stampa la soluzione con il costo minimo
-#         print("\nBest Solution:")
-#         print(f"  -> Solution: {best_solution['steps']['A']} steps A, {best_solution['steps']['B']} steps B")
-#         print(f"  -> Total Cost: {best_solution['cost']}")
-
-print(f"\nSOLUTION --------------------\n")
-
-# print(f"solution: {total_cost}\n")
-
-print("-----------------------------\nPART 2")
-
 
 def solve_linear_equations(a1, b1, c1, a2, b2, c2):
     """
@@ -178,48 +133,131 @@ def solve_linear_equations(a1, b1, c1, a2, b2, c2):
     X = (c1 * b2 - c2 * b1) / determinant
     Y = (a1 * c2 - a2 * c1) / determinant
 
-    print(f"det: {determinant} X: {X} Y: {Y}")
+    debug("det: %s X: %s Y: %s", determinant, X, Y)
 
     return X, Y
 
 
-file_path = f"./inputs/13/input.txt"
-file_content = read_file_to_string(file_path)
+def parse(data):
+    """
+    Estrae le macchine dal testo di input.
+
+    Args:
+        data (str or iterable): Il contenuto del file di input, o i suoi blocchi (es. da iter_file_blocks).
+
+    Returns:
+        list: Una lista di tuple (a_x, a_y, b_x, b_y, prize_x, prize_y), una per macchina.
+    """
+    # Sei interi per macchina (A, B e Prize): estratti in una sola passata in sei colonne
+    machines = list(zip(*parse_int_columns(data, arity=6)))
+    debug("machines: %s", machines)
+    return machines
+
+
+def part1(machines):
+    """
+    Costo minimo in gettoni per vincere tutti i premi raggiungibili, cercando tutte le
+    combinazioni di pressioni dei pulsanti.
+
+    Args:
+        machines (list): Il risultato di parse().
+
+    Returns:
+        int: Il costo totale.
+    """
+    total_cost = 0
+
+    for a_x, a_y, b_x, b_y, prize_x, prize_y in machines:
+        debug("\n **** NEW MACHINE **** \n")
+        solutions = find_steps_to_goal((prize_x, prize_y), (a_x, a_y), (b_x, b_y))
+
+        if not solutions:
+            debug("No valid solutions found!")
+            continue
 
-machines = parse_input(file_content)
+        debug("Valid solutions:")
+        min_cost = float('inf')
+        best_solution = None
 
-print(f"machines: {machines}")
+        for solution in solutions:
+            x_steps_a = solution["steps"]["A"]
+            x_steps_b = solution["steps"]["B"]
+            cost = solution["cost"]
 
-total_cost = 0
+            debug("  -> Solution: %s steps A, %s steps B", x_steps_a, x_steps_b)
+            debug("  -> Total Cost: %s", cost)
 
-for machine in machines:
-    print(f"\n **** NEW MACHINE **** \n")
-    print(f"Goal: {machine['Prize']}, A: {machine['A']}, B: {machine['B']}")
+            if cost < min_cost:
+                min_cost = cost
+                best_solution = solution
 
-    a1, a2 = machine["A"]  # Incrementi in X e Y per il pulsante A
-    b1, b2 = machine["B"]  # Incrementi in X e Y per il pulsante B
-    c1, c2 = machine["Prize"]  # Goal in X e Y
-    c1 += 10000000000000
-    c2 += 10000000000000
+        if best_solution:
+            total_cost += best_solution['cost']
 
-    print(a1, b1, c1)  # Coefficienti per l'equazione X
-    print(a2, b2, c2)  # Coefficienti per l'equazione Y
+            # Stampa la soluzione con il costo minimo
+            debug("\nBest Solution:")
+            debug("  -> Solution: %s steps A, %s steps B", best_solution['steps']['A'], best_solution['steps']['B'])
+            debug("  -> Total Cost: %s", best_solution['cost'])
 
-    solutions = solve_linear_equations(a1, b1, c1, a2, b2, c2)
+    return total_cost
 
-    # Controllo che X e Y siano interi
-    if solutions:
-        X, Y = solutions
-        if X.is_integer() and Y.is_integer():  # Verifica che X e Y siano interi
-            X, Y = int(X), int(Y)  # Converti a interi
-            cost = X*3 + Y*1
-            total_cost += cost
-            print(f"Soluzioni: X = {X}, Y = {Y} @ cost = {cost}")
+
+def part2(machines):
+    """
+    Costo minimo in gettoni con i premi spostati di 10000000000000 su entrambi gli assi,
+    risolvendo il sistema lineare di ogni macchina.
+
+    Args:
+        machines (list): Il risultato di parse().
+
+    Returns:
+        int: Il costo totale.
+    """
+    total_cost = 0
+
+    # a: incrementi in X e Y per il pulsante A, b: per il pulsante B, c: goal in X e Y
+    for a1, a2, b1, b2, c1, c2 in machines:
+        debug("\n **** NEW MACHINE **** \n")
+        debug("Goal: %s, A: %s, B: %s", (c1, c2), (a1, a2), (b1, b2))
+
+        c1 += 10000000000000
+        c2 += 10000000000000
+
+        debug("%s %s %s", a1, b1, c1)  # Coefficienti per l'equazione X
+        debug("%s %s %s", a2, b2, c2)  # Coefficienti per l'equazione Y
+
+        solutions = solve_linear_equations(a1, b1, c1, a2, b2, c2)
+
+        # Controllo che X e Y siano interi
+        if solutions:
+            X, Y = solutions
+            if X.is_integer() and Y.is_integer():  # Verifica che X e Y siano interi
+                X, Y = int(X), int(Y)  # Converti a interi
+                cost = X*A_TOKEN + Y*B_TOKEN
+                total_cost += cost
+                debug("Soluzioni: X = %s, Y = %s @ cost = %s", X, Y, cost)
+            else:
+                debug("Le soluzioni trovate non sono intere.")
         else:
-            print("Le soluzioni trovate non sono intere.")
-    else:
-        print("Il sistema non ha soluzioni uniche.")
+            debug("Il sistema non ha soluzioni uniche.")
+
+    return total_cost
+
+
+if __name__ == '__main__':
+    file_path = f"./inputs/13/input.txt"
+
+    # Le macchine vengono lette un blocco alla volta, senza caricare l'intero file
+    machines = parse(iter_file_blocks(file_path))
+
+    print("-----------------------------\nPART 1")
+
+    print(f"\nSOLUTION --------------------\n")
+
+    print(f"solution: {part1(machines)}\n")
+
+    print("-----------------------------\nPART 2")
 
-print(f"\nSOLUTION --------------------\n")
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"solution: {total_cost}\n")
+    print(f"solution: {part2(machines)}\n")
@@ -1,42 +1,30 @@
-import os
 
+from checkpoint_utils import Checkpoint, checkpoint_key
 from file_utils import *
+from log_utils import debug, info
 from matrix_utils import *
+from search_utils import SearchControl
 from string_utils import *
-import re
-from time import sleep
 
+# Dimensioni dello spazio dei robot (righe, colonne); per gli input di test: (7, 11)
+SPACE_SIZE = (103, 101)
 
-def parse_input(input_string):
+
+def parse_input(input_bytes):
     """
     Analizza l'input per estrarre informazioni sui robot.
 
     Args:
-        input_string (str): Stringa di input formattata come 'p=x,y v=x,y'.
+        input_bytes (bytes, str or iterable): Input formattato come 'p=x,y v=x,y' (una riga per
+                                              robot), o le sue righe (es. da iter_file_lines).
 
     Returns:
-        list: Lista di dizionari con 'id', 'p' (posizione) e 'v' (velocità).
+        list: Lista di tuple ((riga, colonna) posizione, (riga, colonna) velocità).
     """
-    # Regex per estrarre i dati
-    robot_pattern = r"p=(-?\d+),(-?\d+) v=(-?\d+),(-?\d+)"
-
-    # Trova tutte le corrispondenze
-    robots = re.findall(robot_pattern, input_string)
-
-    # Creazione dei risultati
-    results = []
-    for idx, robot in enumerate(robots):
-        obj = {
-            "id": idx + 1,
-            "p": (int(robot[1]), int(robot[0])),
-            "v": (int(robot[3]), int(robot[2]))
-        }
-        results.append(obj)
+    # Un'unica passata su tutto il buffer: quattro colonne compatte di interi (x, y, vx, vy)
+    p_x, p_y, v_x, v_y = parse_int_columns(input_bytes, arity=4)
 
-    return results
-
-
-print("-----------------------------\nPART 1")
+    return list(zip(zip(p_y, p_x), zip(v_y, v_x)))
 
 
 def calculate_final_position(p, v, S, N):
@@ -93,80 +81,174 @@ def create_quadrants(S):
     return quadrants
 
 
-file_path = f"./inputs/14/input.txt"
-file_content = read_file_to_string(file_path)
+def longest_row_run(grid, n=None):
+    """
+    Lunghezza della più lunga fila di robot consecutivi sulla stessa riga.
 
-robots = parse_input(file_content)
+    Args:
+        grid (SparseGrid): La griglia dei robot.
+        n (int, optional): Se indicato, la scansione si ferma appena trova una fila lunga n.
 
-S = (103, 101)
-#S = (7, 11)
-grid = create_matrix(S[0], S[1], '.')
-quadrants = create_quadrants(S)
+    Returns:
+        int: La lunghezza della fila più lunga (al massimo n se indicato).
+    """
+    # Nella griglia sparsa sono memorizzate solo le celle occupate:
+    # si cercano coordinate impacchettate consecutive sulla stessa riga
+    longest = 0
+    consecutive_count = 0
+    previous_key = None
+    for key in sorted(grid.offsets_of('X')):
+        if previous_key is not None and key == previous_key + 1 and key % grid.width != 0:
+            consecutive_count += 1
+        else:
+            consecutive_count = 1
+        if consecutive_count > longest:
+            longest = consecutive_count
+            if n is not None and longest >= n:
+                break
+        previous_key = key
+    return longest
 
-quadrant_robots = {q: [] for q in quadrants}
 
-for robot in robots:
-    final_position = calculate_final_position(robot["p"], robot["v"], S, 100)
+def is_exit_condition_met(grid, n=8):
+    return longest_row_run(grid, n) >= n
 
-    # Determina il quadrante
-    for q_name, ((min_x, max_x), (min_y, max_y)) in quadrants.items():
-        if min_x <= final_position[0] < max_x and min_y <= final_position[1] < max_y:
-            quadrant_robots[q_name].append(robot)
-            break
 
-    if grid[final_position[0]][final_position[1]] == '.':
-        grid[final_position[0]][final_position[1]] = '1'
-    else:
-        grid[final_position[0]][final_position[1]] = str(int(grid[final_position[0]][final_position[1]])+1)
+def parse(data):
+    """
+    Estrae i robot dall'input.
 
-print(matrix_to_string(grid))
+    Args:
+        data (bytes, str or iterable): Il contenuto del file di input, o le sue righe.
 
-solution = 1
-for q_name, robots in quadrant_robots.items():
-    print(f"Quadrante {q_name}: {len(robots)} robot")
-    solution *= len(robots)
+    Returns:
+        list: Lista di tuple ((riga, colonna) posizione, (riga, colonna) velocità).
+    """
+    return parse_input(data)
 
-print(f"\nSOLUTION --------------------\n")
 
-print(f"solution: {solution}\n")
+def part1(robots, S=SPACE_SIZE):
+    """
+    Fattore di sicurezza dopo 100 secondi: prodotto del numero di robot in ogni quadrante.
 
-print("-----------------------------\nPART 2")
+    Args:
+        robots (list): Il risultato di parse().
+        S (tuple): Dimensioni dello spazio (righe, colonne).
+
+    Returns:
+        int: Il fattore di sicurezza.
+    """
+    grid = create_sparse_grid(S[0], S[1], '.')
+    quadrants = create_quadrants(S)
+
+    quadrant_robots = {q: [] for q in quadrants}
 
-def is_exit_condition_met(grid, n=8):
-    for row in grid:
-        consecutive_count = 0
-        for cell in row:
-            if cell == 'X':
-                consecutive_count += 1
-                if consecutive_count >= n:
-                    return True
-            else:
-                consecutive_count = 0
-    return False
-
-
-robots = parse_input(file_content)
-
-S = (103, 101)
-N = 1
-
-while True:
-    grid = create_matrix(S[0], S[1], '.')
-    print(f"> Trying {N}")
     for robot in robots:
-        final_position = calculate_final_position(robot["p"], robot["v"], S, N)
+        final_position = calculate_final_position(robot[0], robot[1], S, 100)
+
+        # Determina il quadrante
+        for q_name, ((min_x, max_x), (min_y, max_y)) in quadrants.items():
+            if min_x <= final_position[0] < max_x and min_y <= final_position[1] < max_y:
+                quadrant_robots[q_name].append(robot)
+                break
+
+        if grid[final_position] == '.':
+            grid[final_position] = '1'
+        else:
+            grid[final_position] = str(int(grid[final_position])+1)
+
+    debug(lambda: matrix_to_string(grid))
+
+    solution = 1
+    for q_name, quadrant in quadrant_robots.items():
+        info("Quadrante %s: %s robot", q_name, len(quadrant))
+        solution *= len(quadrant)
+
+    return solution
+
+
+def search_state(next_step, control):
+    """Stato da salvare nel checkpoint: prossimo secondo da provare e migliore risposta parziale."""
+    return {'next': next_step, 'best': control.best, 'best_score': control.best_score}
+
+
+def part2(robots, S=SPACE_SIZE, resume=None, control=None, n=8):
+    """
+    Primo secondo in cui i robot disegnano l'albero di Natale (una riga di n robot consecutivi).
+    L'ultimo secondo provato viene salvato periodicamente in un checkpoint, da cui la
+    ricerca può riprendere.
+
+    Args:
+        robots (list): Il risultato di parse().
+        S (tuple): Dimensioni dello spazio (righe, colonne).
+        resume (bool, optional): Se True riprende dal checkpoint salvato. Default: get_resume().
+        control (SearchControl, optional): Limiti e cancellazione della ricerca. Default: un
+                                           SearchControl con il tempo massimo di default.
+        n (int): Lunghezza della fila di robot che indica l'albero.
+
+    Returns:
+        int: Il numero di secondi. Se la ricerca viene fermata prima, il secondo con la fila di
+             robot più lunga trovata fino a quel momento (vedi control.stop_reason).
+    """
+    control = SearchControl() if control is None else control
+    checkpoint = Checkpoint('day14-part2', checkpoint_key(robots, S), resume)
+    state = checkpoint.load()
+    N = state['next'] if state else 1
+    if N > 1:
+        info("resuming from step %s", N)
+    if state and state.get('best') is not None:
+        # La migliore risposta parziale delle esecuzioni precedenti resta valida dopo la ripresa
+        control.offer(state['best'], state['best_score'])
+
+    while True:
+        if not control.step():
+            # Ricerca fermata: il checkpoint permette di riprendere da qui
+            checkpoint.save(search_state(N, control))
+            info("search stopped (%s) at step %s", control.stop_reason, N)
+            return control.best
+
+        if checkpoint.due():
+            checkpoint.save(search_state(N, control))
+
+        grid = create_sparse_grid(S[0], S[1], '.')
+        debug("> Trying %s", N)
+        for robot in robots:
+            final_position = calculate_final_position(robot[0], robot[1], S, N)
+
+            if grid[final_position] == '.':
+                grid[final_position] = 'X'
+
+        # Verifica la condizione di uscita
+        run = longest_row_run(grid, n)
+        if run >= n:
+            info("\n\nSolution found at step %s!", N)
+            debug(lambda: matrix_to_string(grid))
+            break
+        control.offer(N, run)
+
+        N += 1
+
+    checkpoint.clear()
+    return N
+
+
+if __name__ == '__main__':
+    print("-----------------------------\nPART 1")
+
+    file_path = f"./inputs/14/input.txt"
+    # Il file viene letto in streaming, una riga alla volta
+    robots = parse(iter_file_lines(file_path))
+
+    solution = part1(robots)
+
+    print(f"\nSOLUTION --------------------\n")
 
-        if grid[final_position[0]][final_position[1]] == '.':
-            grid[final_position[0]][final_position[1]] = 'X'
+    print(f"solution: {solution}\n")
 
-    # Verifica la condizione di uscita
-    if is_exit_condition_met(grid):
-        print(f"\n\nSolution found at step {N}!")
-        print(matrix_to_string(grid))
-        break
+    print("-----------------------------\nPART 2")
 
-    N += 1
+    solution = part2(robots)
 
-print(f"\nSOLUTION --------------------\n")
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"solution: \n")
+    print(f"solution: {solution}\n")
@@ -1,71 +1,133 @@
-
 from file_utils import *
+from log_utils import info
 from matrix_utils import *
+import profile_utils
 from string_utils import *
 
+# Carattere del bordo sentinella: non compare nella mappa, così il bordo non si confonde
+# con i muri '#' (che restano celle interne della griglia)
+BORDER = '~'
+
+
+def build_warehouse(grid_section, movements_section):
+    """
+    Costruisce la griglia del magazzino e la lista dei movimenti del robot.
+
+    Args:
+        grid_section (str, bytes or memoryview): La prima sezione dell'input (la mappa).
+        movements_section (str, bytes or memoryview): La seconda sezione (i movimenti).
+
+    Returns:
+        tuple: La griglia (Grid con bordo sentinella BORDER) e la lista dei movimenti.
+    """
+    grid = string_to_grid(grid_section, sentinel=BORDER)
+    if not isinstance(movements_section, str):
+        movements_section = bytes(movements_section).decode('utf-8')
+    movements = [char for char in movements_section if char not in '\r\n']
+    return grid, movements
+
+
+def parse(data):
+    """
+    Converte l'input nella griglia del magazzino e nella lista dei movimenti.
+
+    Args:
+        data (str or bytes): Il contenuto del file di input.
+
+    Returns:
+        tuple: La griglia e la lista dei movimenti (vedi build_warehouse).
+    """
+    separator = '\n\n' if isinstance(data, str) else b'\n\n'
+    grid_section, movements_section = data.split(separator, 1)
+    return build_warehouse(grid_section, movements_section)
 
-print("-----------------------------\nPART 1")
 
-file_path = f"./inputs/15/input.txt"
-file_content = read_file_to_string(file_path)
+def part1(parsed):
+    """
+    Simula i movimenti del robot e calcola la somma delle coordinate GPS delle casse.
 
-element_list = split_string_by_separator(file_content, '\n\n')
-grid = string_to_matrix(element_list[0])
-movements = [char for char in string_to_char_list(element_list[1]) if char != '\n']
+    Args:
+        parsed (tuple): Il risultato di parse(); la griglia non viene modificata.
 
-robot_position = find_char_in_grid(grid, '@')
+    Returns:
+        int: La somma delle coordinate GPS.
+    """
+    grid = parsed[0].copy()
+    movements = parsed[1]
 
-print(matrix_to_string(grid))
+    box_skip_index = build_box_skip_index(grid)
 
-for movement in movements:
-    direction = get_direction_from_char(movement)
+    # Senza indice dei caratteri: il robot si trova con una sola ricerca nel bytearray
+    robot_position = find_char_in_grid(grid, '@')
 
-    next_position = ()
-    if direction == "up":
-        next_position = (robot_position[0]-1, robot_position[1])
-    elif direction == "left":
-        next_position = (robot_position[0], robot_position[1]-1)
-    elif direction == "right":
-        next_position = (robot_position[0], robot_position[1]+1)
-    elif direction == "down":
-        next_position = (robot_position[0]+1, robot_position[1])
+    info(lambda: matrix_to_string(grid))
 
-    is_obstructed = is_obstacle_in_line_to_position(grid, robot_position, direction, next_position)
-    is_wall = grid[next_position[0]][next_position[1]] == '#'
-    is_inside_grid = is_position_inside(grid, next_position)
+    pushes = 0
+    for movement in movements:
+        direction = get_direction_code_from_char(movement)
 
-    if is_wall:
-        continue
+        next_position = (robot_position[0] + DIRECTION_DR[direction], robot_position[1] + DIRECTION_DC[direction])
 
-    if is_inside_grid and not is_obstructed:
-        move_element_in_matrix(grid, robot_position, next_position)
-        robot_position = next_position
-        #print(matrix_to_string(grid))
-        continue
+        is_obstructed = is_obstacle_in_line_to_position(grid, robot_position, direction, next_position)
+        is_wall = grid[next_position] == '#'
+        is_inside_grid = is_position_inside(grid, next_position)
 
-    if is_inside_grid and is_obstructed:
-        moved_elements = move_contiguous_elements(grid, next_position, direction)
-        if moved_elements > 0:
+        if is_wall:
+            continue
+
+        if is_inside_grid and not is_obstructed:
             move_element_in_matrix(grid, robot_position, next_position)
             robot_position = next_position
-        #print(matrix_to_string(grid))
-        continue
+            #print(matrix_to_string(grid))
+            continue
+
+        if is_inside_grid and is_obstructed:
+            moved_elements = push_boxes(grid, next_position, direction, box_skip_index)
+            pushes += 1
+            if moved_elements > 0:
+                move_element_in_matrix(grid, robot_position, next_position)
+                robot_position = next_position
+            #print(matrix_to_string(grid))
+            continue
+
+    profile_utils.count('steps', len(movements))
+    profile_utils.count('pushes', pushes)
+    info(lambda: matrix_to_string(grid))
+
+    # GPS delle casse calcolato sullo strato di bit: il bordo sposta ogni coordinata di grid.pad
+    boxes = Bitboard.from_grid(grid, 'O')
+    return boxes.weighted_sum(100, 1) - boxes.popcount() * 101 * grid.pad
+
+
+def part2(parsed):
+    """
+    Parte 2 non ancora risolta.
+
+    Returns:
+        None
+    """
+    return None
+
+
+if __name__ == '__main__':
+    print("-----------------------------\nPART 1")
 
-print(f"\nSOLUTION --------------------\n")
+    file_path = f"./inputs/15/input.txt"
+    mapped_file = read_file_to_mmap(file_path)
 
-print(matrix_to_string(grid))
-stores_positions = find_all_chars_in_grid(grid, 'O')
+    # La griglia viene costruita direttamente dai byte mappati delle due sezioni
+    parsed = build_warehouse(mapped_file.section(0), mapped_file.section(1))
+    mapped_file.close()
 
-solution = 0
+    solution = part1(parsed)
 
-for position in stores_positions:
-    solution += position[0]*100 + position[1]
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"solution: {solution}\n")
+    print(f"solution: {solution}\n")
 
-print("-----------------------------\nPART 2")
+    print("-----------------------------\nPART 2")
 
 
-print(f"\nSOLUTION --------------------\n")
+    print(f"\nSOLUTION --------------------\n")
 
-print(f"solution: \n")
\ No newline at end of file
+    print(f"solution: \n")
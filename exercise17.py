@@ -1,8 +1,15 @@
 
+from checkpoint_utils import Checkpoint, checkpoint_key
 from file_utils import *
+from log_utils import debug, info
 from matrix_utils import *
+import profile_utils
+from search_utils import SearchControl
 from string_utils import *
 
+import multiprocessing
+import os
+from collections import deque
 from concurrent.futures import ProcessPoolExecutor
 
 
@@ -65,7 +72,21 @@ class ThreeBitComputer:
         else:
             raise ValueError("Invalid combo operand")
 
-    def execute_instruction(self, program):
+    def execute_instruction(self, program, counting=False):
+        """
+        Esegue il programma fino alla fine.
+
+        Args:
+            program (list): Il programma (lista di opcode e operandi).
+            counting (bool): Se True conta le istruzioni eseguite. Il conteggio si aggiorna
+                             solo sui salti (le istruzioni tra due salti sono consecutive),
+                             non a ogni istruzione.
+
+        Returns:
+            int: Il numero di istruzioni eseguite (0 se counting è False).
+        """
+        executed = 0
+        segment_start = self.instruction_pointer
         while self.instruction_pointer < len(program):
             opcode = program[self.instruction_pointer]
             operand = program[self.instruction_pointer + 1]
@@ -78,6 +99,10 @@ class ThreeBitComputer:
                 self.registers['B'] = self.combo_value(operand) % 8
             elif opcode == 3:  # jnz
                 if self.registers['A'] != 0:
+                    if counting:
+                        # Istruzioni dall'ultimo salto a questo jnz compreso
+                        executed += (self.instruction_pointer - segment_start) // 2 + 1
+                        segment_start = operand
                     self.instruction_pointer = operand
                     continue
             elif opcode == 4:  # bxc
@@ -93,8 +118,13 @@ class ThreeBitComputer:
 
             self.instruction_pointer += 2
 
+        if counting:
+            executed += (self.instruction_pointer - segment_start) // 2
+        return executed
+
     def run(self, program):
-        self.execute_instruction(program)
+        executed = self.execute_instruction(program, profile_utils.is_enabled())
+        profile_utils.count('vm_instructions', executed)
         return self.output
 
 
@@ -122,42 +152,213 @@ class ThreeBitComputer:
 # print("-----------------------------\nPART 2")
 
 
-def process_value(args):
-    idx, program = args
+# Valori del registro A provati da ogni processo del pool per ciascun invio
+CHUNK_SIZE = 1000
+# Ogni quanti valori un processo del pool controlla se la ricerca è stata fermata
+STOP_CHECK_INTERVAL = 100
+
+# Evento condiviso con i processi del pool (vedi _init_worker): quando è impostato i blocchi
+# in esecuzione si interrompono senza provare i valori rimanenti
+_stop_event = None
+
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def process_chunk(args):
+    """
+    Prova i valori del registro A in [start, stop) in un processo del pool.
+
+    Args:
+        args (tuple): (start, stop, program, counting).
+
+    Returns:
+        tuple: (valore trovato o None, istruzioni eseguite). Il numero di istruzioni torna al
+               processo principale insieme al risultato, perché i contatori del processo figlio
+               andrebbero persi.
+    """
+    start, stop, program, counting = args
     computer = ThreeBitComputer()
-    computer.registers = {'A': idx, 'B': 0, 'C': 0}
-    output = computer.run(program)
-    return idx if output == program else None
+    executed = 0
+    for idx in range(start, stop):
+        if (idx - start) % STOP_CHECK_INTERVAL == 0 and _stop_event is not None and _stop_event.is_set():
+            break
+        computer.reset()
+        computer.registers['A'] = idx
+        executed += computer.execute_instruction(program, counting)
+        if computer.output == program:
+            return idx, executed
+    return None, executed
 
 
-def find_initial_value(program, max_idx=100000):
-    with ProcessPoolExecutor() as executor:
-        # Passa argomenti come tuple per evitare problemi di serializzazione
-        results = executor.map(process_value, ((i, program) for i in range(max_idx-100000, max_idx)))
-        for result in results:
-            if result is not None:
-                return result
-    return None
+def find_initial_value(program, max_idx=100000, min_idx=None, control=None):
+    """
+    Cerca in [min_idx, max_idx) il più piccolo valore del registro A per cui il programma
+    stampa se stesso, distribuendo i valori ai processi del pool a blocchi di CHUNK_SIZE.
 
+    Args:
+        program (list): Il programma (lista di opcode).
+        max_idx (int): Fine (esclusa) dell'intervallo.
+        min_idx (int, optional): Inizio dell'intervallo. Default: max_idx - 100000.
+        control (SearchControl, optional): Limiti e cancellazione della ricerca.
 
-if __name__ == "__main__":
-    file_path = f"./inputs/17/input.txt"
-    file_content = read_file_to_string(file_path)
+    Returns:
+        int or None: Il valore trovato, None se non c'è o se la ricerca viene fermata prima.
+    """
+    if min_idx is None:
+        min_idx = max_idx - 100000
+    counting = profile_utils.is_enabled()
+    executed_total = 0
+    result = None
+    starts = iter(range(min_idx, max_idx, CHUNK_SIZE))
+    stop_event = multiprocessing.Event()
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(stop_event,)) as executor:
+        # Solo una finestra di blocchi è in coda nel pool: il controllo della ricerca avviene a
+        # ogni nuovo invio e, quando la ricerca finisce, restano da annullare pochi blocchi.
+        # I risultati si leggono nell'ordine di invio, così il primo trovato è il più piccolo
+        max_pending = 2 * (os.cpu_count() or 1)
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < max_pending:
+                    start = next(starts, None)
+                    if start is None:
+                        break
+                    stop = min(start + CHUNK_SIZE, max_idx)
+                    if control is not None and not control.step(stop - start):
+                        break
+                    pending.append(executor.submit(process_chunk, (start, stop, program, counting)))
+                if not pending or (control is not None and control.stopped):
+                    break
+                found, executed = pending.popleft().result()
+                executed_total += executed
+                if found is not None:
+                    result = found
+                    break
+        finally:
+            # Ricerca conclusa o fermata: i blocchi in coda vengono annullati e quelli in
+            # esecuzione si interrompono al prossimo controllo dell'evento
+            stop_event.set()
+            for future in pending:
+                future.cancel()
+            profile_utils.count('vm_instructions', executed_total)
+    return result
 
-    _, program = parse_input(file_content)
+
+def find_lowest_initial_value(program, batches=100, batch_size=100000, resume=None, control=None):
+    """
+    Cerca, a blocchi di batch_size valori, il più piccolo valore iniziale del registro A
+    per cui il programma stampa se stesso. Al termine di ogni blocco il numero di blocchi
+    completati viene salvato in un checkpoint, da cui la ricerca può riprendere.
+
+    Args:
+        program (list): Il programma (lista di opcode).
+        batches (int): Numero massimo di blocchi da provare.
+        batch_size (int): Numero di valori per blocco.
+        resume (bool, optional): Se True riprende dal checkpoint salvato. Default: get_resume().
+        control (SearchControl, optional): Limiti e cancellazione della ricerca. Default: un
+                                           SearchControl con il tempo massimo di default.
+
+    Returns:
+        int or None: Il valore trovato, None se non trovato nei blocchi provati o se la ricerca
+                     viene fermata prima (vedi control.stop_reason).
+    """
+    control = SearchControl() if control is None else control
+    # Ogni blocco dura a lungo: il checkpoint si aggiorna alla fine di ognuno
+    checkpoint = Checkpoint('day17-part2', checkpoint_key(program, batch_size), resume, interval=0)
+    state = checkpoint.load()
+    first_batch = state['next_batch'] if state else 0
+    if first_batch:
+        info("resuming from batch %s", first_batch)
 
     result = None
-    for i in range(0, 100):
-        min_val = i * 100000
-        max_val = min_val + 100000
-        print(f"trying range {min_val} => {max_val}")
-        result = find_initial_value(program, max_idx=max_val)
+    for i in range(first_batch, batches):
+        min_val = i * batch_size
+        max_val = min_val + batch_size
+        info("trying range %s => %s", min_val, max_val)
+        result = find_initial_value(program, max_idx=max_val, min_idx=min_val, control=control)
+
+        if control.stopped:
+            # Il blocco corrente non è completo: il checkpoint resta al blocco precedente
+            info("search stopped (%s) in range %s => %s", control.stop_reason, min_val, max_val)
+            break
 
         if result:
+            # Ricerca conclusa: il checkpoint non serve più
+            checkpoint.clear()
             break
+        checkpoint.save({'next_batch': i + 1})
+
+    return result
+
+
+def parse(data):
+    """
+    Converte l'input nei registri e nel programma.
+
+    Args:
+        data (str): Il contenuto del file di input.
+
+    Returns:
+        tuple: (registers, program), vedi parse_input.
+    """
+    return parse_input(data)
+
+
+def part1(parsed):
+    """
+    Esegue il programma con i registri iniziali e restituisce l'output.
+
+    Args:
+        parsed (tuple): Il risultato di parse().
+
+    Returns:
+        str: I valori stampati dal programma separati da virgole.
+    """
+    registers, program = parsed
+
+    debug("%s", registers)
+    debug("%s", program)
+
+    computer = ThreeBitComputer(dict(registers))
+    output = computer.run(program)
+    debug("Output: %s", output)
+
+    return ','.join([str(item) for item in output])
+
+
+def part2(parsed):
+    """
+    Il più piccolo valore iniziale del registro A per cui il programma stampa se stesso.
+
+    Args:
+        parsed (tuple): Il risultato di parse().
+
+    Returns:
+        int or None: Il valore trovato.
+    """
+    _, program = parsed
+    return find_lowest_initial_value(program)
+
+
+if __name__ == "__main__":
+    file_path = f"./inputs/17/input.txt"
+    parsed = parse(read_file_to_string(file_path))
+
+    print("-----------------------------\nPART 1")
+
+    print(f"\nSOLUTION --------------------\n")
+
+    print(f"solution: {part1(parsed)}\n")
+
+    print("-----------------------------\nPART 2")
+
+    result = part2(parsed)
 
     print(f"Valore trovato: {result}")
 
 # print(f"\nSOLUTION --------------------\n")
 #
-# print(f"solution: {result}\n")
\ No newline at end of file
+# print(f"solution: {result}\n")
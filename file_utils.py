@@ -1,3 +1,83 @@
+import bz2
+import gzip
+import hashlib
+import inspect
+import lzma
+import mmap
+import os
+import pickle
+import re
+import sys
+from array import array
+from collections import OrderedDict
+
+import profile_utils
+from string_utils import iter_blocks, iter_ints, iter_lines
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Dimensione dei blocchi letti dai lettori in streaming (1 MiB)
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Cache degli input già analizzati: su disco (pickle) e in memoria (LRU)
+PARSE_CACHE_DIR = os.path.join(REPO_DIR, '.cache', 'parsed')
+PARSE_CACHE_SIZE = 32
+_parse_cache = OrderedDict()
+
+# Hash del contenuto dei file già letti, validi finché non cambiano dimensione e mtime:
+# percorso -> (mtime_ns, dimensione, hash)
+_content_hash_cache = {}
+
+# Chiavi dei parser già calcolate nel processo: (modulo, nome qualificato) -> chiave
+_parser_keys = {}
+
+# Formati compressi riconosciuti dai byte iniziali del file (magic bytes)
+_COMPRESSION_FORMATS = (
+    (b'\x1f\x8b', 'gzip', gzip.open),
+    (b'BZh', 'bz2', bz2.open),
+    (b'\xfd7zXZ\x00', 'xz', lzma.open),
+)
+
+
+def detect_compression(file_path):
+    """
+    Riconosce la compressione di un file dai suoi byte iniziali.
+
+    Args:
+        file_path (str): Il percorso del file.
+
+    Returns:
+        str or None: 'gzip', 'bz2', 'xz' oppure None se il file non è compresso.
+    """
+    with open(file_path, 'rb') as file:
+        magic = file.read(6)
+    for prefix, name, _ in _COMPRESSION_FORMATS:
+        if magic.startswith(prefix):
+            return name
+    return None
+
+
+def open_input(file_path, binary=False):
+    """
+    Apre un file di input, decomprimendolo in modo incrementale se è compresso con gzip, bz2 o xz.
+    Il file compresso non viene mai decompresso su disco né caricato tutto in memoria.
+
+    Args:
+        file_path (str): Il percorso del file.
+        binary (bool): Se True apre il file in modalità binaria, altrimenti come testo UTF-8.
+
+    Returns:
+        file object: Il file aperto (da chiudere a cura del chiamante).
+    """
+    compression = detect_compression(file_path)
+    opener = open
+    for _, name, format_opener in _COMPRESSION_FORMATS:
+        if name == compression:
+            opener = format_opener
+    if binary:
+        return opener(file_path, 'rb')
+    return opener(file_path, 'rt', encoding='utf-8')
+
 
 def read_file_to_string(file_path):
     """
@@ -10,12 +90,444 @@ def read_file_to_string(file_path):
         str: Il contenuto del file come stringa.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
+        with open_input(file_path) as file:
             content = file.read()
         return content
     except FileNotFoundError:
         print(f"Errore: Il file '{file_path}' non esiste.")
         return ""
-    except IOError as e:
+    except (IOError, EOFError, lzma.LZMAError) as e:
         print(f"Errore durante la lettura del file: {e}")
-        return ""
\ No newline at end of file
+        return ""
+
+
+def read_file_to_bytes(file_path):
+    """
+    Legge un intero file e restituisce il contenuto come bytes, senza decodificarlo.
+    I file compressi (gzip, bz2, xz) vengono decompressi.
+
+    Args:
+        file_path (str): Il percorso del file da leggere.
+
+    Returns:
+        bytes: Il contenuto del file.
+    """
+    try:
+        with open_input(file_path, binary=True) as file:
+            content = file.read()
+        return content
+    except FileNotFoundError:
+        print(f"Errore: Il file '{file_path}' non esiste.")
+        return b""
+    except (IOError, EOFError, lzma.LZMAError) as e:
+        print(f"Errore durante la lettura del file: {e}")
+        return b""
+
+
+def iter_file_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Legge un file a blocchi di dimensione fissa, senza caricarlo tutto in memoria.
+    I file compressi (gzip, bz2, xz) vengono decompressi un blocco alla volta.
+
+    Args:
+        file_path (str): Il percorso del file da leggere.
+        chunk_size (int): Numero di caratteri letti per blocco.
+
+    Yields:
+        str: Un blocco di testo alla volta.
+    """
+    try:
+        with open_input(file_path) as file:
+            chunk = file.read(chunk_size)
+            while chunk:
+                yield chunk
+                chunk = file.read(chunk_size)
+    except FileNotFoundError:
+        print(f"Errore: Il file '{file_path}' non esiste.")
+    except (IOError, EOFError, lzma.LZMAError) as e:
+        print(f"Errore durante la lettura del file: {e}")
+
+
+def iter_file_lines(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Genera le righe di un file leggendolo a blocchi (memoria limitata).
+
+    Args:
+        file_path (str): Il percorso del file da leggere.
+        chunk_size (int): Numero di caratteri letti per blocco.
+
+    Yields:
+        str: Una riga alla volta, senza il carattere di a capo.
+    """
+    return iter_lines(iter_file_chunks(file_path, chunk_size))
+
+
+def iter_file_blocks(file_path, separator='\n\n', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Genera i blocchi di un file separati da una riga vuota, leggendolo a blocchi (memoria limitata).
+
+    Args:
+        file_path (str): Il percorso del file da leggere.
+        separator (str): Il separatore dei blocchi. Default '\n\n'.
+        chunk_size (int): Numero di caratteri letti per blocco.
+
+    Yields:
+        str: Un blocco alla volta.
+    """
+    return iter_blocks(iter_file_chunks(file_path, chunk_size), separator)
+
+
+def iter_file_ints(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Genera gli interi separati da spazi bianchi contenuti in un file, leggendolo a blocchi.
+
+    Args:
+        file_path (str): Il percorso del file da leggere.
+        chunk_size (int): Numero di caratteri letti per blocco.
+
+    Yields:
+        int: Un intero alla volta.
+    """
+    return iter_ints(iter_file_chunks(file_path, chunk_size))
+
+
+class MappedFile:
+    """
+    File di input mappato in memoria (mmap) in sola lettura.
+    I byte sono esposti come memoryview: righe e sezioni vengono restituite come
+    slice della memoryview, senza copie. L'indice degli offset di inizio riga
+    viene costruito solo al primo accesso per numero di riga.
+
+    Attributes:
+        file_path (str): Il percorso del file mappato.
+        view (memoryview): I byte del file.
+    """
+
+    def __init__(self, file_path):
+        if detect_compression(file_path) is not None:
+            # Un file compresso non può essere mappato: va letto in streaming
+            raise ValueError(f"Il file '{file_path}' è compresso: usa open_input o iter_file_chunks.")
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap non accetta file vuoti: in quel caso si usa un buffer vuoto
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.view = memoryview(self._mmap if self._mmap is not None else b'')
+        self._line_offsets = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.view)
+
+    def close(self):
+        """
+        Rilascia la memoryview e chiude la mappatura. Le slice ottenute da line() o
+        section() devono essere già state rilasciate.
+
+        Raises:
+            BufferError: Se qualche slice è ancora in uso: la mappatura resta aperta
+                         finché le slice non vengono rilasciate.
+        """
+        self.view.release()
+        self._file.close()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError as e:
+                raise BufferError(f"La mappatura di '{self.file_path}' è ancora in uso: "
+                                  f"rilascia prima le slice ottenute da line() e section().") from e
+
+    def _build_line_offsets(self):
+        """Costruisce l'indice degli offset di inizio riga (array di interi a 64 bit)."""
+        offsets = array('q', [0])
+        data = self._mmap if self._mmap is not None else b''
+        size = len(data)
+        pos = data.find(b'\n')
+        while pos != -1:
+            if pos + 1 < size:
+                offsets.append(pos + 1)
+            pos = data.find(b'\n', pos + 1)
+        if size == 0:
+            offsets = array('q')
+        self._line_offsets = offsets
+        return offsets
+
+    @property
+    def line_count(self):
+        """Numero di righe del file."""
+        offsets = self._line_offsets if self._line_offsets is not None else self._build_line_offsets()
+        return len(offsets)
+
+    def line(self, index):
+        """
+        Restituisce la riga indicata (senza il terminatore di riga) come slice della memoryview.
+
+        Args:
+            index (int): Il numero della riga (da 0).
+
+        Returns:
+            memoryview: I byte della riga.
+        """
+        offsets = self._line_offsets if self._line_offsets is not None else self._build_line_offsets()
+        start = offsets[index]
+        end = offsets[index + 1] - 1 if index + 1 < len(offsets) else len(self.view)
+        if end > start and self.view[end - 1] == 0x0A:
+            end -= 1
+        if end > start and self.view[end - 1] == 0x0D:
+            end -= 1
+        return self.view[start:end]
+
+    def lines(self):
+        """
+        Itera sulle righe del file come slice della memoryview.
+
+        Yields:
+            memoryview: I byte di ciascuna riga.
+        """
+        for index in range(self.line_count):
+            yield self.line(index)
+
+    def sections(self, separator=b'\n\n'):
+        """
+        Itera sulle sezioni del file separate da separator (di default una riga vuota).
+        Ogni '\n' del separatore riconosce anche '\r\n', così i file con a capo Windows
+        vengono divisi allo stesso modo.
+
+        Args:
+            separator (bytes): Il separatore delle sezioni.
+
+        Yields:
+            memoryview: I byte di ciascuna sezione.
+        """
+        data = self._mmap if self._mmap is not None else b''
+        pattern = re.compile(b'\r?\n'.join(re.escape(part) for part in separator.split(b'\n')))
+        start = 0
+        for match in pattern.finditer(data):
+            yield self.view[start:match.start()]
+            start = match.end()
+        yield self.view[start:]
+
+    def section(self, index, separator=b'\n\n'):
+        """
+        Restituisce la sezione indicata come slice della memoryview.
+
+        Args:
+            index (int): Il numero della sezione (da 0).
+            separator (bytes): Il separatore delle sezioni.
+
+        Returns:
+            memoryview: I byte della sezione.
+        """
+        for current, section in enumerate(self.sections(separator)):
+            if current == index:
+                return section
+        raise IndexError(f"Sezione {index} non presente in '{self.file_path}'.")
+
+
+def read_file_to_mmap(file_path):
+    """
+    Apre un file mappandolo in memoria, senza leggerne e decodificarne il contenuto.
+
+    Args:
+        file_path (str): Il percorso del file da leggere.
+
+    Returns:
+        MappedFile: Il file mappato.
+
+    Raises:
+        FileNotFoundError: Se il file non esiste.
+        OSError: Se il file non può essere letto o mappato.
+        ValueError: Se il file è compresso (va letto in streaming, vedi open_input).
+    """
+    return MappedFile(file_path)
+
+
+def file_content_hash(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calcola l'hash SHA-256 del contenuto di un file, leggendolo a blocchi.
+
+    Args:
+        file_path (str): Il percorso del file.
+        chunk_size (int): Numero di byte letti per blocco.
+
+    Returns:
+        str: L'hash in esadecimale.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        chunk = file.read(chunk_size)
+        while chunk:
+            digest.update(chunk)
+            chunk = file.read(chunk_size)
+    return digest.hexdigest()
+
+
+def _module_file(module):
+    """Restituisce il file sorgente del modulo se appartiene al repository, altrimenti None."""
+    path = getattr(module, '__file__', None)
+    if not path or not path.endswith('.py'):
+        return None
+    path = os.path.abspath(path)
+    return path if os.path.dirname(path) == REPO_DIR else None
+
+
+def _repo_dependencies(module):
+    """
+    Restituisce i file dei moduli del repository usati da module, anche indirettamente:
+    i moduli importati con import e quelli da cui provengono i nomi importati con from ... import.
+    """
+    files = set()
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        path = _module_file(current)
+        if path is None or path in files:
+            continue
+        files.add(path)
+        for value in vars(current).values():
+            if inspect.ismodule(value):
+                pending.append(value)
+            else:
+                source_module = sys.modules.get(getattr(value, '__module__', None) or '')
+                if source_module is not None:
+                    pending.append(source_module)
+    return files
+
+
+def solver_hash(module):
+    """
+    Calcola l'hash del codice di una soluzione: il sorgente del modulo più quello dei moduli
+    del repository da cui dipende, anche indirettamente.
+
+    Args:
+        module (module): Il modulo exerciseNN.
+
+    Returns:
+        str: L'hash SHA-256 in esadecimale.
+    """
+    files = _repo_dependencies(module)
+
+    digest = hashlib.sha256()
+    for path in sorted(files):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def _parser_key(parser):
+    """
+    Restituisce una chiave che identifica il parser e la sua versione: il nome qualificato
+    più l'hash del sorgente del suo modulo e dei moduli del repository da cui dipende
+    (vedi solver_hash), così la cache si invalida quando cambia il parser o
+    una delle funzioni che usa (es. pad_matrix). Calcolata una volta per processo.
+    """
+    name = (parser.__module__, parser.__qualname__)
+    key = _parser_keys.get(name)
+    if key is None:
+        module = sys.modules.get(parser.__module__)
+        version = solver_hash(module)[:16] if module is not None else 'builtin'
+        key = _parser_keys[name] = f"{name[0]}.{name[1]}-{version}"
+    return key
+
+
+def _cached_content_hash(file_path):
+    """
+    Restituisce l'hash del contenuto di un file, ricalcolandolo solo se dimensione o mtime
+    sono cambiati dall'ultima lettura nel processo.
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    cached = _content_hash_cache.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    content_hash = file_content_hash(path)
+    _content_hash_cache[path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+    return content_hash
+
+
+def cached_parse(file_path, parser, binary=False, key=None, use_disk=True, copy=True):
+    """
+    Legge e analizza un file passando dalla cache degli input analizzati.
+    La chiave è l'hash del contenuto del file più l'identità del parser: se il file
+    non è cambiato il risultato viene preso dalla LRU in memoria oppure dal file
+    pickle su disco, senza rileggere né rianalizzare l'input. Nello stesso processo
+    l'hash viene ricalcolato solo se cambiano dimensione o mtime del file.
+
+    Args:
+        file_path (str): Il percorso del file da leggere.
+        parser (callable): Funzione che riceve il contenuto del file e restituisce la struttura analizzata.
+        binary (bool): Se True il parser riceve i bytes del file, altrimenti la stringa decodificata.
+        key (str, optional): Chiave esplicita del parser, al posto di quella calcolata dal suo bytecode.
+        use_disk (bool): Se True il risultato viene salvato e cercato anche su disco.
+        copy (bool): Se True restituisce sempre una copia indipendente (il chiamante può modificarla),
+                     altrimenti l'oggetto condiviso tenuto in cache.
+
+    Returns:
+        object: La struttura restituita dal parser.
+    """
+    content_hash = _cached_content_hash(file_path)
+    cache_key = (content_hash, key or _parser_key(parser))
+
+    entry = _parse_cache.get(cache_key)
+    profile_utils.count('parse_cache_misses' if entry is None else 'parse_cache_hits')
+    if entry is None:
+        cache_path = os.path.join(PARSE_CACHE_DIR, f"{cache_key[0]}-{cache_key[1]}.pickle")
+        blob = None
+        if use_disk and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as file:
+                    blob = file.read()
+                parsed = pickle.loads(blob)
+            except Exception:
+                # Un file di cache illeggibile o non compatibile (pickle può sollevare quasi
+                # qualsiasi eccezione) equivale a nessuna cache: l'input viene rianalizzato
+                blob = None
+
+        if blob is None:
+            content = read_file_to_bytes(file_path) if binary else read_file_to_string(file_path)
+            parsed = parser(content)
+            blob = pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL)
+            if use_disk:
+                _write_file_atomically(cache_path, blob)
+
+        entry = (blob, parsed)
+        _parse_cache[cache_key] = entry
+        if len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    else:
+        _parse_cache.move_to_end(cache_key)
+
+    blob, parsed = entry
+    return pickle.loads(blob) if copy else parsed
+
+
+def clear_parse_cache(disk=False):
+    """
+    Svuota la cache degli input analizzati in memoria e, se richiesto, anche su disco.
+
+    Args:
+        disk (bool): Se True elimina anche i file della cache su disco.
+    """
+    _parse_cache.clear()
+    _content_hash_cache.clear()
+    if disk and os.path.isdir(PARSE_CACHE_DIR):
+        for name in os.listdir(PARSE_CACHE_DIR):
+            os.remove(os.path.join(PARSE_CACHE_DIR, name))
+
+
+def _write_file_atomically(file_path, content):
+    """Scrive content (bytes) in file_path passando da un file temporaneo e os.replace."""
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(content)
+        os.replace(temp_path, file_path)
+    except IOError as e:
+        print(f"Errore durante la scrittura del file: {e}")
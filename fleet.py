@@ -0,0 +1,187 @@
+"""
+Modalità "fleet": risolve molti input dello stesso giorno in un solo processo, invece di
+lanciare un interprete per ogni coppia (giorno, input). Il modulo della soluzione viene
+importato una volta sola, quindi le tabelle a livello di modulo (direzioni, combinazioni
+di operatori, cache) vengono calcolate una volta e condivise da tutti gli input.
+
+Gli input si indicano con una directory (tutti i file, in ordine) oppure con un manifest:
+un file .txt con un percorso per riga, o un file .jsonl con un oggetto {"input": percorso}
+per riga. I percorsi relativi del manifest sono relativi alla sua directory. Un file .txt le
+cui righe non sono tutte percorsi di file esistenti (come inputs/08/input.txt) e qualsiasi
+altro file vengono trattati come un singolo input.
+
+Per ogni input viene scritta una riga JSONL {"input", "part1", "part2", "timings"} (o "error");
+se la ricerca di una parte è stata fermata prima della fine il record ha anche "partial".
+
+Esempi:
+    python -m fleet 7 inputs_utenti/07/ --output risultati.jsonl
+    python -m fleet 6 manifest.txt --workers 4
+    python -m fleet 8 inputs/08/input.txt
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import log_utils
+from runner import load_solver, run_day
+
+
+def read_manifest(manifest_path):
+    """
+    Legge i percorsi degli input da un manifest (testo o .jsonl).
+
+    Args:
+        manifest_path (str): Il percorso del manifest.
+
+    Returns:
+        list: I percorsi degli input.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    paths = []
+    with open(manifest_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if manifest_path.endswith('.jsonl'):
+                line = json.loads(line)['input']
+            paths.append(os.path.join(base_dir, line))
+    return paths
+
+
+def list_inputs(source):
+    """
+    Restituisce i file di input indicati da una directory, da un manifest o da un singolo file.
+
+    Args:
+        source (str): Una directory (vengono presi tutti i file, anche nelle sottodirectory),
+                      un manifest (.txt o .jsonl) o un qualsiasi altro file, che è l'unico input.
+                      Un .txt è un manifest solo se tutte le sue righe sono file esistenti.
+
+    Returns:
+        list: I percorsi degli input.
+
+    Raises:
+        FileNotFoundError: Se source non esiste.
+    """
+    if os.path.isdir(source):
+        paths = []
+        for root, dirs, files in os.walk(source):
+            dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+            paths.extend(os.path.join(root, name) for name in sorted(files) if not name.startswith('.'))
+        return paths
+    if os.path.isfile(source):
+        if source.endswith('.jsonl'):
+            return read_manifest(source)
+        if source.endswith('.txt'):
+            # Anche gli input dei giorni sono .txt: è un manifest solo se elenca file esistenti
+            paths = read_manifest(source)
+            if paths and all(os.path.isfile(path) for path in paths):
+                return paths
+        return [source]
+    raise FileNotFoundError(f"Il file '{source}' non esiste.")
+
+
+def solve_input(day, path, parts=(1, 2)):
+    """
+    Risolve un singolo input e ne restituisce il record. Gli errori diventano un campo del
+    record, così un input malformato non interrompe il resto del lotto.
+
+    Args:
+        day (int): Il giorno.
+        path (str): Il percorso dell'input.
+        parts (tuple): Le parti da risolvere.
+
+    Returns:
+        dict: {'input', 'part1', 'part2', 'timings'} oppure {'input', 'error'}.
+    """
+    try:
+        result = run_day(day, os.path.abspath(path), parts)
+    except Exception as e:
+        return {'input': path, 'error': f"{type(e).__name__}: {e}"}
+
+    record = {'input': path}
+    for part, answer in result['answers'].items():
+        record[f"part{part}"] = answer
+    record['timings'] = result['timings']
+    if result['partial']:
+        record['partial'] = {f"part{part}": reason for part, reason in result['partial'].items()}
+    return record
+
+
+def _init_worker(day, verbosity):
+    """Inizializza un processo del pool: verbosità e import della soluzione una volta sola."""
+    log_utils.set_verbosity(verbosity)
+    load_solver(day)
+
+
+def _solve_job(job):
+    return solve_input(*job)
+
+
+def solve_inputs(day, paths, parts=(1, 2), workers=0, chunksize=8):
+    """
+    Risolve tutti gli input, nello stesso processo o su un pool di processi.
+
+    Args:
+        day (int): Il giorno.
+        paths (list): I percorsi degli input.
+        parts (tuple): Le parti da risolvere.
+        workers (int): Numero di processi del pool; 0 per risolvere tutto nel processo corrente.
+        chunksize (int): Input assegnati per volta a ogni processo del pool.
+
+    Yields:
+        dict: I record di solve_input, nell'ordine degli input.
+    """
+    if workers <= 0:
+        load_solver(day)
+        for path in paths:
+            yield solve_input(day, path, parts)
+        return
+
+    jobs = [(day, path, parts) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(day, log_utils.get_verbosity())) as executor:
+        yield from executor.map(_solve_job, jobs, chunksize=chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m fleet',
+                                     description="Risolve molti input dello stesso giorno in un solo processo.")
+    parser.add_argument('day', type=int, help="il giorno da risolvere")
+    parser.add_argument('source', help="directory degli input, manifest (.txt con un percorso per riga, o .jsonl) "
+                             "o un singolo file di input")
+    parser.add_argument('--output', default='-', help="file JSONL dei risultati (default: stdout)")
+    parser.add_argument('--part', type=int, choices=(1, 2), help="risolve solo la parte indicata")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="processi del pool (default 0: tutto nel processo corrente)")
+    parser.add_argument('--chunksize', type=int, default=8, help="input assegnati per volta a ogni processo")
+    args = parser.parse_args(argv)
+
+    # Le soluzioni non devono stampare nulla: lo stdout può essere il file dei risultati
+    log_utils.set_verbosity(log_utils.QUIET)
+
+    try:
+        paths = list_inputs(args.source)
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        parser.error(str(e))
+    parts = (args.part,) if args.part else (1, 2)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    failures = 0
+    try:
+        for record in solve_inputs(args.day, paths, parts, args.workers, args.chunksize):
+            failures += 'error' in record
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import os
+import sys
+
+# Livelli di verbosità: un messaggio viene stampato solo se il suo livello è <= verbosità corrente
+QUIET = 0
+INFO = 1
+DEBUG = 2
+TRACE = 3
+
+LEVEL_NAMES = {'quiet': QUIET, 'info': INFO, 'debug': DEBUG, 'trace': TRACE}
+
+# Variabile d'ambiente da cui leggere la verbosità iniziale (numero o nome del livello)
+VERBOSITY_ENV = 'AOC_VERBOSITY'
+
+
+def parse_level(level):
+    """
+    Converte un livello espresso come numero o come nome ('quiet', 'info', 'debug', 'trace').
+
+    Args:
+        level (int or str): Il livello da convertire.
+
+    Returns:
+        int: Il livello numerico.
+
+    Raises:
+        ValueError: Se il livello non è valido.
+    """
+    if isinstance(level, int):
+        return level
+    text = str(level).strip().lower()
+    if text in LEVEL_NAMES:
+        return LEVEL_NAMES[text]
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Livello di verbosità non valido: {level}") from None
+
+
+def _initial_verbosity():
+    """Legge la verbosità iniziale dalla variabile d'ambiente (default INFO)."""
+    value = os.environ.get(VERBOSITY_ENV)
+    if not value:
+        return INFO
+    try:
+        return parse_level(value)
+    except ValueError:
+        return INFO
+
+
+_verbosity = _initial_verbosity()
+
+
+def set_verbosity(level):
+    """
+    Imposta la verbosità globale.
+
+    Args:
+        level (int or str): Il nuovo livello, come numero o nome.
+    """
+    global _verbosity
+    _verbosity = parse_level(level)
+
+
+def get_verbosity():
+    """Restituisce la verbosità globale corrente."""
+    return _verbosity
+
+
+def is_enabled(level):
+    """
+    Controllo rapido da usare nei cicli caldi prima di costruire messaggi costosi.
+
+    Args:
+        level (int): Il livello del messaggio.
+
+    Returns:
+        bool: True se i messaggi di quel livello vengono stampati.
+    """
+    return _verbosity >= level
+
+
+def log(level, message, *args):
+    """
+    Stampa un messaggio se il suo livello è abilitato. La formattazione è pigra: gli argomenti
+    vengono inseriti con l'operatore % solo se il messaggio viene effettivamente stampato;
+    se message è una funzione, viene chiamata solo in quel caso per ottenere il testo.
+
+    Args:
+        level (int): Il livello del messaggio.
+        message (str or callable): Il testo (con segnaposto %) o una funzione che lo restituisce.
+        *args: Argomenti da inserire nel testo.
+    """
+    if _verbosity < level:
+        return
+    if callable(message):
+        message = message()
+    if args:
+        message = message % args
+    print(message, file=sys.stdout)
+
+
+def info(message, *args):
+    """Stampa un messaggio di livello INFO."""
+    if _verbosity >= INFO:
+        log(INFO, message, *args)
+
+
+def debug(message, *args):
+    """Stampa un messaggio di livello DEBUG."""
+    if _verbosity >= DEBUG:
+        log(DEBUG, message, *args)
+
+
+def trace(message, *args):
+    """Stampa un messaggio di livello TRACE (dettaglio per singola iterazione)."""
+    if _verbosity >= TRACE:
+        log(TRACE, message, *args)
@@ -1,16 +1,777 @@
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left, bisect_right, insort
 
-def string_to_matrix(input_string):
+try:
+    import numpy as np
+except ImportError:
+    # NumPy è opzionale: senza di esso si usano Grid e le matrici lista di liste
+    np = None
+
+
+# Modello delle direzioni: codici interi piccoli e tabelle precalcolate.
+# I nomi ('up', 'down', 'left', 'right') e i caratteri ('^', 'v', '<', '>') servono
+# solo ai bordi dell'API; all'interno dei cicli si usano i codici e le tabelle.
+UP, RIGHT, DOWN, LEFT = 0, 1, 2, 3
+
+DIRECTION_NAMES = ('up', 'right', 'down', 'left')
+DIRECTION_CHARS = ('^', '>', 'v', '<')
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTION_NAMES)}
+CHAR_TO_DIRECTION = {char: code for code, char in enumerate(DIRECTION_CHARS)}
+
+# Delta (dr, dc) per ogni codice, anche separati per righe e colonne
+DIRECTION_DELTAS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+DIRECTION_DR = (-1, 0, 1, 0)
+DIRECTION_DC = (0, 1, 0, -1)
+
+# Rotazioni di 90 gradi e direzione opposta
+ROTATE_RIGHT = (RIGHT, DOWN, LEFT, UP)
+ROTATE_LEFT = (LEFT, UP, RIGHT, DOWN)
+OPPOSITE = (DOWN, LEFT, UP, RIGHT)
+
+# Conteggio dei bit a 1 di un intero (int.bit_count è disponibile da Python 3.10)
+_popcount = int.bit_count if hasattr(int, 'bit_count') else (lambda value: bin(value).count('1'))
+
+_CHAR_TO_DIRECTION_NAME = {char: DIRECTION_NAMES[code] for char, code in CHAR_TO_DIRECTION.items()}
+
+
+def direction_code(direction):
+    """
+    Converte una direzione nel suo codice intero.
+
+    Args:
+        direction (int or str): Codice (UP, RIGHT, DOWN, LEFT) oppure nome ('up', 'right', 'down', 'left').
+
+    Returns:
+        int or None: Il codice della direzione, oppure None se la direzione non è valida.
+    """
+    if direction.__class__ is int:
+        return direction if 0 <= direction < 4 else None
+    return DIRECTION_CODES.get(direction)
+
+
+class Grid:
+    """
+    Griglia di caratteri memorizzata in un unico bytearray piatto (row-major).
+    La cella (row, col) si trova all'offset row * width + col.
+
+    Tutte le scritture devono passare da set, __setitem__ o write_byte: una scrittura
+    diretta in data (o una modifica degli insiemi di index) non aggiorna l'indice, che
+    da quel momento restituisce posizioni sbagliate.
+
+    Attributes:
+        data (bytearray or mmap): Byte delle celle, senza separatori di riga
+                                  (un mmap copy-on-write se caricata con load_grid_binary).
+        width (int): Numero di colonne.
+        height (int): Numero di righe.
+        index (dict or None): Indice opzionale byte -> insieme degli offset in cui compare,
+                              mantenuto aggiornato dalle scritture (vedi build_index);
+                              va letto tramite offsets_of e count.
+        sentinel (str or None): Carattere del bordo di una cella che circonda la mappa,
+                                oppure None se la griglia non è paddata. In una griglia
+                                paddata le posizioni sono espresse nelle coordinate
+                                paddate (la cella (0, 0) originale diventa (1, 1)).
+                                Il carattere non deve comparire nella mappa: una cella
+                                uguale al bordo viene trattata come esterna.
+    """
+    __slots__ = ('data', 'width', 'height', 'index', 'sentinel')
+
+    def __init__(self, data, width, height, index=None, sentinel=None):
+        self.data = data
+        self.width = width
+        self.height = height
+        self.index = index
+        self.sentinel = sentinel
+
+    @classmethod
+    def from_bytes(cls, raw, sentinel=None):
+        """
+        Costruisce una Grid direttamente dai byte del file, senza dividerli in righe.
+
+        Args:
+            raw (bytes): Contenuto del file (righe separate da '\n' o '\r\n').
+            sentinel (str, optional): Se indicato, la mappa viene circondata da un bordo
+                                      di una cella con questo carattere.
+
+        Returns:
+            Grid: La griglia costruita.
+        """
+        data = bytearray(raw)
+        if b'\r' in data:
+            data = data.replace(b'\r', b'')
+        data = data.rstrip(b'\n')
+        width = data.find(b'\n')
+        if width == -1:
+            width = len(data)
+
+        if sentinel is None:
+            data = data.replace(b'\n', b'')
+            height = len(data) // width if width else 0
+            return cls(data, width, height)
+
+        # Ogni '\n' diventa la coppia (bordo destro, bordo sinistro) delle due righe adiacenti
+        border = sentinel.encode('utf-8')
+        width += 2
+        data = bytearray(border * (width + 1) + data.replace(b'\n', border * 2) + border * (width + 1))
+        return cls(data, width, len(data) // width, sentinel=sentinel)
+
+    @classmethod
+    def from_string(cls, input_string, sentinel=None):
+        """
+        Costruisce una Grid da una stringa con righe separate da '\n'.
+
+        Args:
+            input_string (str): La stringa da convertire.
+            sentinel (str, optional): Carattere del bordo, vedi from_bytes.
+
+        Returns:
+            Grid: La griglia costruita.
+        """
+        return cls.from_bytes(input_string.encode('utf-8'), sentinel)
+
+    @property
+    def pad(self):
+        """Spessore del bordo sentinella (1 se la griglia è paddata, altrimenti 0)."""
+        return 0 if self.sentinel is None else 1
+
+    def offset(self, row, col):
+        """Restituisce l'offset nel bytearray della cella (row, col)."""
+        return row * self.width + col
+
+    def position(self, offset):
+        """Restituisce la posizione (row, col) corrispondente a un offset."""
+        return divmod(offset, self.width)
+
+    def build_index(self):
+        """
+        Costruisce in una sola passata l'indice carattere -> posizioni.
+        Da questo momento ogni scrittura tramite set, __setitem__ o write_byte
+        mantiene l'indice aggiornato in modo incrementale.
+
+        Returns:
+            dict: L'indice costruito (byte -> set di offset).
+        """
+        index = {}
+        for offset, byte in enumerate(memoryview(self.data)):
+            positions = index.get(byte)
+            if positions is None:
+                index[byte] = {offset}
+            else:
+                positions.add(offset)
+        self.index = index
+        return index
+
+    def write_byte(self, offset, byte):
+        """Scrive un byte all'offset indicato aggiornando l'indice, se presente."""
+        index = self.index
+        if index is not None:
+            old_byte = self.data[offset]
+            if old_byte == byte:
+                return
+            index[old_byte].discard(offset)
+            positions = index.get(byte)
+            if positions is None:
+                index[byte] = {offset}
+            else:
+                positions.add(offset)
+        self.data[offset] = byte
+
+    def offsets_of(self, char):
+        """
+        Restituisce gli offset in cui compare char. Usa l'indice se disponibile,
+        altrimenti scandisce il bytearray. Il risultato è una copia immutabile: l'indice
+        interno non può essere modificato dall'esterno.
+
+        Args:
+            char (str): Il carattere da cercare.
+
+        Returns:
+            frozenset: Insieme degli offset.
+        """
+        byte = ord(char)
+        if self.index is not None:
+            return frozenset(self.index.get(byte, ()))
+        needle = bytes((byte,))
+        offsets = []
+        offset = self.data.find(needle)
+        while offset != -1:
+            offsets.append(offset)
+            offset = self.data.find(needle, offset + 1)
+        return frozenset(offsets)
+
+    def count(self, char):
+        """Restituisce il numero di celle che contengono char."""
+        if self.index is not None:
+            return len(self.index.get(ord(char), ()))
+        if isinstance(self.data, bytearray):
+            return self.data.count(ord(char))
+        return len(self.offsets_of(char))
+
+    def alphabet(self):
+        """Restituisce i caratteri distinti presenti nella griglia, in ordine di codice."""
+        if self.index is not None:
+            return ''.join(chr(byte) for byte in sorted(self.index) if self.index[byte])
+        return ''.join(chr(byte) for byte in sorted(set(memoryview(self.data))))
+
+    def get(self, row, col):
+        """Restituisce il carattere nella cella (row, col)."""
+        return chr(self.data[row * self.width + col])
+
+    def set(self, row, col, char):
+        """Scrive il carattere char nella cella (row, col)."""
+        self.write_byte(row * self.width + col, ord(char))
+
+    def __getitem__(self, pos):
+        row, col = pos
+        return chr(self.data[row * self.width + col])
+
+    def __setitem__(self, pos, char):
+        row, col = pos
+        self.write_byte(row * self.width + col, ord(char))
+
+    def __len__(self):
+        return self.height
+
+    def copy(self):
+        """Restituisce una copia indipendente della griglia (indice incluso)."""
+        index = None
+        if self.index is not None:
+            index = {byte: set(positions) for byte, positions in self.index.items()}
+        return Grid(bytearray(self.data), self.width, self.height, index, self.sentinel)
+
+    def row_bytes(self, row):
+        """Restituisce i byte della riga indicata."""
+        start = row * self.width
+        return bytes(self.data[start:start + self.width])
+
+
+class SparseGrid:
+    """
+    Griglia sparsa per mappe enormi e quasi vuote: memorizza solo le celle diverse
+    dal valore di default, in un dizionario con chiave la coordinata impacchettata
+    row * width + col. Espone la stessa API di lettura di Grid (get, __getitem__,
+    offset, position, offsets_of, count) e può essere convertita in una Grid densa
+    con to_dense.
+
+    Quando una scrittura porta la densità oltre density_threshold la griglia passa da
+    sola alla rappresentazione densa (attributo dense) e da lì in poi delega tutte le
+    operazioni alla Grid, senza cambiare identità per chi la sta usando. Il passaggio
+    avviene solo se tutte le celle scritte sono un singolo carattere (vedi to_dense).
+
+    Attributes:
+        cells (dict): Coordinata impacchettata -> carattere, solo per le celle non di default.
+        width (int): Numero di colonne.
+        height (int): Numero di righe.
+        default (str): Il carattere delle celle non memorizzate.
+        density_threshold (float): Densità oltre la quale conviene passare alla Grid densa.
+        dense (Grid or None): La rappresentazione densa, dopo il passaggio automatico.
+    """
+    __slots__ = ('cells', 'width', 'height', 'default', 'density_threshold', 'dense', '_dense_limit')
+
+    def __init__(self, width, height, default='.', cells=None, density_threshold=0.25):
+        self.cells = cells if cells is not None else {}
+        self.width = width
+        self.height = height
+        self.default = default
+        self.density_threshold = density_threshold
+        self.dense = None
+        # Numero di celle memorizzate oltre il quale set() prova il passaggio alla Grid densa
+        # (infinito se un tentativo ha trovato celle di più caratteri)
+        self._dense_limit = density_threshold * width * height
+
+    @classmethod
+    def from_grid(cls, grid, default='.'):
+        """
+        Costruisce una SparseGrid da una griglia densa (Grid o lista di liste).
+
+        Args:
+            grid (Grid or list of list): La griglia di partenza.
+            default (str): Il carattere da non memorizzare. Default '.'.
+
+        Returns:
+            SparseGrid: La griglia sparsa.
+        """
+        rows, cols = get_matrix_dimensions(grid)
+        get_cell, _ = _cell_accessors(grid)
+        cells = {}
+        for row in range(rows):
+            for col in range(cols):
+                char = get_cell(row, col)
+                if char != default:
+                    cells[row * cols + col] = char
+        return cls(cols, rows, default, cells)
+
+    def offset(self, row, col):
+        """Restituisce la coordinata impacchettata della cella (row, col)."""
+        return row * self.width + col
+
+    def position(self, offset):
+        """Restituisce la posizione (row, col) corrispondente a una coordinata impacchettata."""
+        return divmod(offset, self.width)
+
+    @property
+    def density(self):
+        """Frazione di celle memorizzate (diverse dal default) rispetto al totale."""
+        total = self.width * self.height
+        if not total:
+            return 0.0
+        if self.dense is not None:
+            return 1.0 - self.dense.count(self.default) / total
+        return len(self.cells) / total
+
+    def get(self, row, col):
+        """Restituisce il carattere nella cella (row, col)."""
+        if self.dense is not None:
+            return self.dense.get(row, col)
+        return self.cells.get(row * self.width + col, self.default)
+
+    def set(self, row, col, char):
+        """
+        Scrive il carattere char nella cella (row, col); il default non viene memorizzato.
+        Se la densità supera la soglia la griglia passa alla rappresentazione densa.
+        """
+        if self.dense is not None:
+            self.dense.set(row, col, char)
+            return
+        key = row * self.width + col
+        if char == self.default:
+            self.cells.pop(key, None)
+            return
+        cells = self.cells
+        cells[key] = char
+        if len(cells) > self._dense_limit:
+            dense = densify_if_needed(self)
+            if dense is not self:
+                self.dense = dense
+                self.cells = {}
+
+    def __getitem__(self, pos):
+        if self.dense is not None:
+            return self.dense[pos]
+        row, col = pos
+        return self.cells.get(row * self.width + col, self.default)
+
+    def __setitem__(self, pos, char):
+        self.set(pos[0], pos[1], char)
+
+    def __len__(self):
+        return self.height
+
+    def offsets_of(self, char):
+        """
+        Restituisce le coordinate impacchettate delle celle che contengono char.
+        Per il carattere di default le coordinate vengono generate una alla volta, in
+        ordine crescente, senza costruire l'insieme di tutte le celle della griglia.
+
+        Args:
+            char (str): Il carattere da cercare.
+
+        Returns:
+            set or iterator: Le coordinate impacchettate (un iteratore per il default).
+        """
+        if self.dense is not None:
+            return self.dense.offsets_of(char)
+        if char == self.default:
+            cells = self.cells
+            return (key for key in range(self.width * self.height) if key not in cells)
+        return {key for key, value in self.cells.items() if value == char}
+
+    def count(self, char):
+        """Restituisce il numero di celle che contengono char."""
+        if self.dense is not None:
+            return self.dense.count(char)
+        if char == self.default:
+            return self.width * self.height - len(self.cells)
+        return sum(1 for value in self.cells.values() if value == char)
+
+    def copy(self):
+        """Restituisce una copia indipendente della griglia."""
+        grid = SparseGrid(self.width, self.height, self.default, dict(self.cells), self.density_threshold)
+        if self.dense is not None:
+            grid.dense = self.dense.copy()
+        return grid
+
+    def to_dense(self):
+        """
+        Converte la griglia sparsa in una Grid densa (bytearray piatto, un byte per cella).
+
+        Returns:
+            Grid: La griglia densa equivalente.
+
+        Raises:
+            ValueError: Se una cella (o il default) non è un singolo carattere con codice
+                        minore di 256, che la Grid non può memorizzare (es. i conteggi '10').
+        """
+        if self.dense is not None:
+            return self.dense.copy()
+        for key, char in self.cells.items():
+            if not _is_single_char(char):
+                raise ValueError(f"La cella {self.position(key)} contiene {char!r}: "
+                                 f"la Grid densa memorizza un solo carattere per cella.")
+        if not _is_single_char(self.default):
+            raise ValueError(f"Il default {self.default!r} non è un singolo carattere.")
+        data = bytearray((ord(self.default),)) * (self.width * self.height)
+        for key, char in self.cells.items():
+            data[key] = ord(char)
+        return Grid(data, self.width, self.height)
+
+
+def _is_single_char(value):
+    """Verifica se value può stare in una cella di una Grid (un carattere con codice < 256)."""
+    return isinstance(value, str) and len(value) == 1 and ord(value) < 256
+
+
+def create_sparse_grid(rows, cols, default_value='.'):
+    """
+    Crea una griglia sparsa NxM: nessuna cella viene allocata finché non viene scritta.
+
+    Args:
+        rows (int): Numero di righe (N).
+        cols (int): Numero di colonne (M).
+        default_value (str): Carattere di default di ogni cella. Default '.'.
+
+    Returns:
+        SparseGrid: Griglia NxM.
+    """
+    return SparseGrid(cols, rows, default_value)
+
+
+def densify_if_needed(grid):
+    """
+    Converte una SparseGrid in Grid densa quando la sua densità supera la soglia (viene
+    chiamata da SparseGrid.set a ogni scrittura). Una SparseGrid già passata alla
+    rappresentazione densa restituisce la sua Grid; una con celle di più caratteri resta
+    sparsa. Qualsiasi altra griglia viene restituita così com'è.
+
+    Args:
+        grid (SparseGrid, Grid or list of list): La griglia da controllare.
+
+    Returns:
+        SparseGrid, Grid or list of list: La griglia, eventualmente convertita.
+    """
+    if isinstance(grid, SparseGrid):
+        if grid.dense is not None:
+            return grid.dense
+        if grid.density > grid.density_threshold:
+            if _is_single_char(grid.default) and all(map(_is_single_char, grid.cells.values())):
+                return grid.to_dense()
+            # Celle di più caratteri (es. conteggi '10'): la griglia resta sparsa
+            grid._dense_limit = float('inf')
+    return grid
+
+
+class Bitboard:
+    """
+    Strato di occupazione di una griglia (muri, casse, celle visitate) memorizzato in un
+    unico intero Python a precisione arbitraria: il bit row * width + col vale 1 se la
+    cella (row, col) è occupata. Occupa un bit per cella invece di un carattere.
+
+    Attributes:
+        bits (int): I bit dello strato, in ordine di riga.
+        width (int): Numero di colonne.
+        height (int): Numero di righe.
+    """
+    __slots__ = ('bits', 'width', 'height')
+
+    def __init__(self, width, height, bits=0):
+        self.bits = bits
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def from_grid(cls, grid, chars):
+        """
+        Costruisce lo strato delle celle della griglia che contengono uno dei caratteri.
+
+        Args:
+            grid (Grid or list of list): La griglia di riferimento.
+            chars (str): I caratteri da considerare occupati.
+
+        Returns:
+            Bitboard: Lo strato costruito.
+        """
+        rows, cols = get_matrix_dimensions(grid)
+        if isinstance(grid, Grid):
+            raw = bytes(grid.data)
+        else:
+            raw = ''.join(''.join(row) for row in grid).encode('utf-8')
+        # Ogni cella diventa '1' o '0': la stringa binaria (invertita, il bit 0 è la cella 0)
+        # viene convertita in intero in tempo lineare
+        table = bytearray(b'0' * 256)
+        for char in chars:
+            table[ord(char)] = ord('1')
+        digits = raw.translate(table)[::-1]
+        return cls(cols, rows, int(digits, 2) if digits else 0)
+
+    @property
+    def full_mask(self):
+        """Maschera con tutti i bit della griglia a 1."""
+        return (1 << (self.width * self.height)) - 1
+
+    def _column_mask(self, col):
+        """Maschera con a 1 i bit della colonna indicata, in tutte le righe."""
+        row_unit = ((1 << (self.width * self.height)) - 1) // ((1 << self.width) - 1)
+        return row_unit << col
+
+    def set(self, row, col):
+        """Imposta a 1 il bit della cella (row, col)."""
+        self.bits |= 1 << (row * self.width + col)
+
+    def clear(self, row, col):
+        """Imposta a 0 il bit della cella (row, col)."""
+        self.bits &= ~(1 << (row * self.width + col))
+
+    def test(self, row, col):
+        """Restituisce True se il bit della cella (row, col) vale 1."""
+        return (self.bits >> (row * self.width + col)) & 1 == 1
+
+    def __getitem__(self, pos):
+        row, col = pos
+        return (self.bits >> (row * self.width + col)) & 1 == 1
+
+    def popcount(self):
+        """Restituisce il numero di celle occupate."""
+        return _popcount(self.bits)
+
+    def positions(self):
+        """
+        Itera sulle posizioni occupate, in ordine di riga.
+
+        Yields:
+            tuple: La posizione (r, c) di ogni bit a 1.
+        """
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            yield divmod(lowest.bit_length() - 1, self.width)
+            bits ^= lowest
+
+    def shift(self, direction):
+        """
+        Trasla l'intero strato di una cella nella direzione indicata; i bit che escono dalla
+        griglia (o che passerebbero da una riga all'altra) vengono scartati.
+
+        Args:
+            direction (int or str): Codice della direzione oppure nome tra 'up', 'down', 'left', 'right'.
+
+        Returns:
+            Bitboard: Il nuovo strato traslato.
+        """
+        code = direction_code(direction)
+        if code == UP:
+            bits = self.bits >> self.width
+        elif code == DOWN:
+            bits = (self.bits << self.width) & self.full_mask
+        elif code == RIGHT:
+            bits = (self.bits << 1) & self.full_mask & ~self._column_mask(0)
+        elif code == LEFT:
+            bits = (self.bits >> 1) & ~self._column_mask(self.width - 1)
+        else:
+            raise ValueError("Direzione non valida. Usa 'up', 'down', 'left' o 'right'.")
+        return Bitboard(self.width, self.height, bits)
+
+    def __and__(self, other):
+        return Bitboard(self.width, self.height, self.bits & other.bits)
+
+    def __or__(self, other):
+        return Bitboard(self.width, self.height, self.bits | other.bits)
+
+    def __xor__(self, other):
+        return Bitboard(self.width, self.height, self.bits ^ other.bits)
+
+    def __invert__(self):
+        return Bitboard(self.width, self.height, ~self.bits & self.full_mask)
+
+    def weighted_sum(self, row_weight=100, col_weight=1):
+        """
+        Somma row_weight * r + col_weight * c su tutte le celle occupate (es. il GPS delle casse)
+        senza visitarle una per una: per ogni bit dell'indice di riga/colonna si conta con
+        popcount quante celle occupate lo hanno a 1.
+
+        Args:
+            row_weight (int): Peso dell'indice di riga. Default 100.
+            col_weight (int): Peso dell'indice di colonna. Default 1.
+
+        Returns:
+            int: La somma pesata.
+        """
+        width, height, bits = self.width, self.height, self.bits
+        row_bits = (1 << width) - 1
+        col_sum = 0
+        for bit in range(max(width - 1, 0).bit_length()):
+            mask = 0
+            for col in range(width):
+                if col >> bit & 1:
+                    mask |= 1 << col
+            # La maschera della singola riga viene replicata su tutte le righe
+            mask *= self._column_mask(0)
+            col_sum += _popcount(bits & mask) << bit
+        row_sum = 0
+        for bit in range(max(height - 1, 0).bit_length()):
+            mask = 0
+            for row in range(height):
+                if row >> bit & 1:
+                    mask |= row_bits << (row * width)
+            row_sum += _popcount(bits & mask) << bit
+        return row_weight * row_sum + col_weight * col_sum
+
+
+def string_to_matrix(input_string, sentinel=None):
     """
     Converte una stringa in una matrice XY di caratteri.
     Ogni riga è separata da un carattere di a capo '\n'.
 
     Args:
         input_string (str): La stringa da convertire.
+        sentinel (str, optional): Se indicato, la matrice viene circondata da un bordo
+                                  di una cella con questo carattere.
 
     Returns:
         list: Matrice XY (lista di liste) di caratteri.
     """
-    return [list(line) for line in input_string.splitlines()]
+    if sentinel is None:
+        return [list(line) for line in input_string.splitlines()]
+    return pad_matrix([list(line) for line in input_string.splitlines()], sentinel)
+
+
+def pad_matrix(matrix, sentinel):
+    """
+    Restituisce una nuova matrice circondata da un bordo di una cella con il carattere sentinel.
+    Chi cammina nella matrice può fermarsi quando legge sentinel invece di controllare i limiti.
+
+    Args:
+        matrix (list of list): La matrice di partenza.
+        sentinel (str): Il carattere del bordo.
+
+    Returns:
+        list of list: Matrice con due righe e due colonne in più.
+    """
+    cols = len(matrix[0]) if matrix else 0
+    padded = [[sentinel] * (cols + 2)]
+    padded.extend([sentinel] + list(row) + [sentinel] for row in matrix)
+    padded.append([sentinel] * (cols + 2))
+    return padded
+
+
+def string_to_grid(input_string, sentinel=None):
+    """
+    Converte una stringa in una Grid (bytearray piatto) di caratteri.
+
+    Args:
+        input_string (str or bytes): La stringa (o i byte del file) da convertire.
+        sentinel (str, optional): Se indicato, la griglia viene circondata da un bordo
+                                  di una cella con questo carattere.
+
+    Returns:
+        Grid: Griglia risultante.
+    """
+    if isinstance(input_string, (bytes, bytearray, memoryview)):
+        return Grid.from_bytes(input_string, sentinel)
+    return Grid.from_string(input_string, sentinel)
+
+
+def string_to_array(input_string):
+    """
+    Converte una stringa in un ndarray NumPy uint8 (righe x colonne) con il codice di ogni carattere.
+    L'array condivide la memoria con il bytearray di una Grid, senza copie aggiuntive.
+    Se NumPy non è installato restituisce la matrice lista di liste di string_to_matrix,
+    che tutte le funzioni del modulo accettano allo stesso modo.
+
+    Args:
+        input_string (str or bytes): La stringa (o i byte del file) da convertire.
+
+    Returns:
+        numpy.ndarray or list: Matrice risultante.
+    """
+    if np is None:
+        if isinstance(input_string, (bytes, bytearray, memoryview)):
+            input_string = bytes(input_string).decode('utf-8')
+        return string_to_matrix(input_string)
+    grid = string_to_grid(input_string)
+    return np.frombuffer(grid.data, dtype=np.uint8).reshape(grid.height, grid.width)
+
+
+def _is_array(matrix):
+    """Verifica se matrix è un ndarray NumPy (sempre False se NumPy non è installato)."""
+    return np is not None and isinstance(matrix, np.ndarray)
+
+
+# Formato binario delle griglie: i byte delle celle all'inizio del file (così possono essere
+# mappati con mmap a offset 0), seguiti dall'alfabeto e da un trailer di lunghezza fissa:
+# larghezza (u32), altezza (u32), lunghezza alfabeto (u16), sentinella (u8, 0 = nessuna), magic.
+GRID_BINARY_MAGIC = b'AOG1'
+_GRID_TRAILER = struct.Struct('<IIHBx4s')
+
+
+def save_grid_binary(grid, file_path):
+    """
+    Salva una Grid nel formato binario: byte delle celle, alfabeto e trailer.
+
+    Args:
+        grid (Grid): La griglia da salvare.
+        file_path (str): Il percorso del file di destinazione.
+    """
+    alphabet = grid.alphabet().encode('utf-8')
+    sentinel = ord(grid.sentinel) if grid.sentinel is not None else 0
+    with open(file_path, 'wb') as file:
+        file.write(grid.data)
+        file.write(alphabet)
+        file.write(_GRID_TRAILER.pack(grid.width, grid.height, len(alphabet), sentinel, GRID_BINARY_MAGIC))
+
+
+def load_grid_binary(file_path, use_mmap=True):
+    """
+    Carica una Grid salvata nel formato binario. Con use_mmap le celle vengono mappate
+    in memoria direttamente dal file (mmap copy-on-write, O(1)): le scritture sulla
+    griglia restano in memoria e non modificano il file.
+
+    Args:
+        file_path (str): Il percorso del file binario.
+        use_mmap (bool): Se False le celle vengono lette in un bytearray.
+
+    Returns:
+        Grid: La griglia caricata (l'alfabeto non viene restituito, vedi Grid.alphabet).
+    """
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size < _GRID_TRAILER.size:
+            raise ValueError(f"Il file '{file_path}' non è una griglia binaria valida.")
+        file.seek(size - _GRID_TRAILER.size)
+        width, height, _, sentinel, magic = _GRID_TRAILER.unpack(file.read(_GRID_TRAILER.size))
+        if magic != GRID_BINARY_MAGIC:
+            raise ValueError(f"Il file '{file_path}' non è una griglia binaria valida.")
+
+        cells = width * height
+        if use_mmap and cells:
+            data = mmap.mmap(file.fileno(), cells, access=mmap.ACCESS_COPY)
+        else:
+            file.seek(0)
+            data = bytearray(cells)
+            file.readinto(data)
+
+    return Grid(data, width, height, sentinel=chr(sentinel) if sentinel else None)
+
+
+def convert_text_grid_to_binary(text_path, binary_path=None, sentinel=None):
+    """
+    Converte una griglia in formato testo (es. inputs/NN/input.txt) nel formato binario.
+
+    Args:
+        text_path (str): Il percorso del file di testo.
+        binary_path (str, optional): Il percorso del file binario. Default: text_path con estensione '.grid'.
+        sentinel (str, optional): Se indicato, la griglia salvata è circondata da questo bordo.
+
+    Returns:
+        str: Il percorso del file binario scritto.
+    """
+    if binary_path is None:
+        binary_path = os.path.splitext(text_path)[0] + '.grid'
+    with open(text_path, 'rb') as file:
+        grid = Grid.from_bytes(file.read(), sentinel)
+    save_grid_binary(grid, binary_path)
+    return binary_path
 
 
 def get_matrix_dimensions(matrix):
@@ -23,6 +784,10 @@ def get_matrix_dimensions(matrix):
     Returns:
         tuple: Numero di righe e numero di colonne (rows, cols).
     """
+    if isinstance(matrix, (Grid, SparseGrid)):
+        return matrix.height, matrix.width
+    if _is_array(matrix):
+        return matrix.shape
     rows = len(matrix)
     cols = len(matrix[0]) if matrix else 0  # Verifica che la matrice non sia vuota
     return rows, cols
@@ -39,13 +804,25 @@ def is_position_inside(matrix, guard_position):
     Returns:
         bool: True se la posizione è all'interno della matrice, False altrimenti.
     """
+    if _is_array(matrix):
+        row, col = guard_position
+        rows, cols = matrix.shape
+        return 0 <= row < rows and 0 <= col < cols
+
     if not matrix:
         return False
 
+    row, col = guard_position
+    if isinstance(matrix, Grid):
+        if matrix.sentinel is not None:
+            # Su una griglia paddata basta confrontare la cella con il bordo
+            return matrix.data[row * matrix.width + col] != ord(matrix.sentinel)
+        return 0 <= row < matrix.height and 0 <= col < matrix.width
+    if isinstance(matrix, SparseGrid):
+        return 0 <= row < matrix.height and 0 <= col < matrix.width
+
     rows = len(matrix)
     cols = len(matrix[0])
-
-    row, col = guard_position
     return 0 <= row < rows and 0 <= col < cols
 
 
@@ -60,34 +837,334 @@ def matrix_to_string(matrix):
     Returns:
         str: Stringa risultante.
     """
+    if isinstance(matrix, GridRenderer):
+        return matrix.render()
+    if isinstance(matrix, SparseGrid) and matrix.dense is not None:
+        matrix = matrix.dense
+    if isinstance(matrix, Grid):
+        width = matrix.width
+        data = matrix.data
+        return '\n'.join(data[start:start + width].decode('utf-8')
+                         for start in range(0, len(data), width))
+    if _is_array(matrix):
+        return '\n'.join(row.tobytes().decode('utf-8') for row in matrix)
+    if isinstance(matrix, SparseGrid):
+        lines = [[matrix.default] * matrix.width for _ in range(matrix.height)]
+        for key, char in matrix.cells.items():
+            row, col = divmod(key, matrix.width)
+            lines[row][col] = char
+        return '\n'.join(''.join(line) for line in lines)
     return '\n'.join(''.join(row) for row in matrix)
 
 
+def _cell_accessors(grid):
+    """
+    Restituisce le funzioni (get, set) per leggere e scrivere la cella (r, c),
+    sia per una Grid che per una matrice lista di liste.
+    """
+    if isinstance(grid, (Grid, SparseGrid)):
+        return grid.get, grid.set
+
+    if _is_array(grid):
+        def get_cell(r, c):
+            return chr(grid[r, c])
+
+        def set_cell(r, c, char):
+            grid[r, c] = ord(char)
+
+        return get_cell, set_cell
+
+    def get_cell(r, c):
+        return grid[r][c]
+
+    def set_cell(r, c, char):
+        grid[r][c] = char
+
+    return get_cell, set_cell
+
+
+def _row_string(grid, row):
+    """
+    Restituisce la riga indicata della griglia come stringa.
+
+    Args:
+        grid (Grid, SparseGrid, numpy.ndarray or list of list): La griglia.
+        row (int): Indice della riga.
+
+    Returns:
+        str: La riga come stringa.
+    """
+    if isinstance(grid, SparseGrid) and grid.dense is not None:
+        grid = grid.dense
+    if isinstance(grid, Grid):
+        start = row * grid.width
+        return bytes(grid.data[start:start + grid.width]).decode('utf-8')
+    if _is_array(grid):
+        return grid[row].tobytes().decode('utf-8')
+    if isinstance(grid, SparseGrid):
+        start = row * grid.width
+        cells, default = grid.cells, grid.default
+        return ''.join([cells.get(key, default) for key in range(start, start + grid.width)])
+    return ''.join(grid[row])
+
+
+class GridRenderer:
+    """
+    Rendering incrementale di una griglia: mantiene in cache la stringa di ogni riga e
+    ricostruisce solo le righe marcate come modificate ("sporche"), invece di riconvertire
+    tutte le celle a ogni stampa.
+
+    Le modifiche fatte tramite set() vengono tracciate automaticamente; se la griglia viene
+    modificata direttamente, bisogna segnalarlo con mark_dirty() o mark_cell().
+
+    Attributes:
+        grid: La griglia osservata (Grid, SparseGrid, numpy.ndarray o lista di liste).
+        rows (list of str): La stringa in cache di ogni riga.
+        dirty (set): Indici delle righe da ricostruire.
+    """
+    __slots__ = ('grid', 'rows', 'dirty', '_text', '_drawn', '_set_cell')
+
+    def __init__(self, grid):
+        self.grid = grid
+        height, _ = get_matrix_dimensions(grid)
+        self.rows = [_row_string(grid, row) for row in range(height)]
+        self.dirty = set()
+        self._text = None
+        # Righe mostrate sul terminale all'ultimo disegno (None se non ancora disegnato)
+        self._drawn = None
+        _, self._set_cell = _cell_accessors(grid)
+
+    def mark_dirty(self, row):
+        """Segnala che la riga indicata è cambiata."""
+        self.dirty.add(row)
+
+    def mark_cell(self, pos):
+        """Segnala che la cella (r, c) è cambiata."""
+        self.dirty.add(pos[0])
+
+    def set(self, pos, char):
+        """
+        Scrive il carattere nella cella (r, c) della griglia e ne marca la riga come sporca.
+
+        Args:
+            pos (tuple): La posizione (r, c).
+            char (str): Il carattere da scrivere.
+        """
+        self._set_cell(pos[0], pos[1], char)
+        self.dirty.add(pos[0])
+
+    def invalidate(self):
+        """
+        Forza un disegno completo alla prossima chiamata di draw(), ad esempio dopo aver
+        stampato altro testo sul terminale sotto la griglia.
+        """
+        self._drawn = None
+
+    def _refresh(self):
+        """
+        Ricostruisce le righe sporche e restituisce gli indici di quelle effettivamente cambiate.
+        """
+        changed = []
+        for row in sorted(self.dirty):
+            line = _row_string(self.grid, row)
+            if line != self.rows[row]:
+                self.rows[row] = line
+                changed.append(row)
+        self.dirty.clear()
+        if changed:
+            self._text = None
+        return changed
+
+    def render(self):
+        """
+        Restituisce la griglia come stringa, ricostruendo solo le righe sporche.
+
+        Returns:
+            str: La griglia, una riga per linea (come matrix_to_string).
+        """
+        self._refresh()
+        if self._text is None:
+            self._text = '\n'.join(self.rows)
+        return self._text
+
+    def draw(self, stream=None):
+        """
+        Mostra la griglia sullo stream. Su un terminale, dopo il primo disegno completo,
+        ridisegna solo le righe cambiate spostando il cursore con le sequenze ANSI; altrimenti
+        (es. output rediretto su file) scrive l'intera griglia come print(matrix_to_string(grid)).
+
+        Args:
+            stream (file, optional): Lo stream di output. Default sys.stdout.
+        """
+        stream = stream if stream is not None else sys.stdout
+        isatty = getattr(stream, 'isatty', None)
+        if not (isatty and isatty()):
+            stream.write(self.render() + '\n')
+            return
+
+        changed = self._refresh()
+        if self._drawn is None or len(self._drawn) != len(self.rows):
+            stream.write('\n'.join(self.rows) + '\n')
+        else:
+            height = len(self.rows)
+            parts = []
+            for row in changed:
+                # Il cursore si trova sotto l'ultima riga: sale, riscrive la riga e torna giù
+                up = height - row
+                parts.append(f"\x1b[{up}A\r{self.rows[row]}\x1b[K\x1b[{up}B\r")
+            stream.write(''.join(parts))
+        self._drawn = list(self.rows)
+        stream.flush()
+
+
+def build_char_index(grid):
+    """
+    Costruisce in una sola passata l'indice carattere -> posizioni della griglia.
+    Per una Grid l'indice viene anche agganciato alla griglia, che lo mantiene
+    aggiornato a ogni scrittura. Per una SparseGrid il carattere di default non viene indicizzato.
+
+    Args:
+        grid (Grid, SparseGrid or list of list): La griglia da indicizzare.
+
+    Returns:
+        dict: Dizionario carattere -> set di posizioni (r, c).
+    """
+    if isinstance(grid, SparseGrid) and grid.dense is not None:
+        return build_char_index(grid.dense)
+    if isinstance(grid, Grid):
+        index = grid.index if grid.index is not None else grid.build_index()
+        return {chr(byte): {grid.position(offset) for offset in offsets}
+                for byte, offsets in index.items()}
+    index = {}
+    if isinstance(grid, SparseGrid):
+        for key, char in grid.cells.items():
+            index.setdefault(char, set()).add(grid.position(key))
+        return index
+    for row, line in enumerate(grid):
+        for col, char in enumerate(line):
+            index.setdefault(char, set()).add((row, col))
+    return index
+
+
 def find_char_in_grid(grid, chars):
-    rows, cols = get_matrix_dimensions(grid)
-    position = ()
-    for row in range(rows):
-        for col in range(cols):
-            for char in chars:
-                if grid[row][col] == char:
-                    position = (row, col)
-                    break
-    return position
+    """
+    Restituisce la prima posizione (in ordine di riga) di uno dei caratteri indicati.
+
+    Args:
+        grid (Grid, SparseGrid or list of list): La griglia in cui cercare.
+        chars (str or list): Caratteri da cercare.
+
+    Returns:
+        tuple: La posizione (r, c) trovata, oppure () se nessun carattere è presente.
+    """
+    if isinstance(grid, (Grid, SparseGrid)):
+        if isinstance(grid, SparseGrid) or grid.index is not None:
+            offsets = [offset for offset in (min(grid.offsets_of(char), default=None) for char in chars)
+                       if offset is not None]
+        else:
+            # Cerca il primo offset di ciascun carattere direttamente nel bytearray
+            offsets = [offset for offset in (grid.data.find(char.encode('utf-8')) for char in chars) if offset != -1]
+        return grid.position(min(offsets)) if offsets else ()
+    if _is_array(grid):
+        flat = np.flatnonzero(_chars_mask(grid, chars))
+        return tuple(int(v) for v in divmod(int(flat[0]), grid.shape[1])) if flat.size else ()
+    for row, line in enumerate(grid):
+        for col, cell in enumerate(line):
+            if cell in chars:
+                return (row, col)
+    return ()
 
 
 def find_all_chars_in_grid(grid, chars, known_positions=None):
-    if known_positions is None:
-        known_positions = []
-    rows, cols = get_matrix_dimensions(grid)
+    """
+    Restituisce tutte le posizioni (in ordine di riga) dei caratteri indicati,
+    escluse quelle già presenti in known_positions.
+
+    Args:
+        grid (Grid, SparseGrid or list of list): La griglia in cui cercare.
+        chars (str or list): Caratteri da cercare.
+        known_positions (iterable, optional): Posizioni da escludere.
+
+    Returns:
+        list: Lista di posizioni (r, c).
+    """
+    known = set(known_positions) if known_positions else set()
+    if isinstance(grid, (Grid, SparseGrid)):
+        offsets = []
+        for char in chars:
+            offsets.extend(grid.offsets_of(char))
+        offsets.sort()
+        return [pos for pos in map(grid.position, offsets) if pos not in known]
+    if _is_array(grid):
+        return [pos for pos in map(tuple, np.argwhere(_chars_mask(grid, chars)).tolist()) if pos not in known]
     positions = []
-    for row in range(rows):
-        for col in range(cols):
-            for char in chars:
-                if grid[row][col] == char and not known_positions.__contains__((row, col)):
-                    positions.append((row, col))
+    for row, line in enumerate(grid):
+        for col, cell in enumerate(line):
+            if cell in chars and (row, col) not in known:
+                positions.append((row, col))
     return positions
 
 
+def _chars_mask(array, chars):
+    """Restituisce la maschera booleana delle celle dell'ndarray che contengono uno dei caratteri."""
+    return np.isin(array, np.frombuffer(''.join(chars).encode('utf-8'), dtype=np.uint8))
+
+
+def count_char_in_grid(grid, char):
+    """
+    Conta le celle della griglia che contengono il carattere indicato.
+    Solo un ndarray (vedi string_to_array) usa il conteggio vettoriale di NumPy: una
+    matrice lista di liste viene contata riga per riga in Python puro.
+
+    Args:
+        grid (Grid, SparseGrid, numpy.ndarray or list of list): La griglia di riferimento.
+        char (str): Il carattere da contare.
+
+    Returns:
+        int: Numero di occorrenze.
+    """
+    if isinstance(grid, (Grid, SparseGrid)):
+        return grid.count(char)
+    if _is_array(grid):
+        return int(np.count_nonzero(grid == ord(char)))
+    return sum(row.count(char) for row in grid)
+
+
+def neighbour_equality_mask(grid, direction):
+    """
+    Confronta ogni cella con la vicina nella direzione indicata, con un'unica operazione
+    vettoriale sull'array traslato. Le celle sul bordo (senza vicina) risultano False.
+
+    Args:
+        grid (numpy.ndarray or list of list): La griglia di riferimento.
+        direction (int or str): Codice della direzione oppure nome tra 'up', 'down', 'left', 'right'.
+
+    Returns:
+        numpy.ndarray or list of list: Maschera booleana delle celle uguali alla vicina.
+    """
+    code = direction_code(direction)
+    if code is None:
+        raise ValueError("Direzione non valida. Usa 'up', 'down', 'left' o 'right'.")
+    dr, dc = DIRECTION_DELTAS[code]
+
+    if _is_array(grid):
+        mask = np.zeros(grid.shape, dtype=bool)
+        rows, cols = grid.shape
+        # Porzione di griglia che ha una vicina nella direzione e la sua traslata
+        src_rows = slice(max(0, -dr), rows - max(0, dr))
+        src_cols = slice(max(0, -dc), cols - max(0, dc))
+        dst_rows = slice(max(0, dr), rows - max(0, -dr))
+        dst_cols = slice(max(0, dc), cols - max(0, -dc))
+        mask[src_rows, src_cols] = grid[src_rows, src_cols] == grid[dst_rows, dst_cols]
+        return mask
+
+    rows, cols = get_matrix_dimensions(grid)
+    get_cell, _ = _cell_accessors(grid)
+    return [[0 <= r + dr < rows and 0 <= c + dc < cols and get_cell(r, c) == get_cell(r + dr, c + dc)
+             for c in range(cols)]
+            for r in range(rows)]
+
+
 def get_direction_from_char(char):
     """
     Restituisce la direzione corrispondente a un carattere tra '^', '>', '<', 'v'.
@@ -99,13 +1176,20 @@ def get_direction_from_char(char):
         str or None: La direzione corrispondente ('up', 'down', 'left', 'right')
                      oppure None se il carattere non è riconosciuto.
     """
-    mapping = {
-        '^': 'up',
-        'v': 'down',
-        '<': 'left',
-        '>': 'right'
-    }
-    return mapping.get(char, None)
+    return _CHAR_TO_DIRECTION_NAME.get(char, None)
+
+
+def get_direction_code_from_char(char):
+    """
+    Restituisce il codice intero della direzione corrispondente a un carattere tra '^', '>', '<', 'v'.
+
+    Args:
+        char (str): Il carattere da analizzare.
+
+    Returns:
+        int or None: Il codice (UP, RIGHT, DOWN, LEFT) oppure None se il carattere non è riconosciuto.
+    """
+    return CHAR_TO_DIRECTION.get(char, None)
 
 
 def move_element_in_matrix(matrix, pos1, pos2):
@@ -122,12 +1206,33 @@ def move_element_in_matrix(matrix, pos1, pos2):
     Returns:
         None: La matrice viene modificata inline.
     """
-    rows = len(matrix)
-    cols = len(matrix[0]) if rows > 0 else 0
-
     r1, c1 = pos1
     r2, c2 = pos2
 
+    if isinstance(matrix, Grid):
+        data = matrix.data
+        width = matrix.width
+        original_byte = data[r1 * width + c1]
+        matrix.write_byte(r1 * width + c1, ord('.'))
+        if matrix.sentinel is not None:
+            # Su una griglia paddata il bordo sentinella sostituisce il controllo dei limiti
+            if data[r2 * width + c2] != ord(matrix.sentinel):
+                matrix.write_byte(r2 * width + c2, original_byte)
+        elif 0 <= r2 < matrix.height and 0 <= c2 < width:
+            matrix.write_byte(r2 * width + c2, original_byte)
+        return
+
+    if isinstance(matrix, SparseGrid) or _is_array(matrix):
+        get_cell, set_cell = _cell_accessors(matrix)
+        original_char = get_cell(r1, c1)
+        set_cell(r1, c1, '.')
+        if is_position_inside(matrix, pos2):
+            set_cell(r2, c2, original_char)
+        return
+
+    rows = len(matrix)
+    cols = len(matrix[0]) if rows > 0 else 0
+
     # Salva il carattere originale di pos1
     original_char = matrix[r1][c1]
 
@@ -149,56 +1254,233 @@ def move_contiguous_elements(grid, start_pos, direction):
     Args:
         grid (list of list): La griglia di elementi.
         start_pos (tuple): La posizione iniziale (riga, colonna).
-        direction (str): La direzione come stringa ('up', 'down', 'left', 'right').
+        direction (int or str): La direzione come codice o come stringa ('up', 'down', 'left', 'right').
+
+    Returns:
+        int: Numero di elementi spostati (0 se il movimento è bloccato).
+    """
+    return push_boxes(grid, start_pos, direction)
+
+
+def build_box_skip_index(grid, box='O'):
+    """
+    Costruisce l'indice delle casse per righe e colonne (un ObstacleIndex delle sole celle box):
+    la memoria è proporzionale al numero di casse, non alla griglia.
+    Con questo indice push_boxes trova la fine di una fila di casse con una ricerca binaria
+    più un passo per cassa della fila (O(log k + fila), con k casse nella riga o colonna);
+    muri e celle libere non sono indicizzati e vengono letti dalla griglia.
+
+    Args:
+        grid (Grid or list of list): La griglia di riferimento.
+        box (str): Il carattere delle casse. Default 'O'.
 
     Returns:
-        list of list: La griglia aggiornata.
+        ObstacleIndex: Indice delle celle che contengono box.
+    """
+    return ObstacleIndex.from_grid(grid, box)
+
+
+def push_boxes(grid, start_pos, direction, skip_index=None, box='O'):
     """
-    rows = len(grid)
-    cols = len(grid[0]) if rows > 0 else 0
+    Spinge di una posizione la fila di casse che inizia in start_pos.
+    Spostare una fila di casse contigue equivale a spostare solo la prima cassa
+    nella cella libera dopo la fila: si trova la prima cella non-cassa oltre la fila
+    e, se è libera ('.'), si scambiano le due celle estreme.
 
+    Args:
+        grid (Grid or list of list): La griglia di elementi.
+        start_pos (tuple): La posizione (r, c) della prima cassa da spingere.
+        direction (int or str): La direzione come codice o come stringa ('up', 'down', 'left', 'right').
+        skip_index (ObstacleIndex, optional): Indice delle casse costruito con
+                                              build_box_skip_index; viene aggiornato in
+                                              modo incrementale (O(k) per spinta). Senza
+                                              indice la fila viene percorsa cella per cella.
+        box (str): Il carattere delle casse. Default 'O'.
+
+    Returns:
+        int: Numero di casse spostate (0 se la fila è bloccata o start_pos non è una cassa).
+    """
     # Determina i delta in base alla direzione
-    if direction == "up":
-        dr, dc = -1, 0
-    elif direction == "left":
-        dr, dc = 0, -1
-    elif direction == "right":
-        dr, dc = 0, 1
-    elif direction == "down":
-        dr, dc = 1, 0
-    else:
+    code = direction_code(direction)
+    if code is None:
         raise ValueError("Direzione non valida. Usa 'up', 'down', 'left' o 'right'.")
+    dr, dc = DIRECTION_DELTAS[code]
 
+    get_cell, set_cell = _cell_accessors(grid)
     r, c = start_pos
 
-    # Trova tutti gli elementi 'O' contigui nella direzione
-    contiguous_positions = []
-    while 0 <= r < rows and 0 <= c < cols and grid[r][c] == 'O':
-        contiguous_positions.append((r, c))
-        r += dr
-        c += dc
-
-    # Verifica se il movimento è possibile (nessun muro e spazio vuoto nella direzione)
-    for r, c in reversed(contiguous_positions):
-        next_r = r + dr
-        next_c = c + dc
-        if not (0 <= next_r < rows and 0 <= next_c < cols) or grid[next_r][next_c] not in ['.', 'O']:
-            # Se si incontra un muro '#' o si esce dalla griglia, il movimento si blocca
+    rows, cols = get_matrix_dimensions(grid)
+    if skip_index is not None:
+        # Prima cella non-cassa dopo la fila di casse che inizia in start_pos
+        end_r, end_c = skip_index.run_end(start_pos, code)
+        if not (0 <= end_r < rows and 0 <= end_c < cols):
+            # La fila arriva fino al bordo della griglia
             return 0
+    else:
+        # Su una griglia paddata il bordo sentinella ferma la scansione: niente controlli sui limiti
+        padded = isinstance(grid, Grid) and grid.sentinel is not None
+        end_r, end_c = r, c
+        if padded:
+            while get_cell(end_r, end_c) == box:
+                end_r += dr
+                end_c += dc
+        else:
+            while 0 <= end_r < rows and 0 <= end_c < cols and get_cell(end_r, end_c) == box:
+                end_r += dr
+                end_c += dc
+            if not (0 <= end_r < rows and 0 <= end_c < cols):
+                return 0
+
+    moved_elements = abs(end_r - r) + abs(end_c - c)
+    if moved_elements == 0 or get_cell(end_r, end_c) != '.':
+        # Se si incontra un muro '#' o il bordo, il movimento si blocca
+        return 0
 
-    moved_elements = 0
-    # Esegui lo spostamento
-    for r, c in reversed(contiguous_positions):
-        next_r = r + dr
-        next_c = c + dc
-        grid[next_r][next_c] = 'O'
-        grid[r][c] = '.'
-        moved_elements += 1
+    # Esegui lo spostamento scambiando le celle estreme della fila
+    set_cell(end_r, end_c, box)
+    set_cell(r, c, '.')
+    if skip_index is not None:
+        skip_index.remove((r, c))
+        skip_index.add((end_r, end_c))
 
     return moved_elements
 
 
-def is_obstacle_in_line_to_position(grid, start_pos, direction, target_pos):
+class ObstacleIndex:
+    """
+    Indice degli ostacoli di una griglia: per ogni riga la lista ordinata delle colonne
+    con un ostacolo e per ogni colonna la lista ordinata delle righe.
+    Il prossimo ostacolo in una direzione si trova con una ricerca binaria (O(log k), con k
+    ostacoli nella riga o colonna) e l'indice si aggiorna in modo incrementale con add/remove.
+    add/remove inseriscono e cancellano in una lista ordinata, quindi costano O(k): le liste
+    sono lunghe al più quanto il lato della griglia e lo spostamento degli elementi è una
+    memmove, più veloce di un albero bilanciato per queste dimensioni.
+
+    Attributes:
+        rows (dict): riga -> lista ordinata delle colonne con un ostacolo.
+        cols (dict): colonna -> lista ordinata delle righe con un ostacolo.
+    """
+    __slots__ = ('rows', 'cols')
+
+    def __init__(self, obstacles=()):
+        self.rows = {}
+        self.cols = {}
+        for r, c in obstacles:
+            self.rows.setdefault(r, []).append(c)
+            self.cols.setdefault(c, []).append(r)
+        for line in self.rows.values():
+            line.sort()
+        for line in self.cols.values():
+            line.sort()
+
+    @classmethod
+    def from_grid(cls, grid, chars='#'):
+        """
+        Costruisce l'indice a partire dalle celle della griglia che contengono uno dei caratteri.
+
+        Args:
+            grid (Grid or list of list): La griglia di riferimento.
+            chars (str or list): I caratteri da considerare ostacoli. Default '#'.
+
+        Returns:
+            ObstacleIndex: L'indice costruito.
+        """
+        return cls(find_all_chars_in_grid(grid, chars))
+
+    def __contains__(self, pos):
+        r, c = pos
+        line = self.rows.get(r)
+        if not line:
+            return False
+        i = bisect_left(line, c)
+        return i < len(line) and line[i] == c
+
+    def add(self, pos):
+        """Aggiunge un ostacolo in pos (se non è già presente). Costo O(k) per l'inserimento ordinato."""
+        if pos in self:
+            return
+        r, c = pos
+        insort(self.rows.setdefault(r, []), c)
+        insort(self.cols.setdefault(c, []), r)
+
+    def remove(self, pos):
+        """Rimuove l'ostacolo in pos (se presente). Costo O(k) per la cancellazione dalla lista."""
+        if pos not in self:
+            return
+        r, c = pos
+        line = self.rows[r]
+        del line[bisect_left(line, c)]
+        line = self.cols[c]
+        del line[bisect_left(line, r)]
+
+    def run_end(self, pos, direction):
+        """
+        Restituisce la prima cella non indicizzata che si incontra partendo da pos (inclusa)
+        e muovendosi nella direzione indicata, cioè la cella dopo la fila contigua di
+        ostacoli che inizia in pos (pos stessa se non è un ostacolo).
+        Costo O(log k) per la ricerca più un passo per ostacolo della fila.
+
+        Args:
+            pos (tuple): (r, c) posizione di partenza.
+            direction (int or str): Codice della direzione oppure nome tra 'up', 'down', 'left', 'right'.
+
+        Returns:
+            tuple: La posizione (r, c) della cella, anche fuori dalla griglia.
+        """
+        r, c = pos
+        code = direction_code(direction)
+        if code == RIGHT or code == LEFT:
+            line, value = self.rows.get(r), c
+        elif code == DOWN or code == UP:
+            line, value = self.cols.get(c), r
+        else:
+            raise ValueError("Direzione non valida. Usa 'up', 'down', 'left' o 'right'.")
+
+        if line:
+            step = 1 if code == RIGHT or code == DOWN else -1
+            i = bisect_left(line, value)
+            # Nella lista ordinata la fila contigua occupa posizioni consecutive
+            while 0 <= i < len(line) and line[i] == value:
+                value += step
+                i += step
+        return (r, value) if code == RIGHT or code == LEFT else (value, c)
+
+    def next_obstacle(self, pos, direction):
+        """
+        Restituisce il primo ostacolo che si incontra partendo da pos (esclusa)
+        e muovendosi nella direzione indicata.
+
+        Args:
+            pos (tuple): (r, c) posizione di partenza.
+            direction (int or str): Codice della direzione oppure nome tra 'up', 'down', 'left', 'right'.
+
+        Returns:
+            tuple or None: La posizione (r, c) dell'ostacolo, oppure None se la linea è libera.
+        """
+        r, c = pos
+        code = direction_code(direction)
+        if code == RIGHT or code == LEFT:
+            line = self.rows.get(r)
+            if not line:
+                return None
+            if code == RIGHT:
+                i = bisect_right(line, c)
+                return (r, line[i]) if i < len(line) else None
+            i = bisect_left(line, c) - 1
+            return (r, line[i]) if i >= 0 else None
+        if code == DOWN or code == UP:
+            line = self.cols.get(c)
+            if not line:
+                return None
+            if code == DOWN:
+                i = bisect_right(line, r)
+                return (line[i], c) if i < len(line) else None
+            i = bisect_left(line, r) - 1
+            return (line[i], c) if i >= 0 else None
+        raise ValueError("Direzione non valida. Usa 'up', 'down', 'left' o 'right'.")
+
+
+def is_obstacle_in_line_to_position(grid, start_pos, direction, target_pos, obstacle_index=None):
     """
     Verifica se, nella linea retta a partire da start_pos nella direzione indicata,
     c'è un ostacolo 'O' prima di raggiungere target_pos.
@@ -206,55 +1488,73 @@ def is_obstacle_in_line_to_position(grid, start_pos, direction, target_pos):
     Args:
         grid (list of list of str): Griglia di caratteri.
         start_pos (tuple): (r, c) posizione di partenza.
-        direction (str): Direzione tra '^', 'v', '<', '>'.
+        direction (int or str): Codice della direzione oppure nome tra 'up', 'down', 'left', 'right'.
         target_pos (tuple): (r, c) posizione obiettivo.
+        obstacle_index (ObstacleIndex, optional): Indice dei muri '#'. Se indicato, la linea
+                                                  non viene percorsa cella per cella ma si
+                                                  cerca il prossimo muro con una ricerca binaria.
 
     Returns:
         bool: True se c'è un ostacolo '#' prima di raggiungere target_pos, False altrimenti.
     """
-    rows = len(grid)
+    rows, cols = get_matrix_dimensions(grid)
     if rows == 0:
         return False
-    cols = len(grid[0])
+    get_cell, _ = _cell_accessors(grid)
 
     r_start, c_start = start_pos
     r_target, c_target = target_pos
+    sentinel = grid.sentinel if isinstance(grid, Grid) else None
 
-    if r_target > rows-1 or c_target > cols-1 or r_target < 0 or c_target < 0:
+    if sentinel is not None:
+        if get_cell(r_target, c_target) == sentinel:
+            return True
+    elif r_target > rows-1 or c_target > cols-1 or r_target < 0 or c_target < 0:
         return True
-    if grid[r_target][c_target] == 'O':
+    if get_cell(r_target, c_target) == 'O':
         return True
 
     # Determina delta r, c e controlla l'allineamento del target nella direzione scelta
-    if direction == 'up':
-        if c_target != c_start or r_target >= r_start:
-            return False
-        dr, dc = -1, 0
-    elif direction == 'down':
-        if c_target != c_start or r_target <= r_start:
-            return False
-        dr, dc = 1, 0
-    elif direction == 'left':
-        if r_target != r_start or c_target >= c_start:
-            return False
-        dr, dc = 0, -1
-    elif direction == 'right':
-        if r_target != r_start or c_target <= c_start:
-            return False
-        dr, dc = 0, 1
-    else:
+    code = direction_code(direction)
+    if code is None:
         # Direzione non valida
         return False
+    dr, dc = DIRECTION_DELTAS[code]
+    if dr:
+        if c_target != c_start or (r_target - r_start) * dr <= 0:
+            return False
+    elif r_target != r_start or (c_target - c_start) * dc <= 0:
+        return False
+
+    if obstacle_index is not None:
+        # Il muro blocca solo se si trova strettamente prima del target
+        hit = obstacle_index.next_obstacle(start_pos, code)
+        if hit is None:
+            return False
+        return (hit[0] - r_target) * dr + (hit[1] - c_target) * dc < 0
 
     # Spostati lungo la linea dalla cella successiva a start_pos fino alla target_pos
     current_r = r_start + dr
     current_c = c_start + dc
 
+    if sentinel is not None:
+        # Griglia paddata: ci si ferma sul bordo sentinella invece di controllare i limiti
+        while True:
+            if current_r == r_target and current_c == c_target:
+                return False
+            cell = get_cell(current_r, current_c)
+            if cell == '#':
+                return True
+            if cell == sentinel:
+                return False
+            current_r += dr
+            current_c += dc
+
     while 0 <= current_r < rows and 0 <= current_c < cols:
         if (current_r, current_c) == (r_target, c_target):
             # Raggiunto il target senza ostacoli
             return False
-        if grid[current_r][current_c] == '#':
+        if get_cell(current_r, current_c) == '#':
             # Ostacolo incontrato prima del target
             return True
 
@@ -0,0 +1,217 @@
+"""
+Strumentazione leggera delle soluzioni: tempo reale, tempo CPU e picco di memoria
+(tracemalloc) per fasi con nome (parse, part1, part2, render...), contatori per fase
+(passi simulati, istruzioni eseguite, hit/miss delle cache) e dump cProfile di una fase.
+
+Quando la strumentazione è disattivata phase() e count() non fanno nulla, quindi possono
+restare nel codice delle soluzioni.
+
+Esempio:
+    enable(cprofile_phase='part2')
+    with phase('part2'):
+        ...
+        count('steps', steps)
+    print(format_report())
+"""
+import cProfile
+import os
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+# Variabile d'ambiente che attiva la strumentazione all'avvio ('1', 'true' o il nome di una fase da profilare)
+PROFILE_ENV = 'AOC_PROFILE'
+DEFAULT_PROFILE_DIR = 'profiles'
+
+_enabled = False
+_track_memory = True
+_cprofile_phase = None
+_cprofile_dir = DEFAULT_PROFILE_DIR
+
+# Statistiche per fase: {nome: {'calls', 'wall', 'cpu', 'peak', 'counters'}}
+_phases = OrderedDict()
+# Fasi aperte (la più interna in fondo): i contatori vanno alla fase corrente
+_stack = []
+# Contatori registrati fuori da ogni fase
+_global_counters = Counter()
+
+
+def enable(enabled=True, memory=True, cprofile_phase=None, cprofile_dir=DEFAULT_PROFILE_DIR):
+    """
+    Attiva o disattiva la strumentazione.
+
+    Args:
+        enabled (bool): Se True le fasi e i contatori vengono registrati.
+        memory (bool): Se True misura il picco di memoria con tracemalloc (rallenta l'esecuzione).
+        cprofile_phase (str, optional): Nome della fase di cui salvare le statistiche cProfile.
+        cprofile_dir (str): Directory in cui salvare i file .prof.
+    """
+    global _enabled, _track_memory, _cprofile_phase, _cprofile_dir
+    _enabled = enabled
+    _track_memory = memory
+    _cprofile_phase = cprofile_phase
+    _cprofile_dir = cprofile_dir
+
+
+def is_enabled():
+    """Restituisce True se la strumentazione è attiva."""
+    return _enabled
+
+
+def reset():
+    """Azzera le statistiche raccolte finora."""
+    _phases.clear()
+    _stack.clear()
+    _global_counters.clear()
+
+
+def count(name, amount=1):
+    """
+    Incrementa un contatore della fase corrente (o globale se non c'è una fase aperta).
+    Nei cicli caldi conviene accumulare in una variabile locale e chiamare count una volta sola.
+
+    Args:
+        name (str): Il nome del contatore (es. 'steps', 'cache_hits').
+        amount (int): L'incremento.
+    """
+    if not _enabled:
+        return
+    counters = _stack[-1]['counters'] if _stack else _global_counters
+    counters[name] += amount
+
+
+def _phase_stats(name):
+    stats = _phases.get(name)
+    if stats is None:
+        stats = {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'peak': 0, 'counters': Counter()}
+        _phases[name] = stats
+    return stats
+
+
+@contextmanager
+def phase(name):
+    """
+    Misura il blocco come fase con nome: tempo reale, tempo CPU, picco di memoria allocata
+    durante la fase e contatori. Più esecuzioni della stessa fase si sommano.
+
+    Args:
+        name (str): Il nome della fase (es. 'parse', 'part1', 'render').
+    """
+    if not _enabled:
+        yield
+        return
+
+    stats = _phase_stats(name)
+    # Per ogni fase aperta si tiene il picco assoluto osservato: tracemalloc ha un solo picco
+    # globale, che viene azzerato a ogni fase interna
+    frame = {'counters': Counter(), 'peak': 0}
+
+    started_tracing = False
+    memory_start = 0
+    if _track_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        memory_start, peak_so_far = tracemalloc.get_traced_memory()
+        if _stack:
+            _stack[-1]['peak'] = max(_stack[-1]['peak'], peak_so_far)
+        tracemalloc.reset_peak()
+    _stack.append(frame)
+
+    profiler = None
+    if name == _cprofile_phase:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(_cprofile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(_cprofile_dir, f"{name}.prof"))
+
+        _stack.pop()
+        peak = 0
+        if _track_memory:
+            absolute_peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            peak = max(0, absolute_peak - memory_start)
+            if _stack:
+                _stack[-1]['peak'] = max(_stack[-1]['peak'], absolute_peak)
+            if started_tracing:
+                tracemalloc.stop()
+
+        stats['calls'] += 1
+        stats['wall'] += wall
+        stats['cpu'] += cpu
+        stats['peak'] = max(stats['peak'], peak)
+        stats['counters'].update(frame['counters'])
+
+
+def profiled(name=None):
+    """
+    Decoratore che misura ogni chiamata della funzione come fase.
+
+    Args:
+        name (str, optional): Il nome della fase. Default: il nome della funzione.
+    """
+    def decorator(function):
+        phase_name = name or function.__name__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(phase_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def report():
+    """
+    Restituisce le statistiche raccolte.
+
+    Returns:
+        dict: {'phases': {nome: {'calls', 'wall', 'cpu', 'peak', 'counters'}}, 'counters': {...}}.
+    """
+    phases = OrderedDict()
+    for name, stats in _phases.items():
+        phases[name] = dict(stats, counters=dict(stats['counters']))
+    return {'phases': phases, 'counters': dict(_global_counters)}
+
+
+def format_report(data=None):
+    """Formatta le statistiche (di report() o quelle correnti) una fase per riga."""
+    data = report() if data is None else data
+    lines = []
+    for name, stats in data['phases'].items():
+        line = (f"  {name:<8} wall {stats['wall'] * 1000:.1f}ms  cpu {stats['cpu'] * 1000:.1f}ms"
+                f"  peak {stats['peak'] / 1024:.1f}KiB")
+        if stats['calls'] > 1:
+            line += f"  calls {stats['calls']}"
+        if stats['counters']:
+            line += '  ' + ' '.join(f"{key}={value}" for key, value in sorted(stats['counters'].items()))
+        lines.append(line)
+    if data['counters']:
+        lines.append('  ' + ' '.join(f"{key}={value}" for key, value in sorted(data['counters'].items())))
+    return '\n'.join(lines)
+
+
+def _initial_state():
+    """Legge lo stato iniziale dalla variabile d'ambiente (valore di AOC_PROFILE)."""
+    value = os.environ.get(PROFILE_ENV, '').strip()
+    if not value or value.lower() in ('0', 'false', 'no'):
+        return
+    # Un valore diverso da un booleano è il nome della fase da profilare con cProfile
+    enable(cprofile_phase=None if value.lower() in ('1', 'true', 'yes') else value)
+
+
+_initial_state()
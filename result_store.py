@@ -0,0 +1,97 @@
+"""
+Archivio persistente delle risposte (sqlite), con chiave (giorno, parte, hash dell'input,
+hash della soluzione). Una risposta resta valida finché non cambiano né l'input né il
+codice della soluzione: l'hash della soluzione (vedi file_utils.solver_hash) copre il
+sorgente di exerciseNN.py e dei moduli del repository da cui dipende, anche indirettamente
+(matrix_utils, string_utils, ...).
+"""
+import json
+import os
+import sqlite3
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE_PATH = os.path.join(REPO_DIR, '.cache', 'results.sqlite')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    day INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    input_hash TEXT NOT NULL,
+    solver_hash TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    seconds REAL,
+    created REAL NOT NULL,
+    PRIMARY KEY (day, part, input_hash, solver_hash)
+)
+"""
+
+
+class ResultStore:
+    """
+    Archivio delle risposte su un file sqlite. Le risposte sono salvate in JSON, quindi
+    devono essere int, str o None.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        """
+        Args:
+            path (str): Il percorso del file sqlite (viene creato se non esiste).
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(_SCHEMA)
+        self.connection.commit()
+
+    def get(self, day, part, input_hash, solver_hash):
+        """
+        Cerca una risposta.
+
+        Returns:
+            tuple: (True, risposta, secondi del calcolo originale) se presente, altrimenti (False, None, None).
+        """
+        row = self.connection.execute(
+            "SELECT answer, seconds FROM results WHERE day = ? AND part = ? AND input_hash = ? AND solver_hash = ?",
+            (day, part, input_hash, solver_hash)).fetchone()
+        if row is None:
+            return False, None, None
+        return True, json.loads(row[0]), row[1]
+
+    def put(self, day, part, input_hash, solver_hash, answer, seconds=None):
+        """Salva (o sostituisce) una risposta con il tempo impiegato a calcolarla."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (day, part, input_hash, solver_hash, answer, seconds, created) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (day, part, input_hash, solver_hash, json.dumps(answer), seconds, time.time()))
+        self.connection.commit()
+
+    def last_seconds(self, day, part):
+        """
+        Restituisce il tempo dell'ultimo calcolo registrato per giorno e parte, con qualsiasi
+        input e versione del codice: serve come stima della durata per lo scheduler.
+
+        Returns:
+            float or None: I secondi, None se non c'è uno storico.
+        """
+        row = self.connection.execute(
+            "SELECT seconds FROM results WHERE day = ? AND part = ? AND seconds IS NOT NULL "
+            "ORDER BY created DESC LIMIT 1", (day, part)).fetchone()
+        return row[0] if row else None
+
+    def clear(self, day=None):
+        """Cancella tutte le risposte, o solo quelle del giorno indicato."""
+        if day is None:
+            self.connection.execute("DELETE FROM results")
+        else:
+            self.connection.execute("DELETE FROM results WHERE day = ?", (day,))
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
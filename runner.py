@@ -0,0 +1,258 @@
+"""
+Esegue le soluzioni di uno o più giorni nello stesso interprete.
+
+Ogni exerciseNN.py espone parse(data), part1(parsed) e part2(parsed); il runner importa
+i moduli, legge l'input e stampa le risposte con i tempi di ogni fase.
+Le risposte vengono salvate in .cache/results.sqlite (vedi result_store): se l'input e il
+codice della soluzione non sono cambiati la risposta viene presa dall'archivio.
+
+Esempi:
+    python -m runner 6            # un solo giorno
+    python -m runner 1-10         # un intervallo
+    python -m runner 1,3,5-7      # un elenco
+    python -m runner all          # tutti i giorni disponibili
+    python -m runner 15 --input test2.txt -v
+    python -m runner 6 --profile --cprofile part2   # statistiche per fase e dump cProfile
+    python -m runner 6 --refresh  # ricalcola ignorando le risposte salvate
+    python -m runner 6 --refresh --resume   # riprende le ricerche lunghe dai checkpoint
+"""
+import argparse
+import importlib
+import os
+import re
+import sys
+import time
+
+import checkpoint_utils
+import log_utils
+import profile_utils
+import search_utils
+from file_utils import file_content_hash, read_file_to_string, solver_hash
+from result_store import ResultStore
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+INPUTS_DIR = os.path.join(REPO_DIR, 'inputs')
+DEFAULT_INPUT = 'input.txt'
+PROFILES_DIR = os.path.join(REPO_DIR, 'profiles')
+
+_EXERCISE_PATTERN = re.compile(r'^exercise(\d{2})\.py$')
+
+
+def available_days():
+    """
+    Restituisce i giorni per cui esiste un modulo exerciseNN.py.
+
+    Returns:
+        list: I numeri dei giorni, in ordine crescente.
+    """
+    days = []
+    for name in os.listdir(REPO_DIR):
+        match = _EXERCISE_PATTERN.match(name)
+        if match:
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def parse_days(spec, days=None):
+    """
+    Converte una specifica di giorni ('6', '1-10', '1,3,5-7', 'all') nella lista dei giorni.
+
+    Args:
+        spec (str): La specifica.
+        days (list, optional): I giorni disponibili. Default: available_days().
+
+    Returns:
+        list: I giorni selezionati e disponibili, in ordine crescente.
+
+    Raises:
+        ValueError: Se la specifica non è valida.
+    """
+    days = available_days() if days is None else days
+    if spec.strip().lower() == 'all':
+        return list(days)
+
+    selected = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                first, last = part.split('-', 1)
+                selected.update(range(int(first), int(last) + 1))
+            else:
+                selected.add(int(part))
+        except ValueError:
+            raise ValueError(f"Specifica dei giorni non valida: {spec}") from None
+    return [day for day in days if day in selected]
+
+
+def input_path(day, name=DEFAULT_INPUT):
+    """Restituisce il percorso del file di input del giorno (inputs/NN/<name>)."""
+    if os.path.isabs(name):
+        return name
+    return os.path.join(INPUTS_DIR, f"{day:02d}", name)
+
+
+def load_solver(day):
+    """
+    Importa il modulo della soluzione del giorno.
+
+    Args:
+        day (int): Il giorno.
+
+    Returns:
+        module: Il modulo exerciseNN.
+    """
+    return importlib.import_module(f"exercise{day:02d}")
+
+
+def run_day(day, name=DEFAULT_INPUT, parts=(1, 2), store=None, refresh=False):
+    """
+    Esegue parse e le parti richieste di un giorno, misurando il tempo di ogni fase.
+
+    Args:
+        day (int): Il giorno.
+        name (str): Il nome del file di input in inputs/NN (o un percorso assoluto).
+        parts (tuple): Le parti da eseguire.
+        store (ResultStore, optional): Archivio delle risposte: le parti già risolte con lo stesso
+                                       input e lo stesso codice non vengono ricalcolate.
+        refresh (bool): Se True ricalcola tutte le parti e aggiorna l'archivio.
+
+    Returns:
+        dict: {'day', 'input', 'answers': {parte: risposta}, 'timings': {fase: secondi},
+               'cached': parti prese dall'archivio,
+               'partial': {parte: motivo} per le parti la cui ricerca è stata fermata prima della fine}.
+
+    Raises:
+        FileNotFoundError: Se il file di input non esiste.
+    """
+    path = input_path(day, name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Il file '{path}' non esiste.")
+
+    solver = load_solver(day)
+    timings = {}
+    answers = {}
+    cached = []
+    partial = {}
+
+    if store is not None:
+        keys = (file_content_hash(path), solver_hash(solver))
+        if not refresh:
+            for part in parts:
+                found, answer, _ = store.get(day, part, *keys)
+                if found:
+                    answers[part] = answer
+                    cached.append(part)
+        parts = [part for part in parts if part not in cached]
+        if not parts:
+            # Tutte le risposte sono nell'archivio: non serve nemmeno leggere l'input
+            return {'day': day, 'input': path, 'answers': answers, 'timings': timings, 'cached': cached,
+                    'partial': partial}
+
+    with profile_utils.phase('parse'):
+        start = time.perf_counter()
+        parsed = solver.parse(read_file_to_string(path))
+        timings['parse'] = time.perf_counter() - start
+
+    for part in parts:
+        solve = getattr(solver, f"part{part}")
+        search_utils.reset_stopped()
+        with profile_utils.phase(f"part{part}"):
+            start = time.perf_counter()
+            answers[part] = solve(parsed)
+            timings[f"part{part}"] = time.perf_counter() - start
+
+        stopped = search_utils.stopped_searches()
+        if stopped:
+            # Risposta parziale di una ricerca fermata: non va salvata come definitiva
+            partial[part] = stopped[0].stop_reason
+        elif store is not None:
+            store.put(day, part, *keys, answers[part], timings[f"part{part}"])
+
+    answers = {part: answers[part] for part in sorted(answers)}
+    return {'day': day, 'input': path, 'answers': answers, 'timings': timings, 'cached': cached,
+            'partial': partial}
+
+
+def format_result(result):
+    """Formatta il risultato di run_day su una riga."""
+    cached = result.get('cached', ())
+    partial = result.get('partial', {})
+
+    def label(part):
+        if part in cached:
+            return " (cache)"
+        if part in partial:
+            return f" (parziale: {partial[part]})"
+        return ""
+
+    answers = '  '.join(f"part{part}: {answer}{label(part)}" for part, answer in result['answers'].items())
+    timings = ' '.join(f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in result['timings'].items())
+    line = f"day {result['day']:02d}  {answers}"
+    return f"{line}  [{timings}]" if timings else line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m runner',
+                                     description="Esegue le soluzioni dell'Advent of Code in un solo processo.")
+    parser.add_argument('days', nargs='?', default='all', help="giorni da eseguire: 6, 1-10, 1,3,5-7 o all")
+    parser.add_argument('--input', default=DEFAULT_INPUT, help="file di input in inputs/NN (default input.txt)")
+    parser.add_argument('--part', type=int, choices=(1, 2), help="esegue solo la parte indicata")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="mostra i messaggi delle soluzioni (-v info, -vv debug, -vvv trace)")
+    parser.add_argument('--profile', action='store_true',
+                        help="stampa tempo CPU, picco di memoria e contatori di ogni fase")
+    parser.add_argument('--cprofile', metavar='PHASE',
+                        help="salva le statistiche cProfile della fase indicata in profiles/NN/PHASE.prof")
+    parser.add_argument('--resume', action='store_true',
+                        help="le ricerche lunghe riprendono dall'ultimo checkpoint salvato")
+    parser.add_argument('--search-timeout', type=float, metavar='SECONDS',
+                        help="tempo massimo delle ricerche aperte (giorni 14 e 17): poi restituiscono la risposta parziale")
+    parser.add_argument('--no-cache', action='store_true', help="non usa l'archivio delle risposte")
+    parser.add_argument('--refresh', action='store_true', help="ricalcola le risposte e aggiorna l'archivio")
+    args = parser.parse_args(argv)
+
+    # Di default il runner mostra solo le risposte
+    log_utils.set_verbosity(args.verbose)
+    if args.resume:
+        checkpoint_utils.set_resume(True)
+    if args.search_timeout:
+        search_utils.set_default_timeout(args.search_timeout)
+
+    try:
+        days = parse_days(args.days)
+    except ValueError as e:
+        parser.error(str(e))
+    parts = (args.part,) if args.part else (1, 2)
+
+    store = None if args.no_cache else ResultStore()
+
+    failures = 0
+    for day in days:
+        if args.profile or args.cprofile:
+            profile_utils.reset()
+            profile_utils.enable(cprofile_phase=args.cprofile,
+                                 cprofile_dir=os.path.join(PROFILES_DIR, f"{day:02d}"))
+        try:
+            result = run_day(day, args.input, parts, store, args.refresh)
+        except FileNotFoundError as e:
+            print(f"day {day:02d}  saltato: {e}")
+            continue
+        except Exception as e:
+            failures += 1
+            print(f"day {day:02d}  errore: {type(e).__name__}: {e}")
+            continue
+        print(format_result(result))
+        if profile_utils.is_enabled():
+            print(profile_utils.format_report())
+        sys.stdout.flush()
+
+    if store is not None:
+        store.close()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
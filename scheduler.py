@@ -0,0 +1,214 @@
+"""
+Esegue giorni e parti in parallelo su un pool di processi e stampa una tabella riassuntiva
+con risposte, tempo reale, tempo CPU e picco di memoria di ogni giorno.
+
+Ogni coppia (giorno, parte) è un job separato, eseguito in un processo nuovo (così tempo CPU e
+picco di memoria sono quelli del solo job). I job partono dal più lungo, secondo i tempi
+registrati nell'archivio delle risposte (result_store): i job senza storico partono per primi.
+
+Esempi:
+    python -m scheduler all --workers 8 --timeout 600
+    python -m scheduler 1-10 --input test.txt
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import resource
+except ImportError:
+    # resource esiste solo su Unix: senza, il picco di memoria non viene misurato
+    resource = None
+
+import log_utils
+from file_utils import file_content_hash, solver_hash
+from result_store import ResultStore
+from runner import DEFAULT_INPUT, available_days, input_path, load_solver, parse_days, run_day
+from search_utils import TimeLimitExceeded, time_limit
+
+DEFAULT_TIMEOUT = 600.0
+
+# max_tasks_per_child esiste solo da Python 3.11: sulle versioni precedenti i processi del pool
+# vengono riusati, quindi il picco di memoria di un job può includere quello dei job precedenti
+# eseguiti nello stesso processo (il tempo CPU resta per job, è una differenza)
+_POOL_OPTIONS = {'max_tasks_per_child': 1} if sys.version_info >= (3, 11) else {}
+
+
+def _peak_memory():
+    """Picco di memoria residente del processo corrente in byte (None se non disponibile)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Su macOS ru_maxrss è in byte, su Linux in KiB
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_job(day, part, path, timeout=DEFAULT_TIMEOUT):
+    """
+    Esegue una parte di un giorno (parse compreso) e ne misura i tempi. Viene chiamata in un
+    processo del pool.
+
+    Args:
+        day (int): Il giorno.
+        part (int): La parte.
+        path (str): Il percorso dell'input.
+        timeout (float): Tempo massimo del job in secondi (0 o None per nessun limite).
+
+    Returns:
+        dict: {'day', 'part', 'status' ('ok', 'partial', 'timeout' o 'error'), 'answer', 'seconds',
+               'wall', 'cpu', 'peak'}. 'partial' indica una ricerca fermata prima della fine.
+    """
+    log_utils.set_verbosity(log_utils.QUIET)
+    job = {'day': day, 'part': part, 'status': 'ok', 'answer': None, 'seconds': None}
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with time_limit(timeout):
+            result = run_day(day, path, (part,))
+        job['answer'] = result['answers'][part]
+        job['seconds'] = result['timings'][f"part{part}"]
+        if part in result['partial']:
+            job['status'] = 'partial'
+    except TimeLimitExceeded:
+        job['status'] = 'timeout'
+    except Exception as e:
+        job['status'] = 'error'
+        job['answer'] = f"{type(e).__name__}: {e}"
+
+    job['wall'] = time.perf_counter() - wall_start
+    job['cpu'] = time.process_time() - cpu_start
+    job['peak'] = _peak_memory()
+    return job
+
+
+def plan_jobs(days, parts, name=DEFAULT_INPUT, store=None):
+    """
+    Prepara i job e li ordina dal più lungo al più breve secondo lo storico dell'archivio.
+
+    Args:
+        days (list): I giorni.
+        parts (tuple): Le parti.
+        name (str): Il nome del file di input in inputs/NN.
+        store (ResultStore, optional): L'archivio con i tempi storici.
+
+    Returns:
+        list: Tuple (giorno, parte, percorso, secondi stimati o None), in ordine di esecuzione.
+    """
+    jobs = []
+    for day in days:
+        path = input_path(day, name)
+        if not os.path.exists(path):
+            continue
+        for part in parts:
+            estimate = store.last_seconds(day, part) if store is not None else None
+            jobs.append((day, part, path, estimate))
+
+    # Prima i job senza storico (potrebbero essere lunghi), poi dal più lento al più veloce
+    jobs.sort(key=lambda job: (job[3] is not None, -(job[3] or 0)))
+    return jobs
+
+
+def run_jobs(jobs, workers=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Esegue i job sul pool di processi, nell'ordine dato.
+
+    Args:
+        jobs (list): I job di plan_jobs.
+        workers (int, optional): Numero di processi. Default: numero di CPU.
+        timeout (float): Tempo massimo per job in secondi.
+
+    Yields:
+        dict: I risultati di run_job, man mano che i job terminano.
+    """
+    # Un processo nuovo per ogni job: tempo CPU e picco di memoria non si sommano tra job diversi
+    # (vedi _POOL_OPTIONS per Python < 3.11)
+    with ProcessPoolExecutor(max_workers=workers, **_POOL_OPTIONS) as executor:
+        futures = [executor.submit(run_job, day, part, path, timeout) for day, part, path, _ in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def format_table(results, parts):
+    """
+    Aggrega i risultati per giorno in una tabella: risposte, somma dei tempi reali e CPU dei
+    job del giorno e picco di memoria massimo.
+    """
+    by_day = {}
+    for job in results:
+        by_day.setdefault(job['day'], {})[job['part']] = job
+
+    header = f"{'day':<4}" + ''.join(f"{f'part{part}':<20}" for part in parts) + \
+             f"{'wall':>10}{'cpu':>10}{'peak':>10}"
+    lines = [header, '-' * len(header)]
+    for day in sorted(by_day):
+        jobs = by_day[day]
+        answers = ''
+        for part in parts:
+            job = jobs.get(part)
+            if job is None:
+                text = ''
+            elif job['status'] == 'ok':
+                text = str(job['answer'])
+            elif job['status'] == 'partial':
+                text = f"{job['answer']} (parziale)"
+            else:
+                text = job['status']
+            answers += f"{text[:19]:<20}"
+        wall = sum(job['wall'] for job in jobs.values())
+        cpu = sum(job['cpu'] for job in jobs.values())
+        peaks = [job['peak'] for job in jobs.values() if job['peak'] is not None]
+        peak = f"{max(peaks) / (1 << 20):.0f}MiB" if peaks else '-'
+        lines.append(f"{day:02d}  {answers}{wall:>9.2f}s{cpu:>9.2f}s{peak:>10}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler',
+                                     description="Esegue giorni e parti in parallelo su un pool di processi.")
+    parser.add_argument('days', nargs='?', default='all', help="giorni da eseguire: 6, 1-10, 1,3,5-7 o all")
+    parser.add_argument('--input', default=DEFAULT_INPUT, help="file di input in inputs/NN (default input.txt)")
+    parser.add_argument('--part', type=int, choices=(1, 2), help="esegue solo la parte indicata")
+    parser.add_argument('--workers', type=int, default=None, help="processi del pool (default: numero di CPU)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="secondi massimi per job")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="non usa l'archivio delle risposte per lo storico dei tempi")
+    args = parser.parse_args(argv)
+
+    try:
+        days = parse_days(args.days, available_days())
+    except ValueError as e:
+        parser.error(str(e))
+    parts = (args.part,) if args.part else (1, 2)
+
+    store = None if args.no_cache else ResultStore()
+    jobs = plan_jobs(days, parts, args.input, store)
+
+    start = time.perf_counter()
+    results = []
+    for job in run_jobs(jobs, args.workers, args.timeout):
+        results.append(job)
+        print(f"day {job['day']:02d} part{job['part']}  {job['status']}  {job['wall']:.2f}s")
+        sys.stdout.flush()
+
+        if store is not None and job['status'] == 'ok':
+            # I tempi aggiornano lo storico usato per ordinare le prossime esecuzioni
+            path = input_path(job['day'], args.input)
+            store.put(job['day'], job['part'], file_content_hash(path), solver_hash(load_solver(job['day'])),
+                      job['answer'], job['seconds'])
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(format_table(results, parts))
+    total = sum(job['wall'] for job in results)
+    print(f"\ntempo totale {elapsed:.2f}s (somma dei job {total:.2f}s)")
+
+    if store is not None:
+        store.close()
+    return 1 if any(job['status'] not in ('ok', 'partial') for job in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
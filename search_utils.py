@@ -0,0 +1,208 @@
+"""
+Controllo delle ricerche aperte (cicli senza limite superiore): tempo massimo o numero
+massimo di candidati, cancellazione cooperativa (anche da un altro thread) e callback di
+avanzamento con la velocità in candidati al secondo. Quando la ricerca viene fermata
+restituisce la migliore risposta parziale trovata invece di restare bloccata.
+
+Per il codice che non chiama step() c'è time_limit, che interrompe un blocco con un segnale
+(usato da benchmark e scheduler per il tempo massimo di ogni fase o job).
+
+Le ricerche fermate vengono registrate (vedi stopped_searches): chi esegue le soluzioni
+(runner, scheduler, fleet) le usa per non trattare una risposta parziale come definitiva.
+
+Esempio:
+    control = SearchControl(timeout=60)
+    while control.step():
+        ...
+        control.offer(candidato, punteggio)
+    return control.best
+"""
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+from log_utils import info
+
+# Variabile d'ambiente con il tempo massimo di default delle ricerche, in secondi
+SEARCH_TIMEOUT_ENV = 'AOC_SEARCH_TIMEOUT'
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+# Motivi di arresto di una ricerca
+DEADLINE = 'deadline'
+BUDGET = 'budget'
+CANCELLED = 'cancelled'
+
+
+def _initial_timeout():
+    """Legge il tempo massimo di default dalla variabile d'ambiente (None: nessun limite)."""
+    try:
+        return float(os.environ.get(SEARCH_TIMEOUT_ENV, '')) or None
+    except ValueError:
+        return None
+
+
+_default_timeout = _initial_timeout()
+
+# Ricerche fermate prima della fine dall'ultimo reset_stopped()
+_stopped = []
+
+
+def set_default_timeout(seconds):
+    """Imposta il tempo massimo delle ricerche create senza un timeout esplicito (None: nessun limite)."""
+    global _default_timeout
+    _default_timeout = seconds or None
+
+
+def get_default_timeout():
+    """Restituisce il tempo massimo di default delle ricerche."""
+    return _default_timeout
+
+
+def reset_stopped():
+    """Dimentica le ricerche fermate registrate finora (da chiamare prima di eseguire una parte)."""
+    _stopped.clear()
+
+
+def stopped_searches():
+    """
+    Restituisce le ricerche fermate (per tempo, budget o cancellazione) dall'ultimo reset_stopped().
+
+    Returns:
+        list: I SearchControl fermati; se non è vuota la risposta ottenuta è solo parziale.
+    """
+    return list(_stopped)
+
+
+class TimeLimitExceeded(Exception):
+    """Sollevata da time_limit quando il blocco supera il tempo massimo concesso."""
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Interrompe il blocco con TimeLimitExceeded dopo i secondi indicati, anche se il codice non
+    chiama mai SearchControl.step(). Usa SIGALRM, quindi funziona solo su sistemi Unix e nel
+    thread principale; altrove non pone alcun limite.
+
+    Args:
+        seconds (float or None): Il limite di tempo; None o 0 per nessun limite.
+    """
+    if not seconds or not hasattr(signal, 'setitimer'):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise TimeLimitExceeded(f"tempo massimo di {seconds}s superato")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def log_progress(stats):
+    """Callback di avanzamento di default: stampa candidati provati e velocità (livello info)."""
+    info("%s candidates in %.1fs (%.0f/s)", stats['steps'], stats['elapsed'], stats['rate'])
+
+
+class SearchControl:
+    """
+    Stato di controllo di una ricerca: la ricerca chiama step() prima di ogni candidato e si
+    ferma quando restituisce False; offer() registra le risposte parziali con un punteggio.
+    """
+
+    def __init__(self, timeout=None, max_steps=None, progress=log_progress,
+                 progress_interval=DEFAULT_PROGRESS_INTERVAL):
+        """
+        Args:
+            timeout (float, optional): Secondi massimi della ricerca. Default: get_default_timeout().
+            max_steps (int, optional): Numero massimo di candidati da provare.
+            progress (callable, optional): Funzione chiamata periodicamente con stats(); None per nessuna.
+            progress_interval (float): Secondi tra due chiamate di progress.
+        """
+        timeout = get_default_timeout() if timeout is None else timeout
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout if timeout else None
+        self.max_steps = max_steps
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.steps = 0
+        self.stop_reason = None
+        self.best = None
+        self.best_score = None
+        self._cancel_event = threading.Event()
+        self._next_report = self.started + progress_interval
+
+    def cancel(self):
+        """Chiede alla ricerca di fermarsi al prossimo step(); si può chiamare da un altro thread."""
+        self._cancel_event.set()
+
+    @property
+    def stopped(self):
+        return self.stop_reason is not None
+
+    def step(self, count=1):
+        """
+        Annuncia i prossimi count candidati e verifica se la ricerca può continuare.
+
+        Args:
+            count (int): Numero di candidati che la ricerca sta per provare.
+
+        Returns:
+            bool: True se la ricerca può continuare, False se deve fermarsi (vedi stop_reason).
+        """
+        if self.stop_reason is not None:
+            return False
+
+        now = time.monotonic()
+        if self._cancel_event.is_set():
+            self.stop_reason = CANCELLED
+        elif self.deadline is not None and now >= self.deadline:
+            self.stop_reason = DEADLINE
+        elif self.max_steps is not None and self.steps + count > self.max_steps:
+            self.stop_reason = BUDGET
+        else:
+            self.steps += count
+
+        if self.stop_reason is not None:
+            _stopped.append(self)
+
+        if self.progress is not None and (now >= self._next_report or self.stop_reason is not None):
+            self._next_report = now + self.progress_interval
+            self.progress(self.stats())
+
+        return self.stop_reason is None
+
+    def offer(self, candidate, score):
+        """
+        Registra una risposta parziale: viene tenuta quella con il punteggio più alto.
+
+        Args:
+            candidate: La risposta candidata.
+            score (int or float): Il punteggio (più alto è migliore).
+        """
+        if self.best_score is None or score > self.best_score:
+            self.best = candidate
+            self.best_score = score
+
+    def stats(self):
+        """
+        Restituisce le statistiche della ricerca.
+
+        Returns:
+            dict: {'steps', 'elapsed', 'rate' (candidati/s), 'best', 'best_score', 'stop_reason'}.
+        """
+        elapsed = time.monotonic() - self.started
+        return {
+            'steps': self.steps,
+            'elapsed': elapsed,
+            'rate': self.steps / elapsed if elapsed > 0 else 0.0,
+            'best': self.best,
+            'best_score': self.best_score,
+            'stop_reason': self.stop_reason,
+        }
@@ -1,3 +1,15 @@
+import re
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy è opzionale: senza di esso si usano gli array('q') della libreria standard
+    np = None
+
+_SIGNED_INT_PATTERN = re.compile(rb'-?\d+')
+_UNSIGNED_INT_PATTERN = re.compile(rb'\d+')
+
 
 def split_string_by_separator(input_string, separator):
     """
@@ -25,4 +37,201 @@ def string_to_char_list(input_string):
     Returns:
         list: Lista di caratteri.
     """
-    return list(input_string)
\ No newline at end of file
+    return list(input_string)
+
+def _normalize_newlines(chunks):
+    """
+    Converte gli a capo '\r\n' in '\n' in un testo fornito a pezzi, anche quando '\r' e '\n'
+    si trovano in due chunk consecutivi.
+    """
+    carry = ''
+    for chunk in chunks:
+        if carry:
+            chunk = carry + chunk
+            carry = ''
+        if chunk.endswith('\r'):
+            # Il '\n' corrispondente potrebbe essere all'inizio del chunk successivo
+            carry = '\r'
+            chunk = chunk[:-1]
+        if chunk:
+            yield chunk.replace('\r\n', '\n')
+    if carry:
+        yield carry
+
+
+def iter_lines(chunks):
+    """
+    Genera le righe di un testo fornito a pezzi (chunk), senza il carattere di a capo
+    ('\n' o '\r\n'). I pezzi di una riga che attraversa più chunk vengono raccolti in una
+    lista e uniti una sola volta, così una riga lunga non viene ricopiata a ogni chunk.
+
+    Args:
+        chunks (iterable): Iterabile di stringhe consecutive del testo.
+
+    Yields:
+        str: Una riga alla volta.
+    """
+    pending = []
+    for chunk in _normalize_newlines(chunks):
+        end = chunk.find('\n')
+        if end == -1:
+            pending.append(chunk)
+            continue
+        # La prima riga del chunk completa quella rimasta in sospeso
+        pending.append(chunk[:end])
+        yield ''.join(pending)
+        lines = chunk[end + 1:].split('\n')
+        tail = lines.pop()
+        yield from lines
+        pending = [tail] if tail else []
+    if pending:
+        yield ''.join(pending)
+
+
+def iter_blocks(chunks, separator='\n\n'):
+    """
+    Genera i blocchi di un testo fornito a pezzi (chunk), separati da separator
+    (di default una riga vuota, anche con a capo '\r\n'). Un blocco spezzato tra più chunk
+    viene ricomposto unendo i suoi pezzi una sola volta.
+
+    Args:
+        chunks (iterable): Iterabile di stringhe consecutive del testo.
+        separator (str): Il separatore dei blocchi.
+
+    Yields:
+        str: Un blocco alla volta (senza il separatore).
+    """
+    if not separator:
+        raise ValueError("Il separatore non può essere una stringa vuota.")
+
+    # Il separatore può iniziare negli ultimi caratteri già letti: se ne tengono len(separator) - 1
+    overlap = len(separator) - 1
+    pending = []
+    tail = ''
+    for chunk in _normalize_newlines(chunks):
+        blocks = (tail + chunk).split(separator)
+        if len(blocks) == 1:
+            pending.append(chunk)
+            tail = (tail + chunk)[-overlap:] if overlap else ''
+            continue
+        # Il primo blocco è il testo in sospeso (senza la coda, già inclusa in blocks[0])
+        head = ''.join(pending)
+        yield (head[:len(head) - len(tail)] if tail else head) + blocks[0]
+        yield from blocks[1:-1]
+        last = blocks[-1]
+        pending = [last] if last else []
+        tail = last[-overlap:] if overlap else ''
+    remainder = ''.join(pending).strip('\n')
+    if remainder:
+        yield remainder
+
+
+def iter_ints(chunks):
+    """
+    Genera gli interi (anche negativi) separati da spazi bianchi in un testo fornito a pezzi (chunk).
+    Un numero spezzato tra due chunk viene ricomposto.
+
+    Args:
+        chunks (iterable): Iterabile di stringhe consecutive del testo.
+
+    Yields:
+        int: Un intero alla volta.
+    """
+    remainder = ''
+    for chunk in chunks:
+        text = remainder + chunk
+        tokens = text.split()
+        # Se il chunk non termina con uno spazio l'ultimo token potrebbe continuare nel successivo
+        remainder = tokens.pop() if tokens and not text[-1].isspace() else ''
+        for token in tokens:
+            yield int(token)
+    if remainder:
+        yield int(remainder)
+
+
+def _buffer_pieces(buffer):
+    """
+    Restituisce i pezzi (bytes) da analizzare: il buffer stesso oppure, per un iterabile
+    (es. le righe o i blocchi di iter_file_lines e iter_file_blocks), ognuno dei suoi elementi.
+    """
+    if isinstance(buffer, (str, bytes, bytearray, memoryview)):
+        buffer = (buffer,)
+    for piece in buffer:
+        yield piece.encode('utf-8') if isinstance(piece, str) else piece
+
+
+def _int_values(buffer, signed, use_numpy):
+    """
+    Converte gli interi contenuti nel buffer man mano che vengono trovati, senza costruire
+    prima la lista dei token, in un array compatto di interi a 64 bit.
+    """
+    if use_numpy and np is None:
+        raise ImportError("NumPy non è installato: usa use_numpy=False.")
+    pattern = _SIGNED_INT_PATTERN if signed else _UNSIGNED_INT_PATTERN
+    matches = (match for piece in _buffer_pieces(buffer) for match in pattern.finditer(piece))
+    if use_numpy:
+        return np.fromiter((int(match.group()) for match in matches), dtype=np.int64)
+    values = array('q')
+    append = values.append
+    for match in matches:
+        append(int(match.group()))
+    return values
+
+
+def parse_int_columns(buffer, arity=None, signed=True, use_numpy=False):
+    """
+    Estrae in una sola passata tutti gli interi contenuti in un buffer, ignorando
+    qualsiasi testo che li separa (es. 'p=0,4 v=3,-3' -> 0, 4, 3, -3).
+    I valori vengono memorizzati in array compatti invece che in dizionari o liste di int.
+
+    Args:
+        buffer (bytes, str or iterable): Il testo da analizzare, oppure i suoi pezzi (righe o
+                                         blocchi, es. da iter_file_lines) senza numeri spezzati.
+        arity (int, optional): Numero di interi per record. Se indicato i valori vengono
+                               suddivisi in arity colonne (il valore i va nella colonna i % arity).
+        signed (bool): Se True un '-' davanti alle cifre indica un numero negativo,
+                       altrimenti viene trattato come separatore.
+        use_numpy (bool): Se True restituisce ndarray NumPy int64 invece di array('q').
+
+    Returns:
+        array or list: L'array di tutti i valori se arity è None, altrimenti la lista delle colonne.
+    """
+    values = _int_values(buffer, signed, use_numpy)
+    if arity is None:
+        return values
+    if len(values) % arity != 0:
+        raise ValueError(f"Il numero di interi ({len(values)}) non è multiplo dell'arità {arity}.")
+    return [values[column::arity] for column in range(arity)]
+
+
+def parse_int_records(buffer, signed=True, use_numpy=False):
+    """
+    Estrae gli interi di un buffer riga per riga, per record con un numero variabile di valori
+    (es. 'risultato: a b c'). I valori sono memorizzati in un unico array piatto e i record
+    sono individuati da un array di offset: il record i è values[offsets[i]:offsets[i + 1]].
+    Le righe senza interi vengono ignorate.
+
+    Args:
+        buffer (bytes, str or iterable): Il testo da analizzare, oppure le sue righe (es. da iter_file_lines).
+        signed (bool): Se True un '-' davanti alle cifre indica un numero negativo.
+        use_numpy (bool): Se True restituisce ndarray NumPy int64 invece di array('q').
+
+    Returns:
+        tuple: (values, offsets), con offsets lungo numero di record + 1.
+    """
+    if use_numpy and np is None:
+        raise ImportError("NumPy non è installato: usa use_numpy=False.")
+    pattern = _SIGNED_INT_PATTERN if signed else _UNSIGNED_INT_PATTERN
+    values = array('q')
+    append = values.append
+    offsets = array('q', [0])
+    for piece in _buffer_pieces(buffer):
+        for line in bytes(piece).splitlines():
+            for match in pattern.finditer(line):
+                append(int(match.group()))
+            if len(values) != offsets[-1]:
+                offsets.append(len(values))
+    if use_numpy:
+        values = np.frombuffer(values, dtype=np.int64)
+        offsets = np.frombuffer(offsets, dtype=np.int64)
+    return values, offsets
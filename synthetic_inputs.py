@@ -0,0 +1,252 @@
+"""
+Generatori di input sintetici, nello stesso formato degli input ufficiali, con dimensione
+scalabile: scale=1 produce un input grande circa quanto quello del puzzle, scale=10, 100, 1000
+un input 10, 100, 1000 volte più grande (in numero di righe/record o in area della griglia).
+
+Ogni generatore riceve la scala e un random.Random (per avere input riproducibili) e
+restituisce il testo dell'input.
+"""
+import math
+import random
+
+# Parti che su un input sintetico non terminano in tempi sensati o non hanno una soluzione
+# garantita (es. la ricerca a forza bruta del giorno 17)
+UNSUPPORTED_PARTS = {17: (2,)}
+
+
+def _grid_side(base_side, scale):
+    """Lato di una griglia quadrata con area pari a scale volte quella di base."""
+    return max(1, int(round(base_side * math.sqrt(scale))))
+
+
+def generate_day01(scale, rng):
+    lines = (f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}" for _ in range(1000 * scale))
+    return '\n'.join(lines)
+
+
+def generate_day02(scale, rng):
+    lines = []
+    for _ in range(1000 * scale):
+        value = rng.randint(1, 90)
+        step = rng.choice((-1, 1))
+        level = [value]
+        for _ in range(rng.randint(4, 7)):
+            # Per lo più livelli sicuri, con qualche salto o inversione
+            value += step * rng.choice((1, 2, 3, 3, 0, 4, -1))
+            level.append(value)
+        lines.append(' '.join(map(str, level)))
+    return '\n'.join(lines)
+
+
+def generate_day03(scale, rng):
+    noise = "!@#$%^&*()[]{}<>?;:'+-=~ selectwhowhatwhenfrom"
+    tokens = []
+    for _ in range(3000 * scale):
+        kind = rng.random()
+        if kind < 0.25:
+            tokens.append(f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})")
+        elif kind < 0.28:
+            tokens.append("do()")
+        elif kind < 0.31:
+            tokens.append("don't()")
+        else:
+            tokens.append(''.join(rng.choice(noise) for _ in range(rng.randint(1, 6))))
+    text = ''.join(tokens)
+    # Righe di circa 3000 caratteri come nell'input ufficiale
+    return '\n'.join(text[i:i + 3000] for i in range(0, len(text), 3000))
+
+
+def generate_day04(scale, rng):
+    side = _grid_side(140, scale)
+    return '\n'.join(''.join(rng.choice('XMAS') for _ in range(side)) for _ in range(side))
+
+
+def generate_day05(scale, rng):
+    # Ordine totale su 49 pagine: una regola per ogni coppia, come nell'input ufficiale
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{pages[i]}|{pages[j]}" for i in range(len(pages)) for j in range(i + 1, len(pages))]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(200 * scale):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            # Circa metà degli update è già nell'ordine corretto
+            update.sort(key=pages.index)
+        updates.append(','.join(map(str, update)))
+    return '\n'.join(rules) + '\n\n' + '\n'.join(updates)
+
+
+def generate_day06(scale, rng):
+    side = _grid_side(130, scale)
+    rows = [['#' if rng.random() < 0.02 else '.' for _ in range(side)] for _ in range(side)]
+    rows[rng.randrange(side)][rng.randrange(side)] = '^'
+    return '\n'.join(''.join(row) for row in rows)
+
+
+def generate_day07(scale, rng):
+    lines = []
+    for _ in range(850 * scale):
+        operands = [rng.randint(1, 999) for _ in range(rng.randint(3, 12))]
+        result = operands[0]
+        for operand in operands[1:]:
+            operator = rng.choice('+*|')
+            if operator == '+':
+                result += operand
+            elif operator == '*':
+                result *= operand
+            else:
+                result = int(f"{result}{operand}")
+        if rng.random() < 0.5:
+            # Metà delle equazioni non è risolvibile
+            result += 1
+        lines.append(f"{result}: {' '.join(map(str, operands))}")
+    return '\n'.join(lines)
+
+
+def generate_day08(scale, rng):
+    side = _grid_side(50, scale)
+    frequencies = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    rows = [['.'] * side for _ in range(side)]
+    for _ in range(200 * scale):
+        rows[rng.randrange(side)][rng.randrange(side)] = rng.choice(frequencies)
+    return '\n'.join(''.join(row) for row in rows)
+
+
+def generate_day09(scale, rng):
+    # Il primo elemento di ogni coppia (file) non è mai 0
+    digits = []
+    for _ in range(10000 * scale):
+        digits.append(str(rng.randint(1, 9)))
+        digits.append(str(rng.randint(0, 9)))
+    return ''.join(digits[:-1])
+
+
+def generate_day10(scale, rng):
+    side = _grid_side(52, scale)
+    # Griglia a "pendii" regolari con rumore, per avere sentieri 0 -> 9
+    rows = []
+    for r in range(side):
+        row = []
+        for c in range(side):
+            height = (r + c) % 10 if rng.random() < 0.4 else rng.randint(0, 9)
+            row.append(str(height))
+        rows.append(''.join(row))
+    return '\n'.join(rows)
+
+
+def generate_day11(scale, rng):
+    return ' '.join(str(rng.choice((0, rng.randint(1, 9999999)))) for _ in range(8 * scale))
+
+
+def generate_day12(scale, rng):
+    side = _grid_side(140, scale)
+    plants = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    rows = []
+    for r in range(side):
+        row = []
+        for c in range(side):
+            # Regioni a blocchi con bordi irregolari
+            if rng.random() < 0.85 and (row or rows):
+                row.append(row[-1] if row and rng.random() < 0.6 else rows[-1][c] if rows else row[-1])
+            else:
+                row.append(rng.choice(plants))
+        rows.append(row)
+    return '\n'.join(''.join(row) for row in rows)
+
+
+def generate_day13(scale, rng):
+    blocks = []
+    for _ in range(320 * scale):
+        ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+        presses_a, presses_b = rng.randint(1, 100), rng.randint(1, 100)
+        prize_x = ax * presses_a + bx * presses_b + rng.choice((0, 0, 1))
+        prize_y = ay * presses_a + by * presses_b
+        blocks.append(f"Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={prize_x}, Y={prize_y}")
+    return '\n\n'.join(blocks)
+
+
+def generate_day14(scale, rng):
+    # Spazio 103 x 101 (righe, colonne) come nell'input ufficiale; le posizioni sono generate
+    # all'indietro a partire dal secondo "target", in cui i primi robot formano una riga:
+    # così la ricerca della parte 2 termina sempre
+    rows, cols = 103, 101
+    target = rng.randint(1, 1000)
+    line_row, line_col = rng.randrange(rows), rng.randrange(cols - 10)
+    robots = []
+    for idx in range(500 * scale):
+        v_x, v_y = rng.randint(-100, 100), rng.randint(-100, 100)
+        if idx < 10:
+            final_x, final_y = line_col + idx, line_row
+        else:
+            final_x, final_y = rng.randrange(cols), rng.randrange(rows)
+        p_x = (final_x - target * v_x) % cols
+        p_y = (final_y - target * v_y) % rows
+        robots.append(f"p={p_x},{p_y} v={v_x},{v_y}")
+    return '\n'.join(robots)
+
+
+def generate_day15(scale, rng):
+    side = _grid_side(50, scale)
+    rows = []
+    for r in range(side):
+        if r == 0 or r == side - 1:
+            rows.append(['#'] * side)
+            continue
+        row = ['#']
+        for _ in range(side - 2):
+            cell = rng.random()
+            row.append('#' if cell < 0.05 else 'O' if cell < 0.3 else '.')
+        row.append('#')
+        rows.append(row)
+    rows[side // 2][side // 2] = '@'
+    moves = ''.join(rng.choice('<>^v') for _ in range(20000 * scale))
+    movement_lines = '\n'.join(moves[i:i + 1000] for i in range(0, len(moves), 1000))
+    return '\n'.join(''.join(row) for row in rows) + '\n\n' + movement_lines
+
+
+def generate_day17(scale, rng):
+    # Stessa struttura del programma ufficiale: a ogni giro A viene diviso per 8 e viene
+    # stampato un valore, quindi la lunghezza dell'output cresce con i bit di A
+    program = [2, 4, 1, rng.randint(1, 7), 7, 5, 1, rng.randint(1, 7), 0, 3, 4, rng.randint(0, 7), 5, 5, 3, 0]
+    register_a = rng.getrandbits(48 * scale) | 1
+    return (f"Register A: {register_a}\nRegister B: 0\nRegister C: 0\n\n"
+            f"Program: {','.join(map(str, program))}")
+
+
+GENERATORS = {
+    1: generate_day01,
+    2: generate_day02,
+    3: generate_day03,
+    4: generate_day04,
+    5: generate_day05,
+    6: generate_day06,
+    7: generate_day07,
+    8: generate_day08,
+    9: generate_day09,
+    10: generate_day10,
+    11: generate_day11,
+    12: generate_day12,
+    13: generate_day13,
+    14: generate_day14,
+    15: generate_day15,
+    17: generate_day17,
+}
+
+
+def generate_input(day, scale, seed=None):
+    """
+    Genera un input sintetico per il giorno indicato.
+
+    Args:
+        day (int): Il giorno.
+        scale (int): Fattore di scala rispetto alla dimensione dell'input ufficiale.
+        seed (int, optional): Seme del generatore casuale. Default: derivato da giorno e scala.
+
+    Returns:
+        str: Il testo dell'input.
+
+    Raises:
+        KeyError: Se non esiste un generatore per il giorno.
+    """
+    seed = day * 100003 + scale if seed is None else seed
+    return GENERATORS[day](scale, random.Random(seed))
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from checkpoint_utils import Checkpoint, checkpoint_key
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def checkpoint(self, resume=True, **kwargs):
+        return Checkpoint('search', checkpoint_key([1, 2, 3]), resume, directory=self.directory.name, **kwargs)
+
+    def test_save_and_resume(self):
+        self.checkpoint().save({'next': 7, 'found': [(1, 2)]})
+        # Lo stato è in JSON: le tuple tornano come liste
+        self.assertEqual(self.checkpoint().load(), {'next': 7, 'found': [[1, 2]]})
+
+    def test_no_resume_ignores_saved_state(self):
+        self.checkpoint().save({'next': 7})
+        self.assertIsNone(self.checkpoint(resume=False).load())
+
+    def test_clear(self):
+        checkpoint = self.checkpoint()
+        checkpoint.save({'next': 7})
+        checkpoint.clear()
+        self.assertFalse(os.path.exists(checkpoint.path))
+        self.assertIsNone(checkpoint.load())
+        checkpoint.clear()
+
+    def test_unreadable_checkpoint_starts_over(self):
+        checkpoint = self.checkpoint()
+        with open(checkpoint.path, 'w', encoding='utf-8') as file:
+            file.write('{troncato')
+        self.assertIsNone(checkpoint.load())
+
+    def test_keys_separate_inputs(self):
+        self.checkpoint().save({'next': 7})
+        other = Checkpoint('search', checkpoint_key([4, 5]), True, directory=self.directory.name)
+        self.assertIsNone(other.load())
+        self.assertNotEqual(checkpoint_key([1, 2, 3]), checkpoint_key([4, 5]))
+
+    def test_due(self):
+        self.assertTrue(self.checkpoint(interval=0).due())
+        checkpoint = self.checkpoint(interval=3600)
+        self.assertFalse(checkpoint.due())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import exercise01
+import file_utils
+from file_utils import cached_parse, clear_parse_cache, solver_hash
+
+
+class CachedParseTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(file_utils, 'PARSE_CACHE_DIR', os.path.join(directory.name, 'parsed'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_parse_cache()
+        self.addCleanup(clear_parse_cache)
+
+        self.path = os.path.join(directory.name, 'input.txt')
+        self.write('1 2\n3 4\n')
+        self.calls = 0
+
+    def write(self, content):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def parser(self, content):
+        self.calls += 1
+        return [line.split() for line in content.splitlines()]
+
+    def test_parses_once(self):
+        first = cached_parse(self.path, self.parser, key='rows')
+        second = cached_parse(self.path, self.parser, key='rows')
+        self.assertEqual(first, [['1', '2'], ['3', '4']])
+        self.assertEqual(second, first)
+        self.assertEqual(self.calls, 1)
+
+    def test_returns_independent_copies(self):
+        first = cached_parse(self.path, self.parser, key='rows')
+        first[0][0] = 'x'
+        self.assertEqual(cached_parse(self.path, self.parser, key='rows')[0][0], '1')
+
+    def test_shared_object_without_copy(self):
+        first = cached_parse(self.path, self.parser, key='rows', copy=False)
+        self.assertIs(cached_parse(self.path, self.parser, key='rows', copy=False), first)
+
+    def test_changed_file_is_parsed_again(self):
+        cached_parse(self.path, self.parser, key='rows')
+        self.write('5 6 7\n')
+        self.assertEqual(cached_parse(self.path, self.parser, key='rows'), [['5', '6', '7']])
+        self.assertEqual(self.calls, 2)
+
+    def test_key_separates_parsers(self):
+        cached_parse(self.path, self.parser, key='rows')
+        cached_parse(self.path, self.parser, key='other')
+        self.assertEqual(self.calls, 2)
+
+    def test_disk_cache_survives_memory_clear(self):
+        cached_parse(self.path, self.parser, key='rows')
+        clear_parse_cache()
+        self.assertEqual(cached_parse(self.path, self.parser, key='rows'), [['1', '2'], ['3', '4']])
+        self.assertEqual(self.calls, 1)
+
+        clear_parse_cache(disk=True)
+        cached_parse(self.path, self.parser, key='rows')
+        self.assertEqual(self.calls, 2)
+
+    def test_without_disk(self):
+        cached_parse(self.path, self.parser, key='rows', use_disk=False)
+        self.assertFalse(os.path.exists(file_utils.PARSE_CACHE_DIR))
+        clear_parse_cache()
+        cached_parse(self.path, self.parser, key='rows', use_disk=False)
+        self.assertEqual(self.calls, 2)
+
+    def test_corrupted_disk_cache_is_ignored(self):
+        cached_parse(self.path, self.parser, key='rows')
+        clear_parse_cache()
+        for name in os.listdir(file_utils.PARSE_CACHE_DIR):
+            with open(os.path.join(file_utils.PARSE_CACHE_DIR, name), 'wb') as file:
+                file.write(b'non un pickle')
+        self.assertEqual(cached_parse(self.path, self.parser, key='rows'), [['1', '2'], ['3', '4']])
+        self.assertEqual(self.calls, 2)
+
+    def test_memory_cache_is_bounded(self):
+        with mock.patch.object(file_utils, 'PARSE_CACHE_SIZE', 2):
+            for key in ('a', 'b', 'c'):
+                cached_parse(self.path, self.parser, key=key, use_disk=False)
+            self.assertEqual(len(file_utils._parse_cache), 2)
+            # 'a' è la chiave usata meno di recente ed è stata scartata
+            cached_parse(self.path, self.parser, key='a', use_disk=False)
+        self.assertEqual(self.calls, 4)
+
+
+class SolverHashTest(unittest.TestCase):
+
+    def test_covers_repository_dependencies(self):
+        files = {os.path.basename(path) for path in file_utils._repo_dependencies(exercise01)}
+        self.assertTrue({'exercise01.py', 'file_utils.py', 'string_utils.py', 'log_utils.py'} <= files)
+        # I moduli esterni al repository non fanno parte dell'hash
+        self.assertNotIn('os.py', files)
+
+    def test_is_stable(self):
+        self.assertEqual(solver_hash(exercise01), solver_hash(exercise01))
+        self.assertEqual(len(solver_hash(exercise01)), 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import unittest
+
+from matrix_utils import (DOWN, LEFT, RIGHT, UP, Bitboard, Grid, ObstacleIndex, SparseGrid, create_sparse_grid,
+                          string_to_matrix)
+
+MAP = ("#..#.\n"
+       ".....\n"
+       "##...\n"
+       "....#\n")
+
+
+class ObstacleIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = ObstacleIndex.from_grid(string_to_matrix(MAP))
+
+    def test_from_grid(self):
+        self.assertEqual(self.index.rows, {0: [0, 3], 2: [0, 1], 3: [4]})
+        self.assertEqual(self.index.cols, {0: [0, 2], 1: [2], 3: [0], 4: [3]})
+        self.assertIn((2, 1), self.index)
+        self.assertNotIn((1, 1), self.index)
+
+    def test_next_obstacle(self):
+        self.assertEqual(self.index.next_obstacle((0, 1), RIGHT), (0, 3))
+        self.assertEqual(self.index.next_obstacle((0, 1), LEFT), (0, 0))
+        self.assertEqual(self.index.next_obstacle((1, 0), DOWN), (2, 0))
+        self.assertEqual(self.index.next_obstacle((3, 0), UP), (2, 0))
+        self.assertIsNone(self.index.next_obstacle((1, 2), DOWN))
+        # La posizione di partenza è esclusa, anche se è un ostacolo
+        self.assertEqual(self.index.next_obstacle((0, 0), RIGHT), (0, 3))
+        self.assertEqual(self.index.next_obstacle((0, 1), 'right'), (0, 3))
+
+    def test_add_and_remove(self):
+        self.index.add((0, 2))
+        self.assertIn((0, 2), self.index)
+        self.assertEqual(self.index.rows[0], [0, 2, 3])
+        self.assertEqual(self.index.next_obstacle((0, 1), RIGHT), (0, 2))
+        self.assertEqual(self.index.next_obstacle((3, 2), UP), (0, 2))
+
+        # Aggiungere due volte non duplica l'ostacolo
+        self.index.add((0, 2))
+        self.assertEqual(self.index.rows[0], [0, 2, 3])
+
+        self.index.remove((0, 2))
+        self.assertNotIn((0, 2), self.index)
+        self.assertEqual(self.index.rows[0], [0, 3])
+        self.assertIsNone(self.index.next_obstacle((3, 2), UP))
+
+        # Rimuovere un ostacolo assente non fa nulla
+        self.index.remove((1, 1))
+        self.assertEqual(self.index.cols[1], [2])
+
+    def test_run_end(self):
+        self.assertEqual(self.index.run_end((2, 0), RIGHT), (2, 2))
+        self.assertEqual(self.index.run_end((2, 1), LEFT), (2, -1))
+        self.assertEqual(self.index.run_end((1, 1), RIGHT), (1, 1))
+
+    def test_invalid_direction(self):
+        with self.assertRaises(ValueError):
+            self.index.next_obstacle((0, 0), 'diagonal')
+
+
+class BitboardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.board = Bitboard.from_grid(Grid.from_string(MAP), '#')
+
+    def test_from_grid_matches_lists(self):
+        self.assertEqual(Bitboard.from_grid(string_to_matrix(MAP), '#').bits, self.board.bits)
+
+    def test_positions_and_popcount(self):
+        positions = [(0, 0), (0, 3), (2, 0), (2, 1), (3, 4)]
+        self.assertEqual(list(self.board.positions()), positions)
+        self.assertEqual(self.board.popcount(), len(positions))
+        self.assertTrue(self.board[2, 1])
+        self.assertFalse(self.board.test(1, 1))
+
+    def test_set_and_clear(self):
+        self.board.set(1, 1)
+        self.assertTrue(self.board.test(1, 1))
+        self.board.clear(1, 1)
+        self.board.clear(0, 0)
+        self.assertEqual(self.board.popcount(), 4)
+
+    def test_shift_drops_cells_leaving_the_grid(self):
+        self.assertEqual(list(self.board.shift(RIGHT).positions()), [(0, 1), (0, 4), (2, 1), (2, 2)])
+        self.assertEqual(list(self.board.shift(LEFT).positions()), [(0, 2), (2, 0), (3, 3)])
+        self.assertEqual(list(self.board.shift(UP).positions()), [(1, 0), (1, 1), (2, 4)])
+        self.assertEqual(list(self.board.shift(DOWN).positions()), [(1, 0), (1, 3), (3, 0), (3, 1)])
+
+    def test_set_operations(self):
+        other = Bitboard(5, 4)
+        other.set(0, 0)
+        other.set(1, 1)
+        self.assertEqual(list((self.board & other).positions()), [(0, 0)])
+        self.assertEqual((self.board | other).popcount(), 6)
+        self.assertEqual((self.board ^ other).popcount(), 5)
+        self.assertEqual((~self.board).popcount(), 20 - 5)
+
+    def test_weighted_sum(self):
+        expected = sum(100 * r + c for r, c in self.board.positions())
+        self.assertEqual(self.board.weighted_sum(), expected)
+
+
+class SparseGridTest(unittest.TestCase):
+
+    def test_default_and_writes(self):
+        grid = create_sparse_grid(3, 4)
+        self.assertEqual(grid.get(1, 2), '.')
+        grid[1, 2] = '#'
+        self.assertEqual(grid[1, 2], '#')
+        self.assertEqual(grid.cells, {grid.offset(1, 2): '#'})
+        # Scrivere il default libera la cella
+        grid[1, 2] = '.'
+        self.assertEqual(grid.cells, {})
+        self.assertEqual(grid.count('.'), 12)
+
+    def test_offsets_of(self):
+        grid = SparseGrid.from_grid(string_to_matrix(MAP))
+        self.assertEqual({grid.position(offset) for offset in grid.offsets_of('#')},
+                         {(0, 0), (0, 3), (2, 0), (2, 1), (3, 4)})
+        self.assertEqual(len(list(grid.offsets_of('.'))), 20 - 5)
+
+    def test_switches_to_dense_above_threshold(self):
+        grid = SparseGrid(4, 4, density_threshold=0.25)
+        for col in range(4):
+            grid[0, col] = 'X'
+        self.assertIsNone(grid.dense)
+        grid[1, 0] = 'X'
+        self.assertIsInstance(grid.dense, Grid)
+        self.assertEqual(grid.cells, {})
+        # Dopo il passaggio letture e scritture vanno alla Grid densa
+        self.assertEqual(grid[0, 3], 'X')
+        grid[3, 3] = '#'
+        self.assertEqual(grid.get(3, 3), '#')
+        self.assertEqual(grid.count('X'), 5)
+
+    def test_multi_char_cells_stay_sparse(self):
+        grid = SparseGrid(2, 2, density_threshold=0.25)
+        grid[0, 0] = '10'
+        grid[0, 1] = '11'
+        self.assertIsNone(grid.dense)
+        self.assertEqual(grid[0, 1], '11')
+        with self.assertRaises(ValueError):
+            grid.to_dense()
+
+    def test_copy_is_independent(self):
+        grid = SparseGrid(3, 3)
+        grid[0, 0] = '#'
+        copy = grid.copy()
+        copy[1, 1] = '#'
+        self.assertEqual(grid[1, 1], '.')
+        self.assertEqual(copy[0, 0], '#')
+
+    def test_to_dense(self):
+        grid = SparseGrid.from_grid(string_to_matrix(MAP))
+        self.assertEqual(grid.to_dense().data, Grid.from_string(MAP).data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import time
+import unittest
+
+from result_store import ResultStore
+
+
+class ResultStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = ResultStore(os.path.join(directory.name, 'nested', 'results.sqlite'))
+        self.addCleanup(self.store.close)
+
+    def test_get_missing(self):
+        self.assertEqual(self.store.get(1, 1, 'input', 'solver'), (False, None, None))
+
+    def test_put_and_get(self):
+        self.store.put(1, 1, 'input', 'solver', 2769675, 0.5)
+        self.store.put(17, 1, 'input', 'solver', '5,1,4')
+        self.store.put(12, 2, 'input', 'solver', None)
+        self.assertEqual(self.store.get(1, 1, 'input', 'solver'), (True, 2769675, 0.5))
+        self.assertEqual(self.store.get(17, 1, 'input', 'solver'), (True, '5,1,4', None))
+        # None è una risposta valida, distinta da una risposta assente
+        self.assertEqual(self.store.get(12, 2, 'input', 'solver'), (True, None, None))
+
+    def test_key_includes_input_and_solver(self):
+        self.store.put(1, 1, 'input', 'solver', 10)
+        self.assertFalse(self.store.get(1, 1, 'other-input', 'solver')[0])
+        self.assertFalse(self.store.get(1, 1, 'input', 'other-solver')[0])
+        self.assertFalse(self.store.get(1, 2, 'input', 'solver')[0])
+
+    def test_put_replaces(self):
+        self.store.put(1, 1, 'input', 'solver', 10)
+        self.store.put(1, 1, 'input', 'solver', 11)
+        self.assertEqual(self.store.get(1, 1, 'input', 'solver')[1], 11)
+
+    def test_last_seconds(self):
+        self.assertIsNone(self.store.last_seconds(1, 1))
+        self.store.put(1, 1, 'old-input', 'solver', 10, 2.0)
+        time.sleep(0.01)
+        self.store.put(1, 1, 'input', 'new-solver', 10, 3.0)
+        self.store.put(1, 1, 'other', 'solver', 10)
+        self.assertEqual(self.store.last_seconds(1, 1), 3.0)
+
+    def test_clear(self):
+        self.store.put(1, 1, 'input', 'solver', 10)
+        self.store.put(2, 1, 'input', 'solver', 20)
+        self.store.clear(day=1)
+        self.assertFalse(self.store.get(1, 1, 'input', 'solver')[0])
+        self.assertTrue(self.store.get(2, 1, 'input', 'solver')[0])
+        self.store.clear()
+        self.assertFalse(self.store.get(2, 1, 'input', 'solver')[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import log_utils
+import scheduler
+from result_store import ResultStore
+from runner import input_path
+
+
+def job(day, part, status='ok', answer=None, wall=1.0, cpu=0.5, peak=1 << 20):
+    return {'day': day, 'part': part, 'status': status, 'answer': answer, 'seconds': wall,
+            'wall': wall, 'cpu': cpu, 'peak': peak}
+
+
+class PlanJobsTest(unittest.TestCase):
+
+    def test_longest_first_and_unknown_before_all(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with ResultStore(os.path.join(directory, 'results.sqlite')) as store:
+                store.put(1, 1, 'input', 'solver', 1, 0.5)
+                store.put(1, 2, 'input', 'solver', 1, 3.0)
+                store.put(2, 1, 'input', 'solver', 1, 1.0)
+                jobs = scheduler.plan_jobs([1, 2], (1, 2), store=store)
+        self.assertEqual([(day, part) for day, part, _, _ in jobs], [(2, 2), (1, 2), (2, 1), (1, 1)])
+        self.assertEqual(jobs[0][2], input_path(2))
+        self.assertIsNone(jobs[0][3])
+
+    def test_skips_missing_inputs(self):
+        self.assertEqual(scheduler.plan_jobs([1], (1,), name='missing.txt'), [])
+
+
+class RunJobTest(unittest.TestCase):
+
+    def setUp(self):
+        verbosity = log_utils.get_verbosity()
+        self.addCleanup(log_utils.set_verbosity, verbosity)
+
+    def test_ok(self):
+        result = scheduler.run_job(2, 1, input_path(2, 'test.txt'))
+        self.assertEqual((result['status'], result['answer']), ('ok', 2))
+        self.assertGreaterEqual(result['wall'], 0)
+
+    def test_timeout(self):
+        with mock.patch.object(scheduler, 'run_day', side_effect=lambda *args: time.sleep(1)):
+            result = scheduler.run_job(1, 1, 'input.txt', timeout=0.05)
+        self.assertEqual(result['status'], 'timeout')
+        self.assertLess(result['wall'], 1)
+
+    def test_error(self):
+        with mock.patch.object(scheduler, 'run_day', side_effect=KeyError('x')):
+            result = scheduler.run_job(1, 1, 'input.txt')
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(result['answer'], "KeyError: 'x'")
+
+
+class FormatTableTest(unittest.TestCase):
+
+    def test_aggregates_by_day(self):
+        table = scheduler.format_table([
+            job(1, 1, answer=11),
+            job(1, 2, status='partial', answer=31, peak=3 << 20),
+            job(2, 1, status='timeout', peak=None),
+        ], (1, 2))
+        lines = table.splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn('31 (parziale)', lines[2])
+        self.assertIn('2.00s', lines[2])
+        self.assertTrue(lines[2].endswith('3MiB'))
+        self.assertIn('timeout', lines[3])
+        self.assertTrue(lines[3].endswith('-'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+
+import search_utils
+from search_utils import BUDGET, CANCELLED, DEADLINE, SearchControl, TimeLimitExceeded, time_limit
+
+
+class SearchControlTest(unittest.TestCase):
+
+    def setUp(self):
+        search_utils.reset_stopped()
+
+    def test_budget(self):
+        control = SearchControl(max_steps=3, progress=None)
+        self.assertEqual(sum(1 for _ in iter(control.step, False)), 3)
+        self.assertEqual(control.stop_reason, BUDGET)
+        self.assertTrue(control.stopped)
+        # Una volta fermata la ricerca resta ferma
+        self.assertFalse(control.step())
+
+    def test_step_count(self):
+        control = SearchControl(max_steps=10, progress=None)
+        self.assertTrue(control.step(6))
+        self.assertFalse(control.step(6))
+        self.assertEqual(control.steps, 6)
+
+    def test_deadline(self):
+        control = SearchControl(timeout=0.01, progress=None)
+        time.sleep(0.02)
+        self.assertFalse(control.step())
+        self.assertEqual(control.stop_reason, DEADLINE)
+
+    def test_cancel_from_another_thread(self):
+        control = SearchControl(progress=None)
+        thread = threading.Thread(target=control.cancel)
+        thread.start()
+        thread.join()
+        self.assertFalse(control.step())
+        self.assertEqual(control.stop_reason, CANCELLED)
+
+    def test_offer_keeps_best_score(self):
+        control = SearchControl(progress=None)
+        control.offer('a', 3)
+        control.offer('b', 1)
+        control.offer('c', 5)
+        self.assertEqual((control.best, control.best_score), ('c', 5))
+
+    def test_stopped_registry(self):
+        finished = SearchControl(progress=None)
+        finished.step()
+        stopped = SearchControl(max_steps=0, progress=None)
+        stopped.step()
+        self.assertEqual(search_utils.stopped_searches(), [stopped])
+        search_utils.reset_stopped()
+        self.assertEqual(search_utils.stopped_searches(), [])
+
+    def test_progress_callback(self):
+        reports = []
+        control = SearchControl(max_steps=1, progress=reports.append, progress_interval=3600)
+        control.step()
+        control.step()
+        # Il callback viene chiamato anche quando la ricerca si ferma
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0]['stop_reason'], BUDGET)
+
+    def test_default_timeout(self):
+        previous = search_utils.get_default_timeout()
+        try:
+            search_utils.set_default_timeout(60)
+            self.assertIsNotNone(SearchControl(progress=None).deadline)
+            search_utils.set_default_timeout(None)
+            self.assertIsNone(SearchControl(progress=None).deadline)
+        finally:
+            search_utils.set_default_timeout(previous)
+
+
+class TimeLimitTest(unittest.TestCase):
+
+    def test_interrupts_block(self):
+        with self.assertRaises(TimeLimitExceeded):
+            with time_limit(0.05):
+                time.sleep(1)
+
+    def test_no_limit(self):
+        with time_limit(None):
+            pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from string_utils import (_normalize_newlines, iter_blocks, iter_ints, iter_lines, parse_int_columns,
+                          parse_int_records)
+
+
+def chunked(text, size):
+    """Divide il testo in pezzi di size caratteri, come farebbe un lettore in streaming."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class NormalizeNewlinesTest(unittest.TestCase):
+
+    def test_crlf_inside_chunk(self):
+        self.assertEqual(''.join(_normalize_newlines(['a\r\nb\r\n'])), 'a\nb\n')
+
+    def test_crlf_split_between_chunks(self):
+        self.assertEqual(''.join(_normalize_newlines(['a\r', '\nb\r', '\n'])), 'a\nb\n')
+
+    def test_lone_cr_is_kept(self):
+        self.assertEqual(''.join(_normalize_newlines(['a\r', 'b\r'])), 'a\rb\r')
+
+    def test_every_chunk_size(self):
+        text = 'uno\r\ndue\r\n\r\ntre\r\n'
+        for size in range(1, len(text) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(''.join(_normalize_newlines(chunked(text, size))), text.replace('\r\n', '\n'))
+
+
+class IterLinesTest(unittest.TestCase):
+
+    def test_lines_for_every_chunk_size(self):
+        text = 'alpha\r\nbeta\n\r\ngamma'
+        for size in range(1, len(text) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_lines(chunked(text, size))), ['alpha', 'beta', '', 'gamma'])
+
+    def test_trailing_newline_adds_no_empty_line(self):
+        self.assertEqual(list(iter_lines(['a\n', 'b\n'])), ['a', 'b'])
+
+
+class IterBlocksTest(unittest.TestCase):
+
+    def test_blocks_for_every_chunk_size(self):
+        text = 'a1\na2\n\nb1\n\nc1\nc2\n'
+        for size in range(1, len(text) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_blocks(chunked(text, size))), ['a1\na2', 'b1', 'c1\nc2'])
+
+    def test_crlf_separator_across_chunk_boundaries(self):
+        # Il separatore '\r\n\r\n' può essere spezzato in qualsiasi punto, anche tra '\r' e '\n'
+        text = 'a1\r\na2\r\n\r\nb1\r\n\r\nc1\r\n'
+        for size in range(1, len(text) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_blocks(chunked(text, size))), ['a1\na2', 'b1', 'c1'])
+
+    def test_custom_separator(self):
+        text = 'x--y--z'
+        for size in range(1, len(text) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_blocks(chunked(text, size), separator='--')), ['x', 'y', 'z'])
+
+    def test_empty_separator_is_rejected(self):
+        with self.assertRaises(ValueError):
+            list(iter_blocks(['a'], separator=''))
+
+
+class IterIntsTest(unittest.TestCase):
+
+    def test_numbers_split_between_chunks(self):
+        text = '12 -345\n6789 0\n'
+        for size in range(1, len(text) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_ints(chunked(text, size))), [12, -345, 6789, 0])
+
+
+class ParseIntTest(unittest.TestCase):
+
+    def test_columns(self):
+        left, right = parse_int_columns('3   4\n4   3\n-2   5\n', arity=2)
+        self.assertEqual(list(left), [3, 4, -2])
+        self.assertEqual(list(right), [4, 3, 5])
+
+    def test_columns_reject_incomplete_record(self):
+        with self.assertRaises(ValueError):
+            parse_int_columns('1 2 3', arity=2)
+
+    def test_unsigned_treats_minus_as_separator(self):
+        self.assertEqual(list(parse_int_columns('p=0,4 v=3,-3', signed=False)), [0, 4, 3, 3])
+
+    def test_records(self):
+        values, offsets = parse_int_records(['190: 10 19', '', '3267: 81 40 27'])
+        records = [list(values[offsets[i]:offsets[i + 1]]) for i in range(len(offsets) - 1)]
+        self.assertEqual(records, [[190, 10, 19], [3267, 81, 40, 27]])
+
+
+if __name__ == '__main__':
+    unittest.main()